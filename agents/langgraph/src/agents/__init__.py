@@ -3,7 +3,16 @@
 This module defines Aria and Orion agents.
 """
 
-from .aria.graphs.graph import graph as aria_graph
-from .orion.orion_router.orion_graph import graph as orion_graph
-
 __all__ = ["aria_graph", "orion_graph"]
+
+
+def __getattr__(name):
+    # Graphs are imported on first access so that importing a submodule such
+    # as agents.shared_memory does not build every workflow.
+    if name == "aria_graph":
+        from .aria.graphs.graph import graph
+        return graph
+    if name == "orion_graph":
+        from .orion.orion_router.orion_graph import graph
+        return graph
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
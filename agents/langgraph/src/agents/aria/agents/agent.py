@@ -1,6 +1,5 @@
-import os 
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+from ...model import get_chat_model
 from langchain_core.prompts import PromptTemplate
 from ..structure_outputs.structure_output import Emotion, EmotionDetectionOutput
 from prompts.emotion import EMOTION_PROMPT
@@ -9,11 +8,7 @@ load_dotenv()
 
 class EmotionAgent:
     def __init__(self):
-        self.model = ChatOpenAI(
-            model=os.getenv("OPENAI_MODEL"),
-            temperature=0,
-            openai_api_key=os.getenv("OPENAI_API_KEY")
-        )
+        self.model = get_chat_model("emotion")
         
         self.emotion_prompt = PromptTemplate(
             template=EMOTION_PROMPT,
@@ -25,7 +20,8 @@ class EmotionAgent:
             | self.model.with_structured_output(EmotionDetectionOutput)
         )
     
-    def detect(self, text: str, preferences: dict | None = None) -> EmotionDetectionOutput:
+    @staticmethod
+    def _format_preferences(preferences: dict | None) -> str:
         pref_text = ""
         if preferences:
             lang = preferences.get("language") or preferences.get("lang") or "unspecified"
@@ -38,8 +34,18 @@ class EmotionAgent:
                 f"Agent name: {name}\n"
                 f"Additional notes: {extra}"
             )
+        return pref_text
+
+    def detect(self, text: str, preferences: dict | None = None) -> EmotionDetectionOutput:
         result: EmotionDetectionOutput = self.emotion_runnable.invoke({
             "text": text,
-            "preferences": pref_text,
+            "preferences": self._format_preferences(preferences),
+        })
+        return result
+
+    async def adetect(self, text: str, preferences: dict | None = None) -> EmotionDetectionOutput:
+        result: EmotionDetectionOutput = await self.emotion_runnable.ainvoke({
+            "text": text,
+            "preferences": self._format_preferences(preferences),
         })
         return result
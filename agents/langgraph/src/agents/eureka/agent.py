@@ -1,17 +1,15 @@
-import os
 import sys
 from pathlib import Path
 from dotenv import load_dotenv
 from langchain_core.prompts import ChatPromptTemplate, PromptTemplate, MessagesPlaceholder
-from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings
 from langchain_core.runnables import RunnablePassthrough
 from langchain_core.output_parsers import StrOutputParser
-from ..model import Model
+from ..model import ANSWER_TAG, Model
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from .structure_output import *
 from prompts.classroom import *
+from tools.vector_store import get_vector_store
 
 load_dotenv()
 model = Model()
@@ -19,13 +17,8 @@ model = Model()
 class Agent():
     def __init__(self, classroom_tool=None): 
         self.classroom_tool = classroom_tool
-        embeddings = OpenAIEmbeddings(openai_api_key=os.getenv("OPENAI_API_KEY"))
-        db_path = str(Path(__file__).parent.parent.parent / "vectorstore")
-
-        self.vectorstore = Chroma(
-            persist_directory=db_path, 
-            embedding_function=embeddings
-        )
+        # Same collection and embedding model that ingestion writes to.
+        self.vectorstore = get_vector_store().collection()
         retriever = self.vectorstore.as_retriever(search_kwargs={"k": 3})
 
         query_category_prompt = PromptTemplate(
@@ -69,7 +62,7 @@ class Agent():
         self.ai_response_generator = (
             writer_prompt | 
             model.openai_model.with_structured_output(AIResponseOutput)
-        )
+        ).with_config(tags=[ANSWER_TAG])
 
         proofreader_prompt = PromptTemplate(
             template=AI_RESPONSE_PROOFREADER_PROMPT, 
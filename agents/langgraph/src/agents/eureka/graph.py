@@ -14,7 +14,7 @@ class ClassroomWorkflow():
 
         workflow.add_node("load_courses", nodes.load_courses)
         workflow.add_node("load_coursework", nodes.load_coursework)
-        workflow.add_node("load_and_index_materials", nodes.load_and_index_materials)
+        workflow.add_node("load_materials", nodes.load_materials)
         workflow.add_node("retrieve_memory", nodes.retrieve_memory)
         workflow.add_node("receive_student_query", nodes.receive_student_query)
         workflow.add_node("categorize_query", nodes.categorize_student_query)
@@ -27,8 +27,8 @@ class ClassroomWorkflow():
         workflow.set_entry_point("load_courses")
 
         workflow.add_edge("load_courses", "load_coursework")
-        workflow.add_edge("load_coursework", "load_and_index_materials")
-        workflow.add_edge("load_and_index_materials", "retrieve_memory")
+        workflow.add_edge("load_coursework", "load_materials")
+        workflow.add_edge("load_materials", "retrieve_memory")
         workflow.add_edge("retrieve_memory", "receive_student_query")
         workflow.add_edge("receive_student_query", "categorize_query")
         workflow.add_edge("categorize_query", "construct_rag_queries")
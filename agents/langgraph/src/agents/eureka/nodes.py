@@ -2,8 +2,7 @@ from colorama import Fore, Style
 from ..model import Model 
 from .agent import Agent
 from .state import GraphState, Coursework, CourseWorkMaterial, StudentInteraction, Course
-from tools.classroomTools import ClassroomTool
-from tools.pdf_processor import PDFProcessor
+from tools.ingestion import INGESTION_AUTO_SUBMIT, get_ingestion_service
 from prompts.classroom import AI_RESPONSE_PROMPT
 from ..shared_memory import shared_memory
 
@@ -12,12 +11,13 @@ model = Model()
 class ClassroomNodes:
     def __init__(self):
         self.agents = Agent()
-        self.classroom_tools = ClassroomTool()
-        self.pdf_processor = PDFProcessor(self.classroom_tools)
+        self.ingestion = get_ingestion_service()
+        self.classroom_loader = self.ingestion.loader
+        self.pdf_processor = self.ingestion.pdf_processor
 
     def load_courses(self, state: GraphState) -> GraphState:
         print(Fore.YELLOW + "Loading courses..." + Style.RESET_ALL)
-        courses_list = self.classroom_tools.list_courses()
+        courses_list = self.classroom_loader.courses(state.get("student_id"))
         
         requested_course_id = state["requested_course_id"]
         if requested_course_id:
@@ -29,39 +29,39 @@ class ClassroomNodes:
         print(Fore.YELLOW + "Loading coursework..." + Style.RESET_ALL)
         courses = state.get("courses", [])
         all_coursework = []
-        
+
+        results = self.classroom_loader.coursework(state.get("student_id"), [course.id for course in courses])
         for course in courses:
-            coursework_list = self.classroom_tools.list_coursework(course.id)
+            coursework_list = results[course.id]
+            if isinstance(coursework_list, Exception):
+                raise coursework_list
             all_coursework.extend(coursework_list)
 
         return {"courseworks": [Coursework(**cw) for cw in all_coursework] if all_coursework else []}
     
-    def load_and_index_materials(self, state: GraphState) -> GraphState:
-        print(Fore.YELLOW + "Loading and indexing PDF materials..." + Style.RESET_ALL)
+    def load_materials(self, state: GraphState) -> GraphState:
+        print(Fore.YELLOW + "Loading course materials..." + Style.RESET_ALL)
         courses = state.get("courses", [])
         all_materials = []
-        total_stats = {"materials_processed": 0, "pdfs_found": 0, "chunks_indexed": 0}
-        
+        materials_by_course = {}
+
+        results = self.classroom_loader.materials(state.get("student_id"), [course.id for course in courses])
         for course in courses:
+            materials_list = results[course.id]
+            if isinstance(materials_list, Exception):
+                print(Fore.RED + f"Could not load materials for {course.name}: {materials_list}" + Style.RESET_ALL)
+                continue
+            materials_by_course[course.id] = materials_list
+            all_materials.extend([CourseWorkMaterial(**m) for m in materials_list])
+
+        # Indexing runs on the background workers; this question is answered
+        # from whatever is already in the vector store.
+        if INGESTION_AUTO_SUBMIT and materials_by_course:
             try:
-                print(Fore.CYAN + f"Processing materials for {course.name}..." + Style.RESET_ALL)
-                materials_list = self.classroom_tools.list_coursework_materials(course.id)
-                all_materials.extend([CourseWorkMaterial(**m) for m in materials_list])
-                
-                stats = self.pdf_processor.process_course_materials(course.id)
-                for key in total_stats:
-                    total_stats[key] += stats[key]
-                
-                if stats["chunks_indexed"] > 0:
-                    print(Fore.GREEN + f"{course.name}: {stats['pdfs_found']} PDFs, {stats['chunks_indexed']} new chunks indexed" + Style.RESET_ALL)
-                else:
-                    print(Fore.GREEN + f"{course.name}: {stats['pdfs_found']} PDFs already indexed" + Style.RESET_ALL)
-                
+                self.ingestion.submit(state.get("student_id"), materials_by_course=materials_by_course)
             except Exception as e:
-                print(Fore.RED + f"Could not process materials for {course.name}: {str(e)}" + Style.RESET_ALL)
-        
-        summary = "All materials already indexed (using cache)" if total_stats["chunks_indexed"] == 0 else f"Total: {total_stats['pdfs_found']} PDFs, {total_stats['chunks_indexed']} new chunks indexed"
-        print(Fore.GREEN + f"\n{summary}" + Style.RESET_ALL)
+                print(Fore.RED + f"Could not queue materials for indexing: {e}" + Style.RESET_ALL)
+
         return {"materials": all_materials}
 
     def receive_student_query(self, state: GraphState) -> GraphState:
@@ -342,10 +342,12 @@ class ClassroomNodes:
     async def retrieve_memory(self, state: GraphState) -> GraphState:
         print(Fore.YELLOW + "Retrieving long-term memory..." + Style.RESET_ALL)
         student_id = state.get("student_id")
-        if not student_id:
+        if not student_id or state.get("shared_answer"):
             return {"student_context": ""}
         
-        memory = await shared_memory.retrieve(student_id)
+        interaction = state.get("current_interaction") or {}
+        question = interaction.get("student_question", "") if isinstance(interaction, dict) else interaction.student_question
+        memory = await shared_memory.retrieve(student_id, question or "")
         return {"student_context": memory}
 
     async def save_to_memory(self, state: GraphState) -> GraphState:
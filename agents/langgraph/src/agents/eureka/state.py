@@ -53,3 +53,5 @@ class GraphState(TypedDict):
     query_category: Optional[str]
     is_first_message: Optional[bool]
     study_plan: Optional[StudyPlanOutput]
+    # Set when the answer may be cached for other students, so it must not use this student's memory.
+    shared_answer: Optional[bool]
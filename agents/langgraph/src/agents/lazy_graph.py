@@ -0,0 +1,58 @@
+import asyncio
+import threading
+import time
+from typing import Callable
+
+from colorama import Fore, Style
+from langchain_core.runnables import RunnableConfig
+
+
+class LazyGraph:
+    """A subgraph node that imports and compiles its graph on first use.
+
+    Building a workflow authenticates to Google, opens Chroma and so on, so the
+    parent graph registers ``lazy.ainvoke`` as the node and defers the build
+    until a query is routed there (or ``warm`` runs it in the background).
+    """
+
+    def __init__(self, name: str, factory: Callable[[], object]):
+        self.name = name
+        self._factory = factory
+        self._app = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_built(self) -> bool:
+        return self._app is not None
+
+    def get(self):
+        if self._app is None:
+            with self._lock:
+                if self._app is None:
+                    start = time.perf_counter()
+                    self._app = self._factory()
+                    elapsed = (time.perf_counter() - start) * 1000
+                    print(Fore.CYAN + f"Built {self.name} graph in {elapsed:.0f} ms" + Style.RESET_ALL)
+        return self._app
+
+    async def aget(self):
+        if self._app is not None:
+            return self._app
+        # Construction does blocking I/O; keep it off the event loop.
+        return await asyncio.to_thread(self.get)
+
+    async def ainvoke(self, state: dict, config: RunnableConfig) -> dict:
+        app = await self.aget()
+        return await app.ainvoke(state, config)
+
+    async def warm(self) -> None:
+        try:
+            await self.aget()
+        except Exception as e:
+            print(Fore.RED + f"Warm-up of {self.name} graph failed: {e}" + Style.RESET_ALL)
+
+
+async def warm_graphs(*graphs: LazyGraph) -> None:
+    """Build the given lazy graphs one after another in the background."""
+    for graph in graphs:
+        await graph.warm()
@@ -1,10 +1,103 @@
 import os
+import threading
+from typing import Optional
+
+import httpx
 from langchain_openai import ChatOpenAI
 
+DEFAULT_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+OPENAI_HTTP_MAX_CONNECTIONS = int(os.getenv("OPENAI_HTTP_MAX_CONNECTIONS", "50"))
+OPENAI_HTTP_MAX_KEEPALIVE = int(os.getenv("OPENAI_HTTP_MAX_KEEPALIVE", "20"))
+OPENAI_HTTP_TIMEOUT = float(os.getenv("OPENAI_HTTP_TIMEOUT", "60"))
+
+# Tag carried by the runnables that write the user-facing answer, so streaming
+# endpoints can forward their tokens and ignore routing/proofreading calls.
+ANSWER_TAG = "final_answer"
+
+# Per-role defaults. Each can be overridden with OPENAI_MODEL_<ROLE> and
+# OPENAI_TEMPERATURE_<ROLE>, e.g. OPENAI_TEMPERATURE_PERSONAL=0.9.
+ROLE_CONFIG = {
+    "default": {"model": DEFAULT_MODEL, "temperature": 0.1},
+    "router": {"model": DEFAULT_MODEL, "temperature": 0},
+    "continuation": {"model": DEFAULT_MODEL, "temperature": 0},
+    "emotion": {"model": DEFAULT_MODEL, "temperature": 0},
+    "orion_router": {"model": DEFAULT_MODEL, "temperature": 0},
+    "self": {"model": "gpt-4o-mini", "temperature": 0},
+    "personal": {"model": DEFAULT_MODEL, "temperature": 0.7},
+    "image": {"model": "gpt-4o-mini", "temperature": 0.7},
+}
+
+_lock = threading.Lock()
+_clients: dict[tuple[str, float, Optional[int]], ChatOpenAI] = {}
+_http_client: Optional[httpx.Client] = None
+_http_async_client: Optional[httpx.AsyncClient] = None
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=OPENAI_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=OPENAI_HTTP_MAX_KEEPALIVE,
+    )
+
+
+def _role_config(role: str) -> tuple[str, float]:
+    config = ROLE_CONFIG.get(role, ROLE_CONFIG["default"])
+    suffix = role.upper()
+    model = os.getenv(f"OPENAI_MODEL_{suffix}", config["model"])
+    temperature = float(os.getenv(f"OPENAI_TEMPERATURE_{suffix}", config["temperature"]))
+    return model, temperature
+
+
+def get_chat_model(
+    role: str = "default",
+    model: Optional[str] = None,
+    temperature: Optional[float] = None,
+    max_retries: Optional[int] = None,
+) -> ChatOpenAI:
+    """Return the shared ChatOpenAI for a role, keyed by (model, temperature, max_retries).
+
+    Every client is built on the same pooled sync/async HTTP transport, so
+    agents share connections to the OpenAI API instead of each opening their own.
+    Pass ``max_retries=0`` when the caller does its own rate-limit handling.
+    """
+    role_model, role_temperature = _role_config(role)
+    key = (model or role_model, role_temperature if temperature is None else float(temperature), max_retries)
+
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    global _http_client, _http_async_client
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            if _http_client is None:
+                _http_client = httpx.Client(limits=_limits(), timeout=OPENAI_HTTP_TIMEOUT)
+                _http_async_client = httpx.AsyncClient(limits=_limits(), timeout=OPENAI_HTTP_TIMEOUT)
+            options = {} if max_retries is None else {"max_retries": max_retries}
+            client = ChatOpenAI(
+                model=key[0],
+                temperature=key[1],
+                openai_api_key=os.getenv("OPENAI_API_KEY"),
+                http_client=_http_client,
+                http_async_client=_http_async_client,
+                **options,
+            )
+            _clients[key] = client
+    return client
+
+
+def registry_stats() -> dict:
+    """Describe the shared clients currently held by the registry."""
+    return {
+        "clients": len(_clients),
+        "keys": [
+            f"{model}@{temperature}" + ("" if retries is None else f"/retries={retries}")
+            for model, temperature, retries in _clients
+        ],
+    }
+
+
 class Model:
     def __init__(self):
-        self.openai_model = ChatOpenAI(
-            model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
-            temperature=0.1,
-            openai_api_key=os.getenv("OPENAI_API_KEY"),
-        )
+        self.openai_model = get_chat_model("default")
@@ -7,7 +7,7 @@ from langchain_openai import OpenAIEmbeddings
 from langchain_core.prompts import ChatPromptTemplate, PromptTemplate, MessagesPlaceholder
 from ..structure_outputs.calendar_structure_output import *
 from prompts.calendar import * 
-from ...model import Model 
+from ...model import ANSWER_TAG, Model
 from ...shared_memory import shared_memory
 
 load_dotenv()
@@ -37,7 +37,7 @@ class CalendarAgent():
         self.ai_response_generator = (
             writer_prompt | 
             model.openai_model.with_structured_output(AIResponseOutput)
-        )
+        ).with_config(tags=[ANSWER_TAG])
 
         proofreader_prompt = PromptTemplate(
             template=AI_RESPONSE_PROOFREADER_PROMPT, 
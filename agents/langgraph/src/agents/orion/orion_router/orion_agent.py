@@ -1,6 +1,5 @@
-import os 
 from dotenv import load_dotenv 
-from langchain_openai import ChatOpenAI
+from ...model import get_chat_model
 from langchain_core.prompts import PromptTemplate
 from .orion_structure_output import RouteOrion, RouterOutput
 from prompts.orion_router import ROUTER_PROMPT
@@ -9,11 +8,7 @@ load_dotenv()
 
 class OrionRouterAgent():
     def __init__(self):
-        self.model = ChatOpenAI(
-            model=os.getenv("OPENAI_MODEL"),
-            temperature=0,
-            openai_api_key=os.getenv("OPENAI_API_KEY"),
-        )
+        self.model = get_chat_model("orion_router")
 
         self.router_prompt = PromptTemplate(
             template=ROUTER_PROMPT,
@@ -1,8 +1,21 @@
 from langgraph.graph import END, StateGraph 
 from .orion_states import GraphState
 from .orion_nodes import RouterNodes
-from ..graphs.calendar_graph import CalendarWorkflow 
-from ..graphs.gmail_graph import GmailWorkflow
+from ...lazy_graph import LazyGraph, warm_graphs
+
+
+def _gmail_graph():
+    from ..graphs.gmail_graph import graph
+    return graph
+
+
+def _calendar_graph():
+    from ..graphs.calendar_graph import graph
+    return graph
+
+
+gmail_graph = LazyGraph("gmail", _gmail_graph)
+calendar_graph = LazyGraph("calendar", _calendar_graph)
 
 class RouterWorkflow:
     def __init__(self):
@@ -10,8 +23,8 @@ class RouterWorkflow:
         router_nodes = RouterNodes()
 
         workflow.add_node("orion_router", router_nodes.route_query)
-        workflow.add_node("gmail_router",GmailWorkflow().app)
-        workflow.add_node("calendar_router",CalendarWorkflow().app)
+        workflow.add_node("gmail_router", gmail_graph.ainvoke)
+        workflow.add_node("calendar_router", calendar_graph.ainvoke)
         workflow.add_node("save_to_memory", router_nodes.save_to_memory)
 
         workflow.set_entry_point("orion_router")
@@ -32,4 +45,9 @@ class RouterWorkflow:
         self.app = workflow.compile()
 
 graph = RouterWorkflow().app
+
+
+async def warm_subgraphs() -> None:
+    """Build the Gmail and Calendar subgraphs in the background."""
+    await warm_graphs(gmail_graph, calendar_graph)
         
\ No newline at end of file
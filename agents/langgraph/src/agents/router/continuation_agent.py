@@ -1,6 +1,5 @@
-import os
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+from ..model import get_chat_model
 from langchain_core.prompts import PromptTemplate
 from .router_structure_output import ContinuationOutput
 from prompts.router import CONTINUATION_PROMPT
@@ -9,11 +8,7 @@ load_dotenv()
 
 class ContinuationAgent:
     def __init__(self):
-        self.model = ChatOpenAI(
-            model=os.getenv("OPENAI_MODEL"),
-            temperature=0,
-            openai_api_key=os.getenv("OPENAI_API_KEY")
-        )
+        self.model = get_chat_model("continuation")
         
         self.prompt = PromptTemplate(
             template=CONTINUATION_PROMPT,
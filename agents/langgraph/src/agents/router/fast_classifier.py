@@ -0,0 +1,212 @@
+import json
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .router_structure_output import RouteCategory
+
+ROUTER_FAST_PATH_THRESHOLD = float(os.getenv("ROUTER_FAST_PATH_THRESHOLD", "0.9"))
+ROUTER_FAST_PATH_MODEL = os.getenv("ROUTER_FAST_PATH_MODEL")
+
+FIXTURES_PATH = Path(__file__).parent / "fixtures" / "route_labels.jsonl"
+
+# (category, pattern, confidence). Confidence is what a single match is worth;
+# matches from competing categories cancel each other out so ambiguous
+# queries fall through to the LLM. Words that are common outside their
+# category ("events", "course", "lunch", "send", "calendar") score below the
+# default threshold, so on their own they never skip the LLM router.
+ROUTE_RULES: List[Tuple[str, str, float]] = [
+    # Kept from the original keyword shortcut: sending an email, draft or reply is an Orion action.
+    ("work", r"\bsend\b.*\b(e-?mails?|drafts?|repl(y|ies)|messages?)\b", 1.0),
+    ("work", r"^\W*send (it|them|that)\W*$", 1.0),
+    ("work", r"\bsend\b", 0.6),
+    ("study", r"\beureka\b", 0.95),
+    ("work", r"\borion\b", 0.95),
+    ("personal", r"\baria\b", 0.95),
+    # Only the assistant's own settings: "the tone of my essay" is a study question.
+    ("setting", r"\b(change|switch|set|update|modify)\b.*\b(your (language|tone|voice|name)|(my|your|the) (pre?fe?re?n?ces?|prefrences)|agent'?s? name|name of the agent)\b", 0.95),
+    ("setting", r"\b(change|switch|set|update|modify) (the |your )?(language|tone|voice)( to \w+)?\W*$", 0.95),
+    ("study", r"\bstudy (plan|schedule|time|session)s?\b", 0.9),
+    ("study", r"\b(homework|exams?|quiz(zes)?|assignments?|coursework|syllabus|classroom|midterms?)\b", 0.9),
+    ("study", r"\b(courses?|lectures?|finals?|textbook)\b", 0.8),
+    ("study", r"\b(explain|derivatives?|equations?|theorem|photosynthesis|mitosis|meiosis|algebra|calculus|physics|chemistry|biology)\b", 0.75),
+    ("work", r"\b(e-?mails?|inbox|gmail|unread|unanswered)\b", 0.9),
+    ("work", r"\b(my|our)\b(\s+\w+)?\s+(calendar|reminders?|appointments?)\b", 0.9),
+    ("work", r"\b(calendar|reminders?|appointments?)\b", 0.7),
+    ("work", r"\b(meetings?|events?)\b", 0.8),
+    # Students draft essays and reports too; only "email draft" and the like are Orion's.
+    ("work", r"\bdrafts?\b", 0.6),
+    ("personal", r"\b(joke|recipes?|weather|hobby|hobbies)\b", 0.9),
+    ("personal", r"\b(movies?|cook|dinner|lunch|breakfast)\b", 0.8),
+    ("personal", r"\b(feeling|stressed|sad|lonely|anxious|tired|bored)\b", 0.7),
+]
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+
+@dataclass
+class FastRouteResult:
+    category: Optional[str]
+    confidence: float
+    source: str
+
+    def is_confident(self, threshold: float = ROUTER_FAST_PATH_THRESHOLD) -> bool:
+        return self.category is not None and self.confidence >= threshold
+
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    if not a or not b:
+        return 0.0
+    dot = sum(w * b.get(t, 0.0) for t, w in a.items())
+    norm_a = math.sqrt(sum(w * w for w in a.values()))
+    norm_b = math.sqrt(sum(w * w for w in b.values()))
+    if not norm_a or not norm_b:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
+class CentroidModel:
+    """TF-IDF nearest-centroid classifier small enough to live in a JSON file."""
+
+    def __init__(self, idf: Dict[str, float], centroids: Dict[str, Dict[str, float]]):
+        self.idf = idf
+        self.centroids = centroids
+
+    def _vectorize(self, text: str) -> Dict[str, float]:
+        counts = Counter(t for t in _tokenize(text) if t in self.idf)
+        return {t: c * self.idf[t] for t, c in counts.items()}
+
+    def predict(self, text: str) -> Tuple[Optional[str], float]:
+        vec = self._vectorize(text)
+        sims = {cat: _cosine(vec, centroid) for cat, centroid in self.centroids.items()}
+        total = sum(sims.values())
+        if not total:
+            return None, 0.0
+        best = max(sims, key=sims.get)
+        return best, sims[best] / total
+
+    @classmethod
+    def train(cls, examples: Iterable[Tuple[str, str]]) -> "CentroidModel":
+        examples = list(examples)
+        doc_freq: Counter = Counter()
+        for query, _ in examples:
+            doc_freq.update(set(_tokenize(query)))
+        n_docs = len(examples) or 1
+        idf = {t: math.log((1 + n_docs) / (1 + df)) + 1.0 for t, df in doc_freq.items()}
+
+        model = cls(idf, {})
+        sums: Dict[str, Counter] = {}
+        sizes: Counter = Counter()
+        for query, label in examples:
+            sums.setdefault(label, Counter()).update(model._vectorize(query))
+            sizes[label] += 1
+        model.centroids = {
+            label: {t: w / sizes[label] for t, w in total.items()}
+            for label, total in sums.items()
+        }
+        return model
+
+    @classmethod
+    def load(cls, path: Path) -> "CentroidModel":
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(data["idf"], data["centroids"])
+
+    def save(self, path: Path) -> None:
+        Path(path).write_text(json.dumps({"idf": self.idf, "centroids": self.centroids}), encoding="utf-8")
+
+
+class SklearnModel:
+    """Wraps a joblib-pickled scikit-learn pipeline exposing predict_proba."""
+
+    def __init__(self, path: Path):
+        import joblib
+
+        self.pipeline = joblib.load(path)
+
+    def predict(self, text: str) -> Tuple[Optional[str], float]:
+        probs = self.pipeline.predict_proba([text])[0]
+        idx = max(range(len(probs)), key=lambda i: probs[i])
+        return str(self.pipeline.classes_[idx]), float(probs[idx])
+
+
+def load_model(path: Optional[str]):
+    """Load an on-disk route model, or None when unset or unavailable."""
+    if not path:
+        return None
+    try:
+        if str(path).endswith((".joblib", ".pkl")):
+            return SklearnModel(Path(path))
+        return CentroidModel.load(Path(path))
+    except Exception as e:
+        print(f"Could not load fast router model from {path}: {e}")
+        return None
+
+
+def load_fixtures(path: Path = FIXTURES_PATH) -> List[Tuple[str, str]]:
+    """Load (query, label) pairs from a JSONL fixture file."""
+    examples = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                row = json.loads(line)
+                examples.append((row["query"], row["label"]))
+    return examples
+
+
+class FastRouteClassifier:
+    """Local pre-classifier consulted before the LLM router."""
+
+    def __init__(self, rules: Optional[List[Tuple[str, str, float]]] = None, model=None):
+        self.rules = [
+            (category, re.compile(pattern, re.IGNORECASE), confidence)
+            for category, pattern, confidence in (rules if rules is not None else ROUTE_RULES)
+        ]
+        self.model = model if model is not None else load_model(ROUTER_FAST_PATH_MODEL)
+        self._valid = {c.value for c in RouteCategory}
+
+    def _classify_rules(self, query: str) -> FastRouteResult:
+        scores: Dict[str, float] = {}
+        for category, pattern, confidence in self.rules:
+            if pattern.search(query):
+                scores[category] = max(scores.get(category, 0.0), confidence)
+        if not scores:
+            return FastRouteResult(None, 0.0, "rules")
+
+        ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+        best, best_conf = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        # The send shortcut is absolute, as it was before the classifier existed.
+        if best_conf >= 1.0:
+            return FastRouteResult(best, 1.0, "rules")
+        return FastRouteResult(best, max(0.0, best_conf - runner_up), "rules")
+
+    def classify(self, query: str) -> FastRouteResult:
+        result = self._classify_rules(query or "")
+        if result.confidence >= 1.0 or self.model is None:
+            return result
+
+        try:
+            category, confidence = self.model.predict(query or "")
+        except Exception as e:
+            print(f"Fast router model failed: {e}")
+            return result
+        if category not in self._valid:
+            return result
+
+        if result.category == category:
+            # Rules and model agree: combine as independent evidence.
+            combined = 1.0 - (1.0 - result.confidence) * (1.0 - confidence)
+            return FastRouteResult(category, combined, "rules+model")
+        # Disagreement: keep the stronger signal, discounted by the weaker one.
+        if confidence > result.confidence:
+            return FastRouteResult(category, confidence - result.confidence, "model")
+        return FastRouteResult(result.category, result.confidence - confidence, "rules")
@@ -0,0 +1,86 @@
+"""Benchmark the fast-path router against LLM labels.
+
+Run from ``agents/langgraph/src``:
+
+    python -m agents.router.fast_path_benchmark
+    python -m agents.router.fast_path_benchmark --llm
+    python -m agents.router.fast_path_benchmark --train-model router_model.json
+"""
+import argparse
+import time
+from pathlib import Path
+
+from .fast_classifier import (
+    FIXTURES_PATH,
+    ROUTER_FAST_PATH_THRESHOLD,
+    CentroidModel,
+    FastRouteClassifier,
+    load_fixtures,
+    load_model,
+)
+
+
+def run(fixtures: Path, threshold: float, model_path: str | None, use_llm: bool, llm_latency_ms: float) -> dict:
+    examples = load_fixtures(fixtures)
+    classifier = FastRouteClassifier(model=load_model(model_path)) if model_path else FastRouteClassifier()
+
+    router = None
+    if use_llm:
+        from .router_agent import RouterAgent
+        router = RouterAgent()
+
+    hits = correct = 0
+    fast_ms = 0.0
+    llm_ms = []
+    for query, label in examples:
+        if router is not None:
+            start = time.perf_counter()
+            label = router.route(query).category.value
+            llm_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        result = classifier.classify(query)
+        fast_ms += (time.perf_counter() - start) * 1000
+
+        if result.is_confident(threshold):
+            hits += 1
+            if result.category == label:
+                correct += 1
+            else:
+                print(f"MISROUTE [{result.source} {result.confidence:.2f}] {query!r}: {result.category} != {label}")
+
+    total = len(examples) or 1
+    avg_llm = sum(llm_ms) / len(llm_ms) if llm_ms else llm_latency_ms
+    return {
+        "examples": len(examples),
+        "threshold": threshold,
+        "hit_rate": hits / total,
+        "accuracy_on_hits": correct / hits if hits else 0.0,
+        "avg_fast_ms": fast_ms / total,
+        "avg_llm_ms": avg_llm,
+        "latency_saved_ms_per_query": (hits * avg_llm - fast_ms) / total,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_PATH)
+    parser.add_argument("--threshold", type=float, default=ROUTER_FAST_PATH_THRESHOLD)
+    parser.add_argument("--model", help="Centroid JSON or joblib model to evaluate with the rules")
+    parser.add_argument("--llm", action="store_true", help="Relabel fixtures live with RouterAgent and time it")
+    parser.add_argument("--llm-latency-ms", type=float, default=900.0, help="Assumed LLM latency when --llm is off")
+    parser.add_argument("--train-model", type=Path, help="Train a centroid model from the fixtures and write it here")
+    args = parser.parse_args()
+
+    if args.train_model:
+        CentroidModel.train(load_fixtures(args.fixtures)).save(args.train_model)
+        print(f"Wrote centroid model to {args.train_model}")
+        return
+
+    report = run(args.fixtures, args.threshold, args.model, args.llm, args.llm_latency_ms)
+    for key, value in report.items():
+        print(f"{key:>28}: {value:.3f}" if isinstance(value, float) else f"{key:>28}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,5 @@
-import os 
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+from ..model import get_chat_model
 from langchain_core.prompts import PromptTemplate
 from .router_structure_output import RouterOutput, RouteCategory
 from prompts.router import ROUTER_PROMPT
@@ -9,11 +8,7 @@ load_dotenv()
 
 class RouterAgent:
     def __init__(self):
-        self.model = ChatOpenAI(
-            model=os.getenv("OPENAI_MODEL"),
-            temperature=0,
-            openai_api_key=os.getenv("OPENAI_API_KEY")
-        )
+        self.model = get_chat_model("router")
         
         self.router_prompt = PromptTemplate(
             template=ROUTER_PROMPT,
@@ -25,7 +20,8 @@ class RouterAgent:
             | self.model.with_structured_output(RouterOutput)
         )
 
-    def route(self, query: str, preferences: dict | None = None) -> RouterOutput:
+    @staticmethod
+    def _format_preferences(preferences: dict | None) -> str:
         pref_text = ""
         if preferences:
             lang = preferences.get("language") or "unspecified"
@@ -38,4 +34,12 @@ class RouterAgent:
                 f"Agent name: {name}\n"
                 f"Additional notes: {extra}"
             )
+        return pref_text
+
+    def route(self, query: str, preferences: dict | None = None) -> RouterOutput:
+        pref_text = self._format_preferences(preferences)
         return self.router_runnable.invoke({"query": query, "preferences": pref_text})
+
+    async def aroute(self, query: str, preferences: dict | None = None) -> RouterOutput:
+        pref_text = self._format_preferences(preferences)
+        return await self.router_runnable.ainvoke({"query": query, "preferences": pref_text})
@@ -2,9 +2,27 @@ from langgraph.graph import END, StateGraph
 from .router_state import GraphState
 from .router_nodes import RouterNodes
 from .router_response_nodes import ResponseNodes
-from ..eureka.graph import ClassroomWorkflow
-from ..orion.orion_router.orion_graph import graph as orion_graph
-from ..self.graph import SelfWorkflow
+from ..lazy_graph import LazyGraph, warm_graphs
+
+
+def _study_graph():
+    from ..eureka.graph import graph
+    return graph
+
+
+def _work_graph():
+    from ..orion.orion_router.orion_graph import graph
+    return graph
+
+
+def _setting_graph():
+    from ..self.graph import graph
+    return graph
+
+
+study_graph = LazyGraph("study", _study_graph)
+work_graph = LazyGraph("work", _work_graph)
+setting_graph = LazyGraph("setting", _setting_graph)
 
 class RouterWorkflow:
     def __init__(self):
@@ -13,10 +31,10 @@ class RouterWorkflow:
         response_nodes = ResponseNodes(emotion_agent=None)
 
         workflow.add_node("router", router_nodes.route_query)
-        workflow.add_node("study_agent", ClassroomWorkflow().app)
+        workflow.add_node("study_agent", study_graph.ainvoke)
         workflow.add_node("personal_agent", response_nodes.generate_personal_response)
-        workflow.add_node("work_agent", orion_graph)
-        workflow.add_node('setting_agent', SelfWorkflow().app)
+        workflow.add_node("work_agent", work_graph.ainvoke)
+        workflow.add_node('setting_agent', setting_graph.ainvoke)
         workflow.set_entry_point("router")
         
         workflow.add_conditional_edges(
@@ -49,3 +67,12 @@ class RouterWorkflow:
         self.app = workflow.compile()
 
 graph = RouterWorkflow().app
+
+
+async def warm_subgraphs() -> None:
+    """Build the agent subgraphs in the background after startup."""
+    await warm_graphs(study_graph, work_graph, setting_graph)
+
+    if work_graph.is_built:
+        from ..orion.orion_router.orion_graph import warm_subgraphs as warm_orion_subgraphs
+        await warm_orion_subgraphs()
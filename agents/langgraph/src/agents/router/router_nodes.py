@@ -1,17 +1,24 @@
+import asyncio
 from colorama import Fore, Style
 from .router_agent import RouterAgent
 from .continuation_agent import ContinuationAgent
+from .fast_classifier import FastRouteClassifier, ROUTER_FAST_PATH_THRESHOLD
 from .router_state import GraphState
 from ..aria.agents.agent import EmotionAgent
 
 class RouterNodes:
     def __init__(self):
         self.agent = RouterAgent()
+        self.fast_classifier = FastRouteClassifier()
         self.continuation_agent = ContinuationAgent()
         self.emotion_agent = EmotionAgent()
 
-    def route_query(self, state: GraphState) -> GraphState:
-        """Route the user query to the appropriate agent."""
+    async def route_query(self, state: GraphState) -> GraphState:
+        """Route the user query to the appropriate agent.
+
+        Routing and emotion detection are independent LLM calls, so both are
+        issued together and awaited as one round trip.
+        """
         print(Fore.YELLOW + "Routing query..." + Style.RESET_ALL)
         query = state.get("query", "")
         student_id = state.get("student_id")
@@ -23,18 +30,22 @@ class RouterNodes:
         print(Fore.CYAN + f"Is first message: {is_first}" + Style.RESET_ALL)
         print(Fore.CYAN + f"Student ID: {student_id}" + Style.RESET_ALL)
         
-        query_lower = query.lower()
-        send_keywords = ["send", "send it", "send the draft", "send email", "send the email", "send this draft", "send draft"]
-        if any(keyword in query_lower for keyword in send_keywords):
-            category = "work"  #
-            print(Fore.GREEN + f"Query routed to: {category} (email send detected)" + Style.RESET_ALL)
+        fast = self.fast_classifier.classify(query)
+
+        print(Fore.YELLOW + "Detecting emotion..." + Style.RESET_ALL)
+        emotion_task = self.emotion_agent.adetect(query, prefs)
+        if fast.is_confident(ROUTER_FAST_PATH_THRESHOLD):
+            emotion_result = await emotion_task
+            category = fast.category
+            print(Fore.GREEN + f"Query routed to: {category} (fast path: {fast.source}, confidence {fast.confidence:.2f})" + Style.RESET_ALL)
         else:
-            result = self.agent.route(query, prefs)
+            result, emotion_result = await asyncio.gather(
+                self.agent.aroute(query, prefs),
+                emotion_task,
+            )
             category = result.category.value
             print(Fore.GREEN + f"Query routed to: {category}" + Style.RESET_ALL)
         
-        print(Fore.YELLOW + "Detecting emotion..." + Style.RESET_ALL)
-        emotion_result = self.emotion_agent.detect(query, prefs)
         emotion = emotion_result.emotion.value if hasattr(emotion_result.emotion, 'value') else str(emotion_result.emotion)
         
         print(Fore.GREEN + f"Emotion detected: {emotion}" + Style.RESET_ALL)
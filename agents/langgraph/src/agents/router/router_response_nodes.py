@@ -1,10 +1,9 @@
-import os
 from typing import Optional
 
 from colorama import Fore, Style
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 
+from ..model import ANSWER_TAG, get_chat_model
 from ..shared_memory import shared_memory
 from .router_state import GraphState
 
@@ -29,11 +28,7 @@ class ResponseNodes:
     """Response generation for personal conversations."""
 
     def __init__(self, emotion_agent=None):
-        self.llm = ChatOpenAI(
-            model=os.getenv("OPENAI_MODEL"),
-            temperature=0.7,
-            openai_api_key=os.getenv("OPENAI_API_KEY"),
-        )
+        self.llm = get_chat_model("personal")
         self.emotion_agent = emotion_agent
 
     def _detect_emotion(self, query: str, prefs: dict) -> Optional[str]:
@@ -100,7 +95,9 @@ recurring routines, and preferences.
         prompt = self.build_prompt(prefs, memory_context)
 
         try:
-            response = await self.llm.ainvoke(prompt.format(query=query))
+            response = await self.llm.ainvoke(
+                prompt.format(query=query), config={"tags": [ANSWER_TAG]}
+            )
             ai_response = response.content
 
             if state.get("is_first_message"):
@@ -32,4 +32,5 @@ class GraphState(TypedDict):
     user_preferences: Optional[dict]
     is_first_message: Optional[bool]
     study_plan: Optional[dict]
+    shared_answer: Optional[bool]
     email_draft_id: Optional[str]
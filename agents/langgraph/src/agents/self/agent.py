@@ -1,6 +1,5 @@
-import os 
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+from ..model import get_chat_model
 from langchain_core.prompts import PromptTemplate
 from .structure_output import SelfAction, SelfAgentOutput
 from prompts.self import SELF_PROMPT
@@ -9,11 +8,7 @@ load_dotenv()
 
 class SelfAgent:
     def __init__(self):
-        self.model = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0,
-            openai_api_key=os.getenv("OPENAI_API_KEY")
-        )
+        self.model = get_chat_model("self")
         
         self.router_prompt = PromptTemplate(
             template=SELF_PROMPT,
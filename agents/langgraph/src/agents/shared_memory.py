@@ -1,10 +1,173 @@
+import asyncio
+import hashlib
 import os
+import time
+from collections import OrderedDict
+from typing import Optional
+
 import httpx
+import numpy as np
 from dotenv import load_dotenv
 from langchain_core.runnables import RunnableConfig
+from langchain_openai import OpenAIEmbeddings
+
+from .similarity import cosine_scores, unit_rows, unit_vector
 
 load_dotenv()
 
+MEMORY_HTTP_MAX_CONNECTIONS = int(os.getenv("MEMORY_HTTP_MAX_CONNECTIONS", "20"))
+MEMORY_HTTP_MAX_KEEPALIVE = int(os.getenv("MEMORY_HTTP_MAX_KEEPALIVE", "10"))
+MEMORY_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("MEMORY_HTTP_KEEPALIVE_EXPIRY", "30"))
+MEMORY_HTTP2 = os.getenv("MEMORY_HTTP2", "true").lower() == "true"
+MEMORY_HTTP_TIMEOUT = 5.0
+MEMORY_CACHE_MAX_USERS = int(os.getenv("MEMORY_CACHE_MAX_USERS", "1024"))
+MEMORY_CACHE_TTL = float(os.getenv("MEMORY_CACHE_TTL", "300"))
+# Each indexed user holds up to MEMORY_RETRIEVE_LIMIT float32 vectors (~300 KB at 1536 dims).
+MEMORY_INDEX_MAX_USERS = int(os.getenv("MEMORY_INDEX_MAX_USERS", "256"))
+MEMORY_RETRIEVE_LIMIT = 50
+MEMORY_WRITE_BATCH_SIZE = int(os.getenv("MEMORY_WRITE_BATCH_SIZE", "20"))
+MEMORY_WRITE_FLUSH_INTERVAL = float(os.getenv("MEMORY_WRITE_FLUSH_INTERVAL", "1.0"))
+MEMORY_WRITE_MAX_RETRIES = int(os.getenv("MEMORY_WRITE_MAX_RETRIES", "3"))
+MEMORY_WRITE_RETRY_BACKOFF = float(os.getenv("MEMORY_WRITE_RETRY_BACKOFF", "0.5"))
+MEMORY_WRITE_QUEUE_SIZE = int(os.getenv("MEMORY_WRITE_QUEUE_SIZE", "1000"))
+MEMORY_WRITE_DRAIN_TIMEOUT = float(os.getenv("MEMORY_WRITE_DRAIN_TIMEOUT", "10"))
+MEMORY_BULK_PATH = os.getenv("MEMORY_BULK_PATH", "/api/save-memos")
+MEMORY_EMBEDDING_MODEL = os.getenv("MEMORY_EMBEDDING_MODEL", "text-embedding-3-small")
+MEMORY_TOP_K = int(os.getenv("MEMORY_TOP_K", "8"))
+MEMORY_TOKEN_BUDGET = int(os.getenv("MEMORY_TOKEN_BUDGET", "800"))
+MEMORY_RECENCY_WEIGHT = float(os.getenv("MEMORY_RECENCY_WEIGHT", "0.2"))
+MEMORY_RECENCY_HALF_LIFE = float(os.getenv("MEMORY_RECENCY_HALF_LIFE", "10"))
+
+
+class MemoryCache:
+    """Per-user LRU cache of formatted memo lines with a TTL."""
+
+    def __init__(self, max_users: int = MEMORY_CACHE_MAX_USERS, ttl: float = MEMORY_CACHE_TTL):
+        self.max_users = max_users
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple[float, list[str]]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def get(self, user_id: str) -> Optional[list[str]]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[user_id]
+            self.stats["expirations"] += 1
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.stats["hits"] += 1
+        return list(value)
+
+    def set(self, user_id: str, lines: list[str]) -> None:
+        self._entries[user_id] = (time.monotonic() + self.ttl, list(lines))
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_users:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def prepend(self, user_id: str, line: str, max_lines: int = MEMORY_RETRIEVE_LIMIT) -> None:
+        """Write a new memo line through to a cached entry, keeping newest first."""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return
+        expires_at, lines = entry
+        self._entries[user_id] = (expires_at, ([line] + lines)[:max_lines])
+
+    def invalidate(self, user_id: str) -> None:
+        self._entries.pop(user_id, None)
+
+    def metrics(self) -> dict:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "size": len(self._entries),
+            "hit_ratio": self.stats["hits"] / lookups if lookups else 0.0,
+        }
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class MemoryIndex:
+    """Per-user store of memo embeddings, keyed by the hash of the memo line.
+
+    Each memo is embedded once; later lookups only embed lines not seen before.
+    Vectors are kept as float32 unit rows, so ranking is one matrix product.
+    """
+
+    def __init__(self, max_users: int = MEMORY_INDEX_MAX_USERS):
+        self.max_users = max_users
+        self._embeddings: OpenAIEmbeddings | None = None
+        self._vectors: "OrderedDict[str, dict[str, np.ndarray]]" = OrderedDict()
+        self.stats = {"embedded": 0, "reused": 0}
+
+    def _get_embeddings(self) -> OpenAIEmbeddings:
+        if self._embeddings is None:
+            self._embeddings = OpenAIEmbeddings(
+                model=MEMORY_EMBEDDING_MODEL,
+                openai_api_key=os.getenv("OPENAI_API_KEY"),
+            )
+        return self._embeddings
+
+    @staticmethod
+    def _key(line: str) -> str:
+        return hashlib.sha256(line.encode("utf-8")).hexdigest()
+
+    async def rank(self, user_id: str, lines: list[str], query: str) -> list[float]:
+        """Return a similarity score against ``query`` for every line."""
+        vectors = self._vectors.setdefault(user_id, {})
+        self._vectors.move_to_end(user_id)
+        while len(self._vectors) > self.max_users:
+            self._vectors.popitem(last=False)
+
+        keys = [self._key(line) for line in lines]
+        missing = [(k, line) for k, line in zip(keys, lines) if k not in vectors]
+        embeddings = self._get_embeddings()
+
+        if missing:
+            query_vec, new_vecs = await asyncio.gather(
+                embeddings.aembed_query(query),
+                embeddings.aembed_documents([line for _, line in missing]),
+            )
+            for (k, _), vec in zip(missing, unit_rows(new_vecs)):
+                vectors[k] = vec
+        else:
+            query_vec = await embeddings.aembed_query(query)
+        self.stats["embedded"] += len(missing)
+        self.stats["reused"] += len(lines) - len(missing)
+
+        # Drop vectors for memos that fell out of the retrieve window.
+        live = set(keys)
+        for k in [k for k in vectors if k not in live]:
+            del vectors[k]
+
+        matrix = np.stack([vectors[k] for k in keys]) if keys else np.zeros((0, 0), dtype=np.float32)
+        return cosine_scores(unit_vector(query_vec), matrix).tolist()
+
+
+def _format_memo(memo: dict) -> str:
+    user_q = memo.get("user_query") or ""
+    ai_q = memo.get("ai_query") or ""
+    category = memo.get("category") or ""
+    emotion = memo.get("emotion") or ""
+    parts = []
+    if user_q:
+        parts.append(f"User: {user_q}")
+    if ai_q:
+        parts.append(f"AI: {ai_q}")
+    if category:
+        parts.append(f"Category: {category}")
+    if emotion:
+        parts.append(f"Emotion: {emotion}")
+    return " | ".join(parts)
+
+
 class SharedMemoryManager:
     _instance = None
 
@@ -16,6 +179,87 @@ class SharedMemoryManager:
 
     def _initialize(self):
         self.backend_url = os.getenv("BACKEND_URL")
+        self._client: httpx.AsyncClient | None = None
+        self._http_stats = {"requests": 0, "connections_opened": 0}
+        self.cache = MemoryCache()
+        self.index = MemoryIndex()
+        self._write_queue: asyncio.Queue | None = None
+        self._writer_task: asyncio.Task | None = None
+        # None until the backend has told us whether MEMORY_BULK_PATH exists.
+        self._bulk_supported: bool | None = None if MEMORY_BULK_PATH else False
+        self.write_stats = {"enqueued": 0, "dropped": 0, "batches": 0, "saved": 0, "failed": 0, "retries": 0}
+
+    def _build_client(self) -> httpx.AsyncClient:
+        http2 = MEMORY_HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                print("h2 not installed, memory client falling back to HTTP/1.1")
+                http2 = False
+
+        return httpx.AsyncClient(
+            base_url=self.backend_url or "",
+            http2=http2,
+            timeout=MEMORY_HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=MEMORY_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=MEMORY_HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=MEMORY_HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared pooled client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+
+    async def _trace(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self._http_stats["connections_opened"] += 1
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        self._http_stats["requests"] += 1
+        return await self._get_client().request(
+            method, path, extensions={"trace": self._trace}, **kwargs
+        )
+
+    async def startup(self) -> None:
+        """Open the pooled backend client and memo writer; call from the app's startup hook."""
+        if self.backend_url:
+            self._get_client()
+            self._ensure_writer()
+
+    async def shutdown(self) -> None:
+        """Drain pending memo writes and close the client; call from the app's shutdown hook."""
+        if self._write_queue is not None:
+            try:
+                await asyncio.wait_for(self._write_queue.join(), MEMORY_WRITE_DRAIN_TIMEOUT)
+            except asyncio.TimeoutError:
+                print(f"Memory writer drain timed out with {self._write_queue.qsize()} memos pending")
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def http_metrics(self) -> dict:
+        """Connection reuse counters for the backend client."""
+        requests = self._http_stats["requests"]
+        opened = self._http_stats["connections_opened"]
+        reused = max(0, requests - opened)
+        return {
+            "requests": requests,
+            "connections_opened": opened,
+            "connections_reused": reused,
+            "reuse_ratio": reused / requests if requests else 0.0,
+        }
 
     async def extract_and_save(
         self,
@@ -40,70 +284,184 @@ class SharedMemoryManager:
             "emotion": emotion
         }
         
+        if not ai_response:
+            # /api/save-memo rejects memos without an AI reply.
+            return
+
+        self._ensure_writer()
         try:
-            async with httpx.AsyncClient() as client:
-                await client.post(
-                    f"{self.backend_url}/api/save-memo",
-                    json=sync_data,
-                    timeout=5.0
-                )
-            print(f"Saved interaction for user {user_id} to backend")
-        except Exception as e:
-            print(f"Backend save failed: {e}")
+            # Never make the request wait on the writer; shed the memo instead.
+            self._write_queue.put_nowait(sync_data)
+        except asyncio.QueueFull:
+            self.write_stats["dropped"] += 1
+            print(f"Memory write queue full ({MEMORY_WRITE_QUEUE_SIZE}), dropping memo for user {user_id}")
+            return
+        self.write_stats["enqueued"] += 1
+        self.cache.prepend(str(user_id), _format_memo(sync_data))
 
-    async def retrieve(self, user_id: str) -> str:
-        """Retrieve long-term memories for a user via the Go backend /api/memos endpoint."""
-        if not user_id:
-            return ""
+    def _ensure_writer(self) -> None:
+        """Start the background memo writer on the running loop if needed."""
+        if self._write_queue is None:
+            self._write_queue = asyncio.Queue(maxsize=MEMORY_WRITE_QUEUE_SIZE)
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.get_running_loop().create_task(self._writer_loop())
 
-        if not self.backend_url:
-            print("Backend URL not set, skipping retrieval")
-            return ""
+    async def _writer_loop(self) -> None:
+        """Collect queued memos into batches, flushing on size or interval."""
+        queue = self._write_queue
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + MEMORY_WRITE_FLUSH_INTERVAL
+            while len(batch) < MEMORY_WRITE_BATCH_SIZE:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._flush(batch)
+            except Exception as e:
+                self.write_stats["failed"] += len(batch)
+                print(f"Backend save failed: {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _flush(self, batch: list[dict]) -> None:
+        self.write_stats["batches"] += 1
+
+        if self._bulk_supported is not False and len(batch) > 1:
+            resp = await self._post_with_retry(MEMORY_BULK_PATH, {"memos": batch})
+            if resp is None:
+                self.write_stats["failed"] += len(batch)
+                print(f"Bulk memo save failed after {MEMORY_WRITE_MAX_RETRIES} retries")
+                return
+            if resp.status_code < 400:
+                self._bulk_supported = True
+                self.write_stats["saved"] += len(batch)
+                print(f"Saved {len(batch)} interactions to backend")
+                return
+            if resp.status_code in (404, 405):
+                print("Bulk memo endpoint unavailable, saving memos one by one")
+                self._bulk_supported = False
+            # Any other 4xx means one memo was rejected; save individually to isolate it.
+
+        results = await asyncio.gather(
+            *(self._post_with_retry("/api/save-memo", memo) for memo in batch)
+        )
+        for memo, resp in zip(batch, results):
+            if resp is not None and resp.status_code < 400:
+                self.write_stats["saved"] += 1
+                print(f"Saved interaction for user {memo['user_id']} to backend")
+            else:
+                self.write_stats["failed"] += 1
+                print(f"Backend save failed: {resp.status_code if resp is not None else 'no response'}")
+
+    async def _post_with_retry(self, path: str, payload: dict) -> Optional[httpx.Response]:
+        """POST with exponential backoff on transport errors, 408, 429 and 5xx."""
+        delay = MEMORY_WRITE_RETRY_BACKOFF
+        for attempt in range(MEMORY_WRITE_MAX_RETRIES + 1):
+            try:
+                resp = await self._request("POST", path, json=payload)
+                if resp.status_code < 500 and resp.status_code not in (408, 429):
+                    return resp
+                print(f"Backend {path} returned {resp.status_code} (attempt {attempt + 1})")
+            except httpx.HTTPError as e:
+                print(f"Backend {path} request failed: {e} (attempt {attempt + 1})")
+            if attempt < MEMORY_WRITE_MAX_RETRIES:
+                self.write_stats["retries"] += 1
+                await asyncio.sleep(delay)
+                delay *= 2
+        return None
+
+    def write_metrics(self) -> dict:
+        """Counters for the background memo writer."""
+        return {
+            **self.write_stats,
+            "pending": self._write_queue.qsize() if self._write_queue is not None else 0,
+            "bulk_supported": self._bulk_supported,
+        }
+
+    async def _load_lines(self, user_id: str) -> list[str]:
+        """Return formatted memo lines, newest first, from cache or the Go backend."""
+        cached = self.cache.get(str(user_id))
+        if cached is not None:
+            return cached
 
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(
-                    f"{self.backend_url}/api/memos",
-                    params={"user_id": user_id, "limit": 50},
-                    timeout=5.0,
-                )
+            resp = await self._request(
+                "GET",
+                "/api/memos",
+                params={"user_id": user_id, "limit": MEMORY_RETRIEVE_LIMIT},
+            )
 
             if resp.status_code != 200:
                 print(f"backend memos fetch failed with status {resp.status_code}")
-                return ""
+                return []
 
             payload = resp.json()
             memos = payload.get("data") or []
-            if not isinstance(memos, list) or not memos:
-                return ""
-
-            lines = []
-            for memo in memos:
-                user_q = memo.get("user_query") or ""
-                ai_q = memo.get("ai_query") or ""
-                category = memo.get("category") or ""
-                emotion = memo.get("emotion") or ""
-                parts = []
-                if user_q:
-                    parts.append(f"User: {user_q}")
-                if ai_q:
-                    parts.append(f"AI: {ai_q}")
-                if category:
-                    parts.append(f"Category: {category}")
-                if emotion:
-                    parts.append(f"Emotion: {emotion}")
-                if parts:
-                    lines.append(" | ".join(parts))
-
-            if not lines:
-                return ""
-
-            result = "\n".join(lines)
-            return result
+            if not isinstance(memos, list):
+                memos = []
+
+            lines = [line for line in (_format_memo(memo) for memo in memos) if line]
+            self.cache.set(str(user_id), lines)
+            return lines
         except Exception as e:
             print(f"backend retrieval failed: {e}")
+            return []
+
+    async def retrieve(
+        self,
+        user_id: str,
+        query: str = "",
+        k: int = MEMORY_TOP_K,
+        token_budget: int = MEMORY_TOKEN_BUDGET,
+    ) -> str:
+        """Retrieve the memories most relevant to ``query`` via the Go backend /api/memos endpoint.
+
+        Memos are scored by embedding similarity plus a recency bonus; the top ``k``
+        that fit in ``token_budget`` are returned newest first. Without a query,
+        or if embedding fails, the most recent memos are used.
+        """
+        if not user_id:
             return ""
 
+        if not self.backend_url:
+            print("Backend URL not set, skipping retrieval")
+            return ""
+
+        lines = await self._load_lines(user_id)
+        if not lines:
+            return ""
+
+        recency = [0.5 ** (i / MEMORY_RECENCY_HALF_LIFE) for i in range(len(lines))]
+        scores = recency
+        if query:
+            try:
+                similarity = await self.index.rank(str(user_id), lines, query)
+                scores = [sim + MEMORY_RECENCY_WEIGHT * rec for sim, rec in zip(similarity, recency)]
+            except Exception as e:
+                print(f"memory ranking failed, using most recent memos: {e}")
+
+        ranked = sorted(range(len(lines)), key=lambda i: scores[i], reverse=True)
+        selected = []
+        used = 0
+        for i in ranked:
+            if len(selected) >= k:
+                break
+            cost = _estimate_tokens(lines[i])
+            if used + cost > token_budget:
+                continue
+            selected.append(i)
+            used += cost
+
+        return "\n".join(lines[i] for i in sorted(selected))
+
     def is_ready(self) -> bool:
         return self.backend_url is not None
 
@@ -0,0 +1,22 @@
+from typing import Sequence
+
+import numpy as np
+
+
+def unit_rows(vectors: Sequence) -> np.ndarray:
+    """Stack embeddings into a float32 matrix of unit-length rows; all-zero rows stay zero."""
+    matrix = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def unit_vector(vector: Sequence[float]) -> np.ndarray:
+    return unit_rows(vector)[0]
+
+
+def cosine_scores(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """Similarity of a unit ``query`` to each unit row of ``matrix``."""
+    if not len(matrix):
+        return np.zeros(0, dtype=np.float32)
+    return matrix @ query
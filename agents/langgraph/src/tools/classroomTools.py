@@ -1,6 +1,7 @@
 import os
 import logging
 import io
+import threading
 from pathlib import Path
 from typing import Optional, List, Dict
 from google_auth_oauthlib.flow import InstalledAppFlow
@@ -27,10 +28,24 @@ TOKEN_FILE = LANGGRAPH_DIR / "token.json"
 
 class ClassroomTool:
     def __init__(self):
-        self.drive_service = None
-        self.service = self.authenticate()
-
-    def authenticate(self):
+        self._local = threading.local()
+        self.creds = self.authenticate()
+
+    @property
+    def service(self):
+        """Classroom client for the calling thread (httplib2 clients are not thread-safe)."""
+        if getattr(self._local, "service", None) is None:
+            self._local.service = build("classroom", "v1", credentials=self.creds)
+        return self._local.service
+
+    @property
+    def drive_service(self):
+        """Drive client for the calling thread."""
+        if getattr(self._local, "drive_service", None) is None:
+            self._local.drive_service = build("drive", "v3", credentials=self.creds)
+        return self._local.drive_service
+
+    def authenticate(self) -> Credentials:
         """Authenticate with Google Classroom API"""
         creds = None
 
@@ -51,8 +66,7 @@ class ClassroomTool:
         with open(TOKEN_FILE, "w") as token:
             token.write(creds.to_json())
 
-        self.drive_service = build("drive", "v3", credentials=creds)
-        return build("classroom", "v1", credentials=creds)
+        return creds
 
 
     def list_courses(self, course_state: Optional[str] = None) -> List[Dict]:
@@ -157,15 +171,25 @@ class ClassroomTool:
         except Exception as e:
             raise Exception(f"Failed to list coursework materials: {str(e)}")
     
+    def get_drive_file(self, file_id: str) -> Dict:
+        """
+        Fetch a Drive file's version fields (md5Checksum, modifiedTime).
+        Returns an empty dict when the metadata is unavailable.
+        """
+        try:
+            return self.drive_service.files().get(
+                fileId=file_id,
+                fields="id,md5Checksum,modifiedTime",
+            ).execute()
+        except Exception as e:
+            logging.warning(f"Failed to fetch Drive metadata for {file_id}: {str(e)}")
+            return {}
+
     def download_drive_pdf(self, file_id: str) -> Optional[bytes]:
         """
         Download a PDF file from Google Drive.
         """
         try:
-            if not self.drive_service:
-                creds = Credentials.from_authorized_user_file(str(TOKEN_FILE), SCOPES)
-                self.drive_service = build('drive', 'v3', credentials=creds)
-            
             request = self.drive_service.files().get_media(fileId=file_id)
             file_buffer = io.BytesIO()
             downloader = MediaIoBaseDownload(file_buffer, request)
@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+CLASSROOM_MAX_WORKERS = int(os.getenv("CLASSROOM_MAX_WORKERS", "8"))
+CLASSROOM_CACHE_TTL = float(os.getenv("CLASSROOM_CACHE_TTL", "300"))
+CLASSROOM_CACHE_MAX_ENTRIES = int(os.getenv("CLASSROOM_CACHE_MAX_ENTRIES", "2048"))
+
+
+class ClassroomLoader:
+    """Concurrent, de-duplicated and TTL-cached reads from the Classroom API.
+
+    Calls fan out over a bounded thread pool. Identical calls already in flight
+    share one future, and completed results are cached per user for
+    ``ttl`` seconds so a study question does not re-walk the Classroom tree.
+    The cache is kept in expiry order: expired entries are pruned on every
+    insert, and the oldest go first once it holds ``max_entries``.
+    """
+
+    def __init__(
+        self,
+        classroom_tool,
+        max_workers: int = CLASSROOM_MAX_WORKERS,
+        ttl: float = CLASSROOM_CACHE_TTL,
+        max_entries: int = CLASSROOM_CACHE_MAX_ENTRIES,
+    ):
+        self.classroom_tool = classroom_tool
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="classroom")
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._inflight: Dict[tuple, Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "shared": 0}
+
+    def _fetch(self, user_id: Optional[str], method: str, *args) -> Future:
+        key = (user_id or "default", method, args)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                if cached[0] > time.monotonic():
+                    self.stats["hits"] += 1
+                    future = Future()
+                    future.set_result(cached[1])
+                    return future
+                del self._cache[key]
+
+            inflight = self._inflight.get(key)
+            if inflight is not None:
+                self.stats["shared"] += 1
+                return inflight
+
+            self.stats["misses"] += 1
+            future = self._executor.submit(getattr(self.classroom_tool, method), *args)
+            self._inflight[key] = future
+        future.add_done_callback(lambda f: self._complete(key, f))
+        return future
+
+    def _complete(self, key: tuple, future: Future) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+            if not future.cancelled() and future.exception() is None:
+                now = time.monotonic()
+                self._cache.pop(key, None)
+                self._cache[key] = (now + self.ttl, future.result())
+                while self._cache:
+                    oldest = next(iter(self._cache.values()))
+                    if oldest[0] > now and len(self._cache) <= self.max_entries:
+                        break
+                    self._cache.popitem(last=False)
+
+    def _fan_out(self, user_id: Optional[str], method: str, course_ids: Iterable[str]) -> Dict[str, object]:
+        """Run ``method`` for every course concurrently; failures come back as the exception."""
+        futures = {course_id: self._fetch(user_id, method, course_id) for course_id in dict.fromkeys(course_ids)}
+        results = {}
+        for course_id, future in futures.items():
+            try:
+                results[course_id] = future.result()
+            except Exception as e:
+                results[course_id] = e
+        return results
+
+    def courses(self, user_id: Optional[str]) -> List[Dict]:
+        return self._fetch(user_id, "list_courses").result()
+
+    def coursework(self, user_id: Optional[str], course_ids: Iterable[str]) -> Dict[str, object]:
+        return self._fan_out(user_id, "list_coursework", course_ids)
+
+    def materials(self, user_id: Optional[str], course_ids: Iterable[str]) -> Dict[str, object]:
+        return self._fan_out(user_id, "list_coursework_materials", course_ids)
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        with self._lock:
+            if user_id is None:
+                self._cache.clear()
+            else:
+                for key in [k for k in self._cache if k[0] == user_id]:
+                    del self._cache[key]
+
+    def metrics(self) -> dict:
+        lookups = self.stats["hits"] + self.stats["misses"] + self.stats["shared"]
+        return {
+            **self.stats,
+            "hit_ratio": (self.stats["hits"] + self.stats["shared"]) / lookups if lookups else 0.0,
+            "entries": len(self._cache),
+        }
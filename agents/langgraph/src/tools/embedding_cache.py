@@ -0,0 +1,137 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List
+
+from langchain_core.embeddings import Embeddings
+
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "256"))
+# Keeps each request well under the per-request token limit (~4 chars per token).
+EMBEDDING_BATCH_MAX_CHARS = int(os.getenv("EMBEDDING_BATCH_MAX_CHARS", "600000"))
+EMBEDDING_QUERY_CACHE_SIZE = int(os.getenv("EMBEDDING_QUERY_CACHE_SIZE", "256"))
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that caches vectors on disk by (model, sha256(text)).
+
+    Only cache misses reach the wrapped model, in batches capped by
+    ``EMBEDDING_BATCH_SIZE`` texts and ``EMBEDDING_BATCH_MAX_CHARS`` characters,
+    so re-indexing an edited material only pays for the chunks that changed.
+    ``track()`` collects the counters for work done on the calling thread, which
+    is how ingestion reports cache stats per run.
+
+    Queries are not persisted: they go straight to the wrapped model, with
+    only a small in-memory LRU for repeats.
+    """
+
+    def __init__(self, embeddings: Embeddings, model: str, path: Path):
+        self.embeddings = embeddings
+        self.model = model
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "model TEXT NOT NULL, text_hash TEXT NOT NULL, vector BLOB NOT NULL, "
+            "PRIMARY KEY (model, text_hash))"
+        )
+        self._conn.commit()
+        self.stats = {"hits": 0, "misses": 0, "batches": 0, "embedded_chars": 0}
+        self._local = threading.local()
+        self._queries: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _lookup(self, hashes: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        with self._lock:
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    (self.model, *chunk),
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[text_hash] = array("f", blob).tolist()
+        return found
+
+    def _store(self, items: List[tuple]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector) VALUES (?, ?, ?)",
+                [(self.model, text_hash, array("f", vector).tobytes()) for text_hash, vector in items],
+            )
+            self._conn.commit()
+
+    def _count(self, key: str, amount: int) -> None:
+        with self._lock:
+            self.stats[key] += amount
+        tracked = getattr(self._local, "stats", None)
+        if tracked is not None:
+            tracked[key] += amount
+
+    @contextmanager
+    def track(self):
+        """Yield a dict of the counters incurred by this thread inside the block."""
+        previous = getattr(self._local, "stats", None)
+        self._local.stats = dict.fromkeys(self.stats, 0)
+        try:
+            yield self._local.stats
+        finally:
+            self._local.stats = previous
+
+    def _batches(self, texts: List[str]):
+        batch, chars = [], 0
+        for text in texts:
+            if batch and (len(batch) >= EMBEDDING_BATCH_SIZE or chars + len(text) > EMBEDDING_BATCH_MAX_CHARS):
+                yield batch
+                batch, chars = [], 0
+            batch.append(text)
+            chars += len(text)
+        if batch:
+            yield batch
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes = [self._hash(text) for text in texts]
+        vectors = self._lookup(list(set(hashes)))
+
+        missing = list(dict.fromkeys(text for text, text_hash in zip(texts, hashes) if text_hash not in vectors))
+        for batch in self._batches(missing):
+            embedded = self.embeddings.embed_documents(batch)
+            items = [(self._hash(text), vector) for text, vector in zip(batch, embedded)]
+            self._store(items)
+            vectors.update(items)
+            self._count("batches", 1)
+            self._count("embedded_chars", sum(len(text) for text in batch))
+
+        self._count("misses", len(missing))
+        self._count("hits", len(texts) - len(missing))
+        return [vectors[text_hash] for text_hash in hashes]
+
+    def embed_query(self, text: str) -> List[float]:
+        with self._lock:
+            vector = self._queries.get(text)
+            if vector is not None:
+                self._queries.move_to_end(text)
+                return vector
+        vector = self.embeddings.embed_query(text)
+        with self._lock:
+            self._queries[text] = vector
+            while len(self._queries) > EMBEDDING_QUERY_CACHE_SIZE:
+                self._queries.popitem(last=False)
+        return vector
+
+    def metrics(self) -> dict:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {**self.stats, "hit_ratio": self.stats["hits"] / lookups if lookups else 0.0}
@@ -0,0 +1,137 @@
+"""Worker process pool for PDF extraction with per-task deadlines.
+
+Workers report when they pick up and finish each task, so a task's timeout runs
+from the moment it starts rather than from when somebody begins waiting on it.
+A task that overruns (or whose worker dies) fails on its own: only the worker
+running it is terminated, and ``multiprocessing.Pool`` replaces it while the
+other workers carry on. Like ``pdf_partition``, this module is imported by the
+workers and stays free of LangChain/Chroma imports.
+"""
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+PDF_EXTRACTION_POLL_SECONDS = float(os.getenv("PDF_EXTRACTION_POLL_SECONDS", "1"))
+
+_events = None
+
+
+class PDFExtractionError(Exception):
+    """Extraction timed out, its worker process died, or partitioning failed."""
+
+
+def _init_worker(events) -> None:
+    global _events
+    _events = events
+
+
+def _run(task_id: int, fn, args: tuple):
+    _events.put(("start", task_id, os.getpid()))
+    try:
+        return fn(*args)
+    finally:
+        _events.put(("done", task_id))
+
+
+class ExtractionPool:
+    """A spawn-context ``multiprocessing.Pool`` plus a watchdog thread.
+
+    The watchdog times each running task from its start event and terminates
+    the worker of any task that exceeds ``timeout``; ``result`` then raises
+    ``PDFExtractionError`` for that task only.
+    """
+
+    def __init__(self, workers: int, timeout: float, max_tasks_per_child: int = 0,
+                 poll_interval: float = PDF_EXTRACTION_POLL_SECONDS):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_tasks_per_child = max_tasks_per_child
+        self.poll_interval = poll_interval
+        self._pool = None
+        self._events = None
+        self._stop: Optional[threading.Event] = None
+        self._running: Dict[int, tuple] = {}
+        self._failed: Dict[int, str] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                # spawn, not fork: the parent runs ingestion and HTTP client threads.
+                context = multiprocessing.get_context("spawn")
+                self._events = context.SimpleQueue()
+                self._pool = context.Pool(
+                    self.workers,
+                    initializer=_init_worker,
+                    initargs=(self._events,),
+                    maxtasksperchild=self.max_tasks_per_child or None,
+                )
+                self._stop = threading.Event()
+                threading.Thread(
+                    target=self._watch, args=(self._events, self._stop), daemon=True, name="extraction-watchdog"
+                ).start()
+            return self._pool
+
+    def submit(self, fn, *args) -> tuple:
+        pool = self._get_pool()
+        task_id = next(self._ids)
+        return task_id, pool.apply_async(_run, (task_id, fn, args))
+
+    def result(self, task: tuple, label: str):
+        """Wait for a submitted task; raises ``PDFExtractionError`` if it overran or its worker died."""
+        task_id, async_result = task
+        while not async_result.ready():
+            async_result.wait(self.poll_interval)
+            with self._lock:
+                failure = self._failed.pop(task_id, None)
+            if failure is not None and not async_result.ready():
+                raise PDFExtractionError(f"Extraction of {label} {failure}")
+        return async_result.get()
+
+    def _watch(self, events, stop: threading.Event) -> None:
+        while not stop.wait(self.poll_interval):
+            self._check(events)
+
+    def _check(self, events) -> None:
+        now = time.monotonic()
+        with self._lock:
+            while not events.empty():
+                event = events.get()
+                if event[0] == "start":
+                    self._running[event[1]] = (event[2], now)
+                else:
+                    self._running.pop(event[1], None)
+            if not self._running:
+                return
+            workers = {process.pid: process for process in multiprocessing.active_children()}
+            for task_id, (pid, started) in list(self._running.items()):
+                if pid not in workers:
+                    self._failed[task_id] = "crashed its worker"
+                elif now - started > self.timeout:
+                    workers[pid].terminate()
+                    self._failed[task_id] = f"timed out after {self.timeout:.0f}s"
+                else:
+                    continue
+                del self._running[task_id]
+
+    def shutdown(self) -> None:
+        """Stop the workers and the watchdog, abandoning any running tasks.
+
+        ``terminate`` rather than ``close``: a task whose worker was killed never
+        reports back, and ``Pool.join`` after ``close`` would wait for it forever.
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+            stop = self._stop
+        if pool is None:
+            return
+        stop.set()
+        pool.terminate()
+        pool.join()
+        with self._lock:
+            self._running.clear()
+            self._failed.clear()
@@ -0,0 +1,188 @@
+import base64
+import hashlib
+import io
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from PIL import Image
+
+IMAGE_DEDUP_MAX_DISTANCE = int(os.getenv("IMAGE_DEDUP_MAX_DISTANCE", "2"))
+IMAGE_THUMBNAIL_SIZE = int(os.getenv("IMAGE_THUMBNAIL_SIZE", "512"))
+IMAGE_THUMBNAIL_QUALITY = int(os.getenv("IMAGE_THUMBNAIL_QUALITY", "80"))
+
+HASH_SIZE = 8
+
+
+def dhash(image: Image.Image) -> int:
+    """64-bit difference hash of a 9x8 grayscale thumbnail."""
+    small = image.convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.LANCZOS)
+    pixels = list(small.getdata())
+    value = 0
+    for row in range(HASH_SIZE):
+        for col in range(HASH_SIZE):
+            offset = row * (HASH_SIZE + 1) + col
+            value = (value << 1) | (pixels[offset] > pixels[offset + 1])
+    return value
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class ImageStore:
+    """Content-addressed image storage with de-duplication and thumbnails.
+
+    Images are kept as binary files under ``objects/`` and keyed by SHA-256.
+    A new image that matches an existing one exactly resolves to the existing
+    key and bumps its reference count. Perceptual (dHash) matching is only done
+    against the ``candidates`` a caller passes, normally the images of the same
+    document, and needs identical dimensions and at most
+    ``IMAGE_DEDUP_MAX_DISTANCE`` differing bits: line art on white backgrounds
+    hashes too similarly to match across documents. A JPEG thumbnail is
+    generated on save for the multimodal RAG prompt.
+    """
+
+    def __init__(self, store_path: Path):
+        self.store_path = store_path
+        self.store_path.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.store_path / "index.sqlite3", check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS images ("
+            "key TEXT PRIMARY KEY, sha256 TEXT NOT NULL UNIQUE, dhash TEXT NOT NULL, "
+            "format TEXT NOT NULL, width INTEGER, height INTEGER, bytes INTEGER, "
+            "refcount INTEGER NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self._dhashes: Dict[str, Tuple[int, int, int]] = {
+            key: (int(value, 16), width, height)
+            for key, value, width, height in self._conn.execute("SELECT key, dhash, width, height FROM images")
+        }
+
+    def _object_path(self, key: str, fmt: str) -> Path:
+        return self.store_path / "objects" / key[4:6] / f"{key}.{fmt}"
+
+    def _thumbnail_path(self, key: str) -> Path:
+        return self.store_path / "thumbs" / key[4:6] / f"{key}_{IMAGE_THUMBNAIL_SIZE}.jpg"
+
+    def _find_near_duplicate(self, image_hash: int, size: Tuple[int, int], candidates: Iterable[str]) -> Optional[str]:
+        best, best_distance = None, IMAGE_DEDUP_MAX_DISTANCE + 1
+        for key in candidates:
+            entry = self._dhashes.get(key)
+            if entry is None or entry[1:] != size:
+                continue
+            distance = (image_hash ^ entry[0]).bit_count()
+            if distance < best_distance:
+                best, best_distance = key, distance
+        return best
+
+    def _write_thumbnail(self, key: str, image: Image.Image) -> bytes:
+        thumb = image.convert("RGB")
+        thumb.thumbnail((IMAGE_THUMBNAIL_SIZE, IMAGE_THUMBNAIL_SIZE), Image.Resampling.LANCZOS)
+        out = io.BytesIO()
+        thumb.save(out, format="JPEG", quality=IMAGE_THUMBNAIL_QUALITY, optimize=True)
+        data = out.getvalue()
+        _atomic_write(self._thumbnail_path(key), data)
+        return data
+
+    def put(self, image_b64: str, candidates: Iterable[str] = ()) -> Tuple[str, bool]:
+        """Store an image (or reference an existing copy); returns ``(image_key, is_new)``.
+
+        ``candidates`` are the keys it may be perceptually merged with. When the
+        key is not new, its stored bytes may differ from ``image_b64``.
+        """
+        data = base64.b64decode(image_b64)
+        sha = hashlib.sha256(data).hexdigest()
+        key = f"img_{sha[:16]}"
+
+        with self._lock:
+            row = self._conn.execute("SELECT key FROM images WHERE sha256 = ?", (sha,)).fetchone()
+            if row is None:
+                with Image.open(io.BytesIO(data)) as image:
+                    image.load()
+                    image_hash = dhash(image)
+                    duplicate = self._find_near_duplicate(image_hash, image.size, candidates)
+                    if duplicate is None:
+                        fmt = (image.format or "png").lower()
+                        _atomic_write(self._object_path(key, fmt), data)
+                        self._write_thumbnail(key, image)
+                        self._conn.execute(
+                            "INSERT INTO images (key, sha256, dhash, format, width, height, bytes, refcount, created_at) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?)",
+                            (key, sha, f"{image_hash:016x}", fmt, image.width, image.height, len(data), time.time()),
+                        )
+                        self._conn.commit()
+                        self._dhashes[key] = (image_hash, image.width, image.height)
+                        return key, True
+                row = (duplicate,)
+
+            self._conn.execute("UPDATE images SET refcount = refcount + 1 WHERE key = ?", (row[0],))
+            self._conn.commit()
+            return row[0], False
+
+    def save(self, image_b64: str) -> str:
+        """Persist an image and return its stable key."""
+        return self.put(image_b64)[0]
+
+    def release(self, image_key: str) -> None:
+        """Drop one reference; the files go when the last reference does."""
+        with self._lock:
+            row = self._conn.execute("SELECT refcount, format FROM images WHERE key = ?", (image_key,)).fetchone()
+            if row is None:
+                return
+            refcount, fmt = row
+            if refcount > 1:
+                self._conn.execute("UPDATE images SET refcount = refcount - 1 WHERE key = ?", (image_key,))
+            else:
+                self._conn.execute("DELETE FROM images WHERE key = ?", (image_key,))
+                self._dhashes.pop(image_key, None)
+                self._object_path(image_key, fmt).unlink(missing_ok=True)
+                self._thumbnail_path(image_key).unlink(missing_ok=True)
+            self._conn.commit()
+
+    def _format(self, image_key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT format FROM images WHERE key = ?", (image_key,)).fetchone()
+        return row[0] if row else None
+
+    def load(self, image_key: str) -> Optional[str]:
+        """Retrieve the full-resolution image by key, base64-encoded."""
+        fmt = self._format(image_key)
+        if fmt is None:
+            # Images indexed before the content-addressed store were kept as .b64 text.
+            legacy = self.store_path / f"{image_key}.b64"
+            return legacy.read_text(encoding="utf-8") if legacy.exists() else None
+        path = self._object_path(image_key, fmt)
+        return base64.b64encode(path.read_bytes()).decode("ascii") if path.exists() else None
+
+    def load_thumbnail(self, image_key: str) -> Optional[str]:
+        """Retrieve the downscaled JPEG variant by key, base64-encoded."""
+        path = self._thumbnail_path(image_key)
+        if path.exists():
+            return base64.b64encode(path.read_bytes()).decode("ascii")
+
+        original = self.load(image_key)
+        if original is None:
+            return None
+        try:
+            with Image.open(io.BytesIO(base64.b64decode(original))) as image:
+                data = self._write_thumbnail(image_key, image)
+        except Exception:
+            return original
+        return base64.b64encode(data).decode("ascii")
+
+    def stats(self) -> dict:
+        with self._lock:
+            images, references, total_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(refcount), 0), COALESCE(SUM(bytes), 0) FROM images"
+            ).fetchone()
+        return {"images": images, "references": references, "bytes": total_bytes}
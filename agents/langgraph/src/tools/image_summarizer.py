@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+
+IMAGE_SUMMARY_INITIAL_CONCURRENCY = int(os.getenv("IMAGE_SUMMARY_INITIAL_CONCURRENCY", "4"))
+IMAGE_SUMMARY_MAX_CONCURRENCY = int(os.getenv("IMAGE_SUMMARY_MAX_CONCURRENCY", "16"))
+IMAGE_SUMMARY_LATENCY_TARGET = float(os.getenv("IMAGE_SUMMARY_LATENCY_TARGET", "20"))
+IMAGE_SUMMARY_MAX_RETRIES = int(os.getenv("IMAGE_SUMMARY_MAX_RETRIES", "4"))
+IMAGE_SUMMARY_RETRY_BACKOFF = float(os.getenv("IMAGE_SUMMARY_RETRY_BACKOFF", "2.0"))
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    return getattr(error, "status_code", None) == 429 or type(error).__name__ == "RateLimitError"
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit driven by 429s and call latency.
+
+    A 429 halves the limit and pauses new calls for the Retry-After period. A call
+    slower than the latency target drops the limit by one. After ``limit``
+    fast successes in a row the limit grows by one, up to ``maximum``.
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int, latency_target: float):
+        self.limit = max(minimum, min(initial, maximum))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_target = latency_target
+        self.active = 0
+        self._successes = 0
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    self._cond.wait(pause)
+                elif self.active < self.limit:
+                    self.active += 1
+                    return
+                else:
+                    self._cond.wait()
+
+    def release(self, latency: Optional[float] = None, throttled: bool = False, retry_after: Optional[float] = None) -> None:
+        with self._cond:
+            self.active -= 1
+            if throttled:
+                self.limit = max(self.minimum, self.limit // 2)
+                self._successes = 0
+                pause = retry_after if retry_after is not None else IMAGE_SUMMARY_RETRY_BACKOFF
+                self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            elif latency is not None and latency > self.latency_target:
+                self.limit = max(self.minimum, self.limit - 1)
+                self._successes = 0
+            elif latency is not None:
+                self._successes += 1
+                if self._successes >= self.limit:
+                    self.limit = min(self.maximum, self.limit + 1)
+                    self._successes = 0
+            self._cond.notify_all()
+
+
+class SummaryCheckpoint:
+    """Summaries persisted per image (and model/prompt) so a restart does not pay for them twice."""
+
+    def __init__(self, directory: Path, namespace: str):
+        self.directory = directory
+        self.namespace = namespace
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, image_b64: str) -> Path:
+        digest = hashlib.sha256(f"{self.namespace}|{image_b64}".encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.json"
+
+    def get(self, image_b64: str) -> Optional[str]:
+        path = self._path(image_b64)
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))["summary"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return None
+
+    def put(self, image_b64: str, summary: str) -> None:
+        path = self._path(image_b64)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"summary": summary, "created_at": time.time()}, f)
+        os.replace(tmp, path)
+
+
+class ImageSummarizer:
+    """Summarizes images concurrently under an adaptive limit, keeping partial results.
+
+    ``summarize`` returns one entry per image: the summary, or None for images
+    that still failed after retries.
+    """
+
+    def __init__(self, chain, checkpoint: SummaryCheckpoint, max_concurrency: int = IMAGE_SUMMARY_MAX_CONCURRENCY):
+        self.chain = chain
+        self.checkpoint = checkpoint
+        self.limiter = AdaptiveLimiter(
+            initial=IMAGE_SUMMARY_INITIAL_CONCURRENCY,
+            minimum=1,
+            maximum=max_concurrency,
+            latency_target=IMAGE_SUMMARY_LATENCY_TARGET,
+        )
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="image-summary")
+        self._stats_lock = threading.Lock()
+        self.stats = {"calls": 0, "checkpoint_hits": 0, "throttled": 0, "retries": 0, "failed": 0}
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _summarize_one(self, image_b64: str) -> Optional[str]:
+        cached = self.checkpoint.get(image_b64)
+        if cached is not None:
+            self._count("checkpoint_hits")
+            return cached
+
+        for attempt in range(IMAGE_SUMMARY_MAX_RETRIES + 1):
+            if attempt:
+                self._count("retries")
+            self.limiter.acquire()
+            start = time.monotonic()
+            try:
+                summary = self.chain.invoke({"image": image_b64})
+            except Exception as e:
+                throttled = _is_rate_limited(e)
+                self.limiter.release(throttled=throttled, retry_after=_retry_after(e) if throttled else None)
+                if throttled:
+                    self._count("throttled")
+                if attempt == IMAGE_SUMMARY_MAX_RETRIES:
+                    print(f"Image summary failed after {attempt + 1} attempts: {e}")
+                    break
+                if not throttled:
+                    time.sleep(IMAGE_SUMMARY_RETRY_BACKOFF * (2 ** attempt) * random.uniform(0.5, 1.5))
+                continue
+
+            self.limiter.release(latency=time.monotonic() - start)
+            self._count("calls")
+            if summary:
+                self.checkpoint.put(image_b64, summary)
+            return summary
+
+        self._count("failed")
+        return None
+
+    def summarize(self, images: List[str]) -> List[Optional[str]]:
+        return list(self._executor.map(self._summarize_one, images))
+
+    def metrics(self) -> dict:
+        return {**self.stats, "concurrency_limit": self.limiter.limit, "active": self.limiter.active}
@@ -0,0 +1,117 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class IndexManifest:
+    """Local record of what is in the vector store, per material and Drive file.
+
+    For each material it keeps the Classroom ``updateTime``; for each PDF the
+    Drive ``md5Checksum``/``modifiedTime`` and the chunk IDs and image keys it
+    produced. Material versions are held in memory, so "is this material
+    indexed and current?" is a dict lookup rather than a Chroma query.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS materials ("
+            "material_id TEXT PRIMARY KEY, course_id TEXT NOT NULL, title TEXT, "
+            "update_time TEXT, chunks INTEGER NOT NULL, indexed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "material_id TEXT NOT NULL, file_id TEXT NOT NULL, filename TEXT, "
+            "md5 TEXT, modified_time TEXT, chunk_ids TEXT NOT NULL, image_keys TEXT NOT NULL, "
+            "PRIMARY KEY (material_id, file_id))"
+        )
+        self._conn.commit()
+        self._materials: Dict[str, Dict] = {}
+        rows = self._conn.execute("SELECT material_id, course_id, title, update_time, chunks FROM materials").fetchall()
+        for material_id, course_id, title, update_time, chunks in rows:
+            self._materials[material_id] = {
+                "course_id": course_id, "title": title, "update_time": update_time, "chunks": chunks,
+            }
+
+    def __contains__(self, material_id: str) -> bool:
+        return material_id in self._materials
+
+    def is_current(self, material: Dict) -> bool:
+        """True when the material is indexed at its current Classroom ``updateTime``."""
+        entry = self._materials.get(material["id"])
+        return entry is not None and entry["update_time"] == material.get("updateTime")
+
+    def summary(self, material_id: str) -> Optional[Dict]:
+        entry = self._materials.get(material_id)
+        return dict(entry) if entry else None
+
+    def material_ids(self, course_id: Optional[str] = None) -> List[str]:
+        with self._lock:
+            return [m for m, entry in self._materials.items() if course_id is None or entry["course_id"] == course_id]
+
+    def files(self, material_id: str) -> Dict[str, Dict]:
+        """Indexed files of a material, keyed by Drive file id."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT file_id, filename, md5, modified_time, chunk_ids, image_keys FROM files WHERE material_id = ?",
+                (material_id,),
+            ).fetchall()
+        return {
+            file_id: {
+                "filename": filename,
+                "md5": md5,
+                "modified_time": modified_time,
+                "chunk_ids": json.loads(chunk_ids),
+                "image_keys": json.loads(image_keys),
+            }
+            for file_id, filename, md5, modified_time, chunk_ids, image_keys in rows
+        }
+
+    def record(self, course_id: str, material: Dict, files: Dict[str, Dict]) -> None:
+        """Replace a material's entry with the files (and chunks) now indexed for it."""
+        material_id = material["id"]
+        chunks = sum(len(entry["chunk_ids"]) for entry in files.values())
+        with self._lock:
+            self._conn.execute("DELETE FROM files WHERE material_id = ?", (material_id,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO materials (material_id, course_id, title, update_time, chunks, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (material_id, course_id, material.get("title", ""), material.get("updateTime"), chunks, time.time()),
+            )
+            self._conn.executemany(
+                "INSERT INTO files (material_id, file_id, filename, md5, modified_time, chunk_ids, image_keys) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (material_id, file_id, entry.get("filename"), entry.get("md5"), entry.get("modified_time"),
+                     json.dumps(entry["chunk_ids"]), json.dumps(entry["image_keys"]))
+                    for file_id, entry in files.items()
+                ],
+            )
+            self._conn.commit()
+            self._materials[material_id] = {
+                "course_id": course_id,
+                "title": material.get("title", ""),
+                "update_time": material.get("updateTime"),
+                "chunks": chunks,
+            }
+
+    def remove(self, material_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM files WHERE material_id = ?", (material_id,))
+            self._conn.execute("DELETE FROM materials WHERE material_id = ?", (material_id,))
+            self._conn.commit()
+            self._materials.pop(material_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "materials": len(self._materials),
+                "chunks": sum(entry["chunks"] for entry in self._materials.values()),
+            }
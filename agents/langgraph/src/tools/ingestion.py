@@ -0,0 +1,358 @@
+"""Background ingestion of Classroom PDF materials into the vector store.
+
+Questions only read the index; downloading, partitioning and summarizing
+materials happens here, on a worker pool fed by a job queue. Each submit is a
+diff against the index manifest: new or edited materials are queued for
+(re-)indexing and materials gone from Classroom are queued for removal. Run
+from the langgraph ``src`` directory to index outside the API process:
+
+    python -m tools.ingestion run
+    python -m tools.ingestion run --course 12345 --retry-failed
+"""
+import argparse
+import itertools
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from colorama import Fore, Style
+
+INGESTION_WORKERS = int(os.getenv("INGESTION_WORKERS", "2"))
+INGESTION_MAX_JOBS = int(os.getenv("INGESTION_MAX_JOBS", "50"))
+INGESTION_AUTO_SUBMIT = os.getenv("INGESTION_AUTO_SUBMIT", "true").lower() == "true"
+
+QUEUED = "queued"
+RUNNING = "running"
+INDEXED = "indexed"
+SKIPPED = "skipped"
+FAILED = "failed"
+REMOVED = "removed"
+
+TERMINAL_STATES = {INDEXED, SKIPPED, FAILED, REMOVED}
+TRANSITIONS = {
+    None: {QUEUED},
+    QUEUED: {RUNNING},
+    RUNNING: {INDEXED, SKIPPED, FAILED, REMOVED},
+    INDEXED: {QUEUED},
+    SKIPPED: {QUEUED},
+    FAILED: {QUEUED},
+    REMOVED: {QUEUED},
+}
+
+INDEX = "index"
+REINDEX = "reindex"
+REMOVE = "remove"
+
+
+@dataclass
+class MaterialRecord:
+    material_id: str
+    course_id: str
+    title: str
+    state: Optional[str] = None
+    job_id: Optional[str] = None
+    chunks_indexed: int = 0
+    attempts: int = 0
+    error: Optional[str] = None
+    updated_at: float = field(default_factory=time.time)
+
+    def transition(self, new_state: str) -> None:
+        if new_state not in TRANSITIONS[self.state]:
+            raise ValueError(f"Material {self.material_id}: cannot go from {self.state} to {new_state}")
+        self.state = new_state
+        self.updated_at = time.time()
+
+    def to_dict(self) -> dict:
+        return {
+            "material_id": self.material_id,
+            "course_id": self.course_id,
+            "title": self.title,
+            "state": self.state,
+            "job_id": self.job_id,
+            "chunks_indexed": self.chunks_indexed,
+            "attempts": self.attempts,
+            "error": self.error,
+            "updated_at": self.updated_at,
+        }
+
+
+@dataclass
+class IngestionJob:
+    job_id: str
+    course_ids: List[str]
+    material_ids: List[str] = field(default_factory=list)
+    embedding: Dict[str, int] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+
+class IngestionService:
+    """Job queue and worker pool that index Classroom materials in the background."""
+
+    def __init__(self, pdf_processor, loader, workers: int = INGESTION_WORKERS):
+        self.pdf_processor = pdf_processor
+        self.loader = loader
+        self.workers = workers
+        self.manifest = pdf_processor.manifest
+        self._queue: "queue.Queue[tuple[str, str, Dict, str]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._materials: Dict[str, MaterialRecord] = {}
+        self._jobs: Dict[str, IngestionJob] = {}
+        self._job_ids = itertools.count(1)
+
+        for material_id in self.manifest.material_ids():
+            entry = self.manifest.summary(material_id)
+            self._materials[material_id] = MaterialRecord(
+                material_id,
+                entry["course_id"],
+                entry["title"],
+                state=INDEXED if entry["chunks"] else SKIPPED,
+                chunks_indexed=entry["chunks"],
+            )
+
+    def _ensure_workers(self) -> None:
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            for i in range(len(self._threads), self.workers):
+                thread = threading.Thread(target=self._worker_loop, name=f"ingestion-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(
+        self,
+        user_id: Optional[str] = None,
+        course_ids: Optional[Iterable[str]] = None,
+        materials_by_course: Optional[Dict[str, List[Dict]]] = None,
+        retry_failed: bool = False,
+        reindex: bool = False,
+        remove_missing: bool = False,
+    ) -> Optional[IngestionJob]:
+        """Queue the difference between Classroom and the index.
+
+        New materials and those whose ``updateTime`` moved are queued for
+        indexing, and anything current or in flight is left alone. ``reindex``
+        re-checks every material's Drive checksums; only changed files are
+        re-processed. With ``remove_missing``, indexed materials that are not
+        in a course's listing are queued for removal; only pass it for an
+        authoritative (teacher/admin) listing, never for what one student can
+        see. Returns the new job, or None when there was nothing to queue.
+        ``materials_by_course`` lets callers that already listed materials
+        skip another round of Classroom calls.
+        """
+        if materials_by_course is None:
+            if course_ids is None:
+                course_ids = [c["id"] for c in self.loader.courses(user_id)]
+            materials_by_course = {}
+            for course_id, result in self.loader.materials(user_id, course_ids).items():
+                if isinstance(result, Exception):
+                    print(Fore.RED + f"Could not list materials for course {course_id}: {result}" + Style.RESET_ALL)
+                    continue
+                materials_by_course[course_id] = result
+
+        with self._lock:
+            pending = []
+            for course_id, materials in materials_by_course.items():
+                for material in materials:
+                    record = self._materials.get(material["id"])
+                    changed = not self.manifest.is_current(material)
+                    if record is not None:
+                        if record.state not in TERMINAL_STATES:
+                            continue
+                        if record.state == FAILED and not (retry_failed or reindex):
+                            continue
+                        if record.state != FAILED and not (changed or reindex):
+                            continue
+                    elif not changed and not reindex:
+                        continue
+                    if record is None:
+                        record = MaterialRecord(material["id"], course_id, material.get("title", ""))
+                        self._materials[material["id"]] = record
+                    pending.append((course_id, material, record, REINDEX if reindex else INDEX))
+
+                if not remove_missing:
+                    continue
+                listed = {material["id"] for material in materials}
+                for material_id in self.manifest.material_ids(course_id):
+                    record = self._materials.get(material_id)
+                    if material_id in listed or (record is not None and record.state not in TERMINAL_STATES):
+                        continue
+                    if record is None:
+                        record = MaterialRecord(material_id, course_id, self.manifest.summary(material_id)["title"])
+                        self._materials[material_id] = record
+                    pending.append((course_id, {"id": material_id}, record, REMOVE))
+
+            if not pending:
+                return None
+            job = IngestionJob(job_id=f"job-{next(self._job_ids)}", course_ids=list(materials_by_course))
+            for course_id, material, record, action in pending:
+                record.transition(QUEUED)
+                record.job_id = job.job_id
+                record.error = None
+                job.material_ids.append(record.material_id)
+                self._queue.put((job.job_id, course_id, material, action))
+            self._jobs[job.job_id] = job
+            while len(self._jobs) > INGESTION_MAX_JOBS:
+                del self._jobs[next(iter(self._jobs))]
+
+        print(Fore.CYAN + f"Ingestion {job.job_id}: queued {len(job.material_ids)} materials" + Style.RESET_ALL)
+        self._ensure_workers()
+        return job
+
+    def _worker_loop(self) -> None:
+        while True:
+            job_id, course_id, material, action = self._queue.get()
+            try:
+                self._process(job_id, course_id, material, action)
+            finally:
+                self._queue.task_done()
+
+    def _process(self, job_id: str, course_id: str, material: Dict, action: str) -> None:
+        with self._lock:
+            record = self._materials[material["id"]]
+            record.transition(RUNNING)
+            record.attempts += 1
+
+        with self.pdf_processor.embeddings.track() as embedding:
+            try:
+                if action == REMOVE:
+                    self.pdf_processor.remove_material(material["id"])
+                    state = REMOVED
+                else:
+                    self.pdf_processor.process_and_index_material(course_id, material, force=action == REINDEX)
+                    state = INDEXED if self.pdf_processor._count_pdfs(material) else SKIPPED
+                entry = self.manifest.summary(material["id"])
+                chunks, error = (entry["chunks"] if entry else 0), None
+            except Exception as e:
+                chunks, state, error = 0, FAILED, str(e)
+                print(Fore.RED + f"Ingestion of {record.title or record.material_id} failed: {e}" + Style.RESET_ALL)
+
+        with self._lock:
+            record.chunks_indexed = chunks
+            record.error = error
+            record.transition(state)
+            job = self._jobs.get(job_id)
+            if job:
+                for key, value in embedding.items():
+                    job.embedding[key] = job.embedding.get(key, 0) + value
+            if job and all(self._materials[m].state in TERMINAL_STATES for m in job.material_ids):
+                job.finished_at = time.time()
+                print(Fore.GREEN + f"Ingestion {job_id} finished "
+                      f"(embedding cache: {job.embedding.get('hits', 0)} hits, {job.embedding.get('misses', 0)} misses)"
+                      + Style.RESET_ALL)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the queue is drained (CLI use). Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.2)
+        return True
+
+    def _job_dict(self, job: IngestionJob) -> dict:
+        counts: Dict[str, int] = {}
+        for material_id in job.material_ids:
+            state = self._materials[material_id].state
+            counts[state] = counts.get(state, 0) + 1
+        return {
+            "job_id": job.job_id,
+            "course_ids": job.course_ids,
+            "status": "completed" if job.finished_at else ("running" if counts.get(QUEUED, 0) < len(job.material_ids) else QUEUED),
+            "materials": len(job.material_ids),
+            "states": counts,
+            "embedding_cache": dict(job.embedding),
+            "created_at": job.created_at,
+            "finished_at": job.finished_at,
+        }
+
+    def job(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return {
+                **self._job_dict(job),
+                "material_states": [self._materials[m].to_dict() for m in job.material_ids],
+            }
+
+    def jobs(self) -> List[dict]:
+        with self._lock:
+            return [self._job_dict(job) for job in reversed(self._jobs.values())]
+
+    def materials(self, course_id: Optional[str] = None) -> List[dict]:
+        with self._lock:
+            return [r.to_dict() for r in self._materials.values() if course_id is None or r.course_id == course_id]
+
+    def metrics(self) -> dict:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for record in self._materials.values():
+                counts[record.state] = counts.get(record.state, 0) + 1
+            return {
+                "queue_depth": self._queue.qsize(),
+                "workers": len([t for t in self._threads if t.is_alive()]),
+                "materials": counts,
+                "jobs": len(self._jobs),
+                "embedding_cache": self.pdf_processor.embeddings.metrics(),
+                "manifest": self.manifest.stats(),
+            }
+
+
+_service: Optional[IngestionService] = None
+_service_lock = threading.Lock()
+
+
+def get_ingestion_service() -> IngestionService:
+    """Process-wide ingestion service, sharing one Classroom client and vector store."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                from tools.classroomTools import ClassroomTool
+                from tools.classroom_loader import ClassroomLoader
+                from tools.pdf_processor import PDFProcessor
+
+                classroom_tool = ClassroomTool()
+                _service = IngestionService(PDFProcessor(classroom_tool), ClassroomLoader(classroom_tool))
+    return _service
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="Index materials and wait for the queue to drain")
+    run.add_argument("--course", action="append", dest="courses", help="Course id (repeatable; default: all)")
+    run.add_argument("--retry-failed", action="store_true")
+    run.add_argument("--reindex", action="store_true", help="Re-check Drive checksums of materials already indexed")
+    run.add_argument("--remove-missing", action="store_true",
+                     help="Remove indexed materials that are no longer listed in their course")
+    run.add_argument("--timeout", type=float, help="Seconds to wait before giving up")
+    args = parser.parse_args()
+
+    service = get_ingestion_service()
+    job = service.submit(
+        course_ids=args.courses,
+        retry_failed=args.retry_failed,
+        reindex=args.reindex,
+        remove_missing=args.remove_missing,
+    )
+    if job is None:
+        print("Nothing to index")
+        return
+    finished = service.wait(args.timeout)
+    for record in service.job(job.job_id)["material_states"]:
+        print(f"{record['state']:<8} {record['chunks_indexed']:>5} chunks  {record['title'] or record['material_id']}"
+              + (f"  ({record['error']})" if record["error"] else ""))
+    embedding = service.job(job.job_id)["embedding_cache"]
+    print(f"Embedding cache: {embedding.get('hits', 0)} hits, {embedding.get('misses', 0)} misses, "
+          f"{embedding.get('batches', 0)} batches")
+    if not finished:
+        print("Timed out with materials still in the queue")
+
+
+if __name__ == "__main__":
+    main()
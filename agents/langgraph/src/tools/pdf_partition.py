@@ -0,0 +1,228 @@
+"""PDF scanning and partitioning that run inside extraction worker processes.
+
+Kept free of LangChain/Chroma imports so spawned workers start quickly. The
+worker returns plain strings and dicts, never ``unstructured`` element
+objects, so results pickle compactly back to the parent.
+"""
+import os
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+FAST = "fast"
+HI_RES = "hi_res"
+OCR_ONLY = "ocr_only"
+
+# Pre-scan thresholds, per page.
+SCAN_MIN_TEXT_CHARS = int(os.getenv("PDF_SCAN_MIN_TEXT_CHARS", "80"))
+SCAN_IMAGE_AREA_RATIO = float(os.getenv("PDF_SCAN_IMAGE_AREA_RATIO", "0.15"))
+SCAN_TABLE_RULES = int(os.getenv("PDF_SCAN_TABLE_RULES", "12"))
+# Documents shorter than this are never split into per-strategy page ranges.
+SCAN_SPLIT_MIN_PAGES = int(os.getenv("PDF_SCAN_SPLIT_MIN_PAGES", "6"))
+SCAN_MIN_RANGE_PAGES = int(os.getenv("PDF_SCAN_MIN_RANGE_PAGES", "3"))
+
+STRATEGY_RANK = {FAST: 0, HI_RES: 1, OCR_ONLY: 2}
+
+
+def classify_page(chars: int, image_ratio: float, rules: int) -> str:
+    """Pick a strategy from a page's text-layer size, image coverage and ruling lines."""
+    if chars < SCAN_MIN_TEXT_CHARS:
+        # No usable text layer: scanned page (or a full-page picture).
+        return OCR_ONLY if image_ratio > 0 else FAST
+    if image_ratio >= SCAN_IMAGE_AREA_RATIO or rules >= SCAN_TABLE_RULES:
+        return HI_RES
+    return FAST
+
+
+def _pages(rng: List) -> int:
+    return rng[1] - rng[0] + 1
+
+
+def plan_ranges(strategies: List[str]) -> List[Tuple[int, int, str]]:
+    """Group per-page strategies into ``(first_page, last_page, strategy)`` ranges (1-based).
+
+    Adjacent runs shorter than ``SCAN_MIN_RANGE_PAGES`` are combined at the
+    strongest of their strategies. A run that is still short is absorbed into
+    the weakest neighbour that is at least as strong, so pages are never
+    downgraded and a run that meets the minimum is never upgraded; with no
+    such neighbour it stays a range of its own. Short documents always get
+    one range.
+    """
+    if not strategies:
+        return []
+    if len(strategies) < SCAN_SPLIT_MIN_PAGES:
+        strongest = max(strategies, key=STRATEGY_RANK.get)
+        return [(1, len(strategies), strongest)]
+
+    runs: List[List] = []
+    for page, strategy in enumerate(strategies, start=1):
+        if runs and runs[-1][2] == strategy:
+            runs[-1][1] = page
+        else:
+            runs.append([page, page, strategy])
+
+    groups: List[List] = []
+    for run in runs:
+        if groups and _pages(run) < SCAN_MIN_RANGE_PAGES and _pages(groups[-1]) < SCAN_MIN_RANGE_PAGES:
+            groups[-1][1] = run[1]
+            groups[-1][2] = max(groups[-1][2], run[2], key=STRATEGY_RANK.get)
+        else:
+            groups.append(run)
+
+    planned: List[List] = []
+    for index, group in enumerate(groups):
+        if _pages(group) < SCAN_MIN_RANGE_PAGES:
+            previous = planned[-1] if planned else None
+            following = groups[index + 1] if index + 1 < len(groups) else None
+            candidates = [
+                neighbour for neighbour in (previous, following)
+                if neighbour is not None and STRATEGY_RANK[neighbour[2]] >= STRATEGY_RANK[group[2]]
+            ]
+            if candidates:
+                target = min(candidates, key=lambda neighbour: STRATEGY_RANK[neighbour[2]])
+                if target is previous:
+                    previous[1] = group[1]
+                else:
+                    following[0] = group[0]
+                continue
+        if planned and planned[-1][2] == group[2]:
+            planned[-1][1] = group[1]
+        else:
+            planned.append(group)
+    return [tuple(rng) for rng in planned]
+
+
+def scan_pdf(pdf_path: str) -> Dict:
+    """Cheap per-page scan of the text layer, image area and table-like ruling lines."""
+    from pdfminer.layout import LTChar, LTCurve, LTFigure, LTImage, LTLine, LTRect
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.converter import PDFPageAggregator
+
+    start = time.perf_counter()
+    manager = PDFResourceManager()
+    # laparams=None skips layout analysis; raw characters and shapes are enough here.
+    device = PDFPageAggregator(manager, laparams=None)
+    interpreter = PDFPageInterpreter(manager, device)
+
+    pages = []
+    with open(pdf_path, "rb") as f:
+        for page in PDFPage.get_pages(f):
+            interpreter.process_page(page)
+            layout = device.get_result()
+            page_area = max(layout.width * layout.height, 1.0)
+            chars = image_area = rules = 0
+
+            stack = list(layout)
+            while stack:
+                obj = stack.pop()
+                if isinstance(obj, LTChar):
+                    chars += 1
+                elif isinstance(obj, LTImage):
+                    image_area += obj.width * obj.height
+                elif isinstance(obj, (LTRect, LTLine)) or (isinstance(obj, LTCurve) and len(getattr(obj, "pts", [])) <= 5):
+                    rules += 1
+                if isinstance(obj, LTFigure):
+                    stack.extend(obj)
+
+            image_ratio = min(image_area / page_area, 1.0)
+            pages.append({
+                "chars": chars,
+                "image_ratio": round(image_ratio, 3),
+                "rules": rules,
+                "strategy": classify_page(chars, image_ratio, rules),
+            })
+
+    return {
+        "pages": pages,
+        "ranges": plan_ranges([p["strategy"] for p in pages]),
+        "elapsed_ms": (time.perf_counter() - start) * 1000,
+    }
+
+
+def _write_page_range(pdf_path: str, first_page: int, last_page: int) -> str:
+    from pypdf import PdfReader, PdfWriter
+
+    reader = PdfReader(pdf_path)
+    writer = PdfWriter()
+    for index in range(first_page - 1, last_page):
+        writer.add_page(reader.pages[index])
+    fd, range_path = tempfile.mkstemp(suffix=".pdf", prefix="voicera-range-")
+    with os.fdopen(fd, "wb") as f:
+        writer.write(f)
+    return range_path
+
+
+def partition_to_content(pdf_path: str, config: Dict, page_range: Optional[Tuple[int, int]] = None) -> Dict:
+    """Partition a PDF (or one page range of it) and return ``{"texts", "tables", "images", "elapsed_ms"}``."""
+    from unstructured.partition.pdf import partition_pdf
+
+    start = time.perf_counter()
+    path = _write_page_range(pdf_path, *page_range) if page_range else pdf_path
+    try:
+        chunks = partition_pdf(filename=path, **config)
+    finally:
+        if page_range and os.path.exists(path):
+            os.unlink(path)
+    content = process_chunks(chunks)
+    content["elapsed_ms"] = (time.perf_counter() - start) * 1000
+    return content
+
+
+def process_chunks(chunks: List) -> Dict:
+    """Process extracted chunks into texts, tables, and images."""
+    images_b64 = extract_images(chunks)
+    tables = extract_tables(chunks)
+    texts = [chunk.text if hasattr(chunk, "text") else str(chunk) for chunk in extract_texts(chunks)]
+    return {"texts": texts, "tables": tables, "images": images_b64}
+
+
+def extract_images(chunks: List) -> List[str]:
+    """Extract base64 images from chunks."""
+    images_b64 = []
+    for chunk in chunks:
+        if "CompositeElement" not in str(type(chunk)):
+            continue
+        if not hasattr(chunk.metadata, "orig_elements"):
+            continue
+        for el in chunk.metadata.orig_elements:
+            if "Image" in str(type(el)):
+                if hasattr(el.metadata, "image_base64") and el.metadata.image_base64:
+                    images_b64.append(el.metadata.image_base64)
+    return images_b64
+
+
+def extract_tables(chunks: List) -> List[Dict[str, str]]:
+    """Extract tables from chunks."""
+    tables = []
+    for chunk in chunks:
+        if hasattr(chunk, "metadata") and hasattr(chunk.metadata, "text_as_html"):
+            html = getattr(chunk.metadata, "text_as_html", None)
+            if html:
+                chunk_text = chunk.text if hasattr(chunk, "text") else str(chunk)
+                tables.append({"html": str(html), "text": str(chunk_text)})
+                continue
+
+        if "Table" in str(type(chunk)):
+            chunk_text = chunk.text if hasattr(chunk, "text") else str(chunk)
+            tables.append({"html": "", "text": str(chunk_text)})
+            continue
+
+        if "CompositeElement" in str(type(chunk)):
+            if hasattr(chunk, "metadata") and hasattr(chunk.metadata, "orig_elements"):
+                for el in chunk.metadata.orig_elements or []:
+                    if "Table" not in str(type(el)):
+                        continue
+                    el_html = None
+                    if hasattr(el, "metadata") and hasattr(el.metadata, "text_as_html"):
+                        el_html = getattr(el.metadata, "text_as_html", None)
+                    el_text = el.text if hasattr(el, "text") else str(el)
+                    tables.append({"html": str(el_html or ""), "text": str(el_text)})
+
+    return tables
+
+
+def extract_texts(chunks: List) -> List:
+    """Extract text chunks."""
+    text_types = {"CompositeElement", "Text", "NarrativeText", "Title", "ListItem", "Header", "Footer"}
+    return [chunk for chunk in chunks if any(t in str(type(chunk)) for t in text_types)]
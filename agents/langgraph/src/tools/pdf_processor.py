@@ -1,30 +1,31 @@
 import hashlib
 import os
+import tempfile
 import uuid
-from pathlib import Path
 from typing import Dict, List, Optional
 
-from langchain_chroma import Chroma
 from langchain_core.documents import Document
 from langchain_core.messages import HumanMessage
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnableLambda, RunnablePassthrough
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
-from unstructured.partition.pdf import partition_pdf
-
-from agents.model import Model
+from agents.model import Model, get_chat_model
 from prompts.classroom import (
     BUILD_PROMPT_TEMPLATE,
     IMAGE_PROMPT_TEMPLATE,
     TEXT_TABLE_SUMMARIZATION_PROMPT,
 )
+from tools.extraction_pool import ExtractionPool, PDFExtractionError
+from tools.image_store import ImageStore
+from tools.index_manifest import IndexManifest
+from tools.image_summarizer import ImageSummarizer, SummaryCheckpoint
+from tools.pdf_partition import FAST, HI_RES, OCR_ONLY, partition_to_content, scan_pdf
+from tools.vector_store import COLLECTION_NAME, EMBEDDING_MODEL, VECTORSTORE_PATH, get_vector_store
 
-VECTORSTORE_PATH = Path(__file__).parent.parent / "vectorstore"
 IMAGE_STORE_PATH = VECTORSTORE_PATH / "image_store"
-EMBEDDING_MODEL = "text-embedding-3-small"
+IMAGE_SUMMARY_CHECKPOINT_PATH = VECTORSTORE_PATH / "image_summaries"
+INDEX_MANIFEST_PATH = VECTORSTORE_PATH / "index_manifest.sqlite3"
 IMAGE_MODEL = "gpt-4o-mini"
-COLLECTION_NAME = "classroom_multimodal_rag"
 
 PDF_EXTRACTION_CONFIG = {
     "strategy": "hi_res",
@@ -36,6 +37,23 @@ PDF_EXTRACTION_CONFIG = {
     "combine_text_under_n_chars": 2000,
     "new_after_n_chars": 6000,
 }
+CHUNKING_CONFIG = {
+    "chunking_strategy": "by_title",
+    "max_characters": 10000,
+    "combine_text_under_n_chars": 2000,
+    "new_after_n_chars": 6000,
+}
+# Per-strategy partition settings picked by the pre-scan. Only hi_res does
+# layout detection, table structure and image extraction.
+STRATEGY_CONFIGS = {
+    FAST: {"strategy": FAST, **CHUNKING_CONFIG},
+    HI_RES: PDF_EXTRACTION_CONFIG,
+    OCR_ONLY: {"strategy": OCR_ONLY, **CHUNKING_CONFIG},
+}
+PDF_ADAPTIVE_STRATEGY = os.getenv("PDF_ADAPTIVE_STRATEGY", "true").lower() == "true"
+PDF_EXTRACTION_WORKERS = int(os.getenv("PDF_EXTRACTION_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+PDF_EXTRACTION_TIMEOUT = float(os.getenv("PDF_EXTRACTION_TIMEOUT", "600"))
+PDF_EXTRACTION_MAX_TASKS_PER_CHILD = int(os.getenv("PDF_EXTRACTION_MAX_TASKS_PER_CHILD", "20"))
 
 TYPE_TEXT = "text"
 TYPE_TABLE = "table"
@@ -43,106 +61,102 @@ TYPE_IMAGE = "image"
 TYPE_IMAGE_SUMMARY = "image_summary"
 
 model = Model()
-class ImageStore:
-    """Manages image storage and retrieval."""
-
-    def __init__(self, store_path: Path):
-        self.store_path = store_path
-        self.store_path.mkdir(parents=True, exist_ok=True)
-
-    def save(self, image_b64: str) -> str:
-        """Persist base64 image and return a stable key."""
-        digest = hashlib.sha256(image_b64.encode("utf-8")).hexdigest()[:16]
-        image_key = f"img_{digest}_{uuid.uuid4().hex[:8]}"
-        (self.store_path / f"{image_key}.b64").write_text(image_b64, encoding="utf-8")
-        return image_key
-
-    def load(self, image_key: str) -> Optional[str]:
-        """Retrieve base64 image by key."""
-        path = self.store_path / f"{image_key}.b64"
-        if not path.exists():
-            return None
-        return path.read_text(encoding="utf-8")
-
-
 class ContentExtractor:
-    """Extracts multimodal content from PDFs."""
-
-    @staticmethod
-    def extract(pdf_bytes: bytes, temp_filename: str, temp_dir: Path) -> Dict:
-        """Extract text, tables, and images from PDF."""
-        temp_path = temp_dir / temp_filename
-        temp_path.parent.mkdir(parents=True, exist_ok=True)
-
+    """Extracts multimodal content from PDFs on a pool of worker processes.
+
+    ``partition_pdf`` with hi_res is CPU-heavy and holds the GIL, so each page
+    range is partitioned in a separate process. Each task gets ``timeout``
+    seconds from when a worker starts it; a task that overruns or crashes its
+    worker fails that PDF without disturbing the others in the pool.
+    """
+
+    def __init__(
+        self,
+        workers: int = PDF_EXTRACTION_WORKERS,
+        timeout: float = PDF_EXTRACTION_TIMEOUT,
+        max_tasks_per_child: int = PDF_EXTRACTION_MAX_TASKS_PER_CHILD,
+    ):
+        self.pool = ExtractionPool(workers, timeout, max_tasks_per_child)
+
+    def shutdown(self) -> None:
+        self.pool.shutdown()
+
+    def extract(self, pdf_bytes: bytes, filename: str, config: Optional[Dict] = None) -> Dict:
+        """Extract text, tables, and images from PDF.
+
+        Without an explicit ``config`` the PDF is pre-scanned and each page range
+        is partitioned with the cheapest strategy that handles it. The result's
+        ``extraction`` dict records the decision and timings for index metadata.
+        """
+        # A unique temp file per call, so concurrent runs on same-named PDFs cannot collide.
+        fd, temp_path = tempfile.mkstemp(suffix=".pdf", prefix="voicera-")
         try:
-            temp_path.write_bytes(pdf_bytes)
-            chunks = partition_pdf(filename=str(temp_path), **PDF_EXTRACTION_CONFIG)
-            return ContentExtractor._process_chunks(chunks)
-        except Exception as e:
-            print(f"Error extracting PDF: {e}")
-            return {"texts": [], "tables": [], "images": []}
+            with os.fdopen(fd, "wb") as f:
+                f.write(pdf_bytes)
+            if config is not None or not PDF_ADAPTIVE_STRATEGY:
+                config = config or PDF_EXTRACTION_CONFIG
+                content = self._partition(temp_path, filename, [(None, config)])
+                content["extraction"] = {
+                    "extraction_strategy": config.get("strategy", HI_RES),
+                    "extraction_ms": content.pop("elapsed_ms"),
+                }
+                return content
+            return self._extract_adaptive(temp_path, filename)
         finally:
-            if temp_path.exists():
-                temp_path.unlink()
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
 
-    @staticmethod
-    def _process_chunks(chunks: List) -> Dict:
-        """Process extracted chunks into texts, tables, and images."""
-        images_b64 = ContentExtractor._extract_images(chunks)
-        tables = ContentExtractor._extract_tables(chunks)
-        texts = ContentExtractor._extract_texts(chunks)
-        return {"texts": texts, "tables": tables, "images": images_b64}
-
-    @staticmethod
-    def _extract_images(chunks: List) -> List[str]:
-        """Extract base64 images from chunks."""
-        images_b64 = []
-        for chunk in chunks:
-            if "CompositeElement" not in str(type(chunk)):
-                continue
-            if not hasattr(chunk.metadata, "orig_elements"):
-                continue
-            for el in chunk.metadata.orig_elements:
-                if "Image" in str(type(el)):
-                    if hasattr(el.metadata, "image_base64") and el.metadata.image_base64:
-                        images_b64.append(el.metadata.image_base64)
-        return images_b64
-
-    @staticmethod
-    def _extract_tables(chunks: List) -> List[Dict[str, str]]:
-        """Extract tables from chunks."""
-        tables = []
-        for chunk in chunks:
-            if hasattr(chunk, "metadata") and hasattr(chunk.metadata, "text_as_html"):
-                html = getattr(chunk.metadata, "text_as_html", None)
-                if html:
-                    chunk_text = chunk.text if hasattr(chunk, "text") else str(chunk)
-                    tables.append({"html": str(html), "text": str(chunk_text)})
-                    continue
-
-            if "Table" in str(type(chunk)):
-                chunk_text = chunk.text if hasattr(chunk, "text") else str(chunk)
-                tables.append({"html": "", "text": str(chunk_text)})
-                continue
-
-            if "CompositeElement" in str(type(chunk)):
-                if hasattr(chunk, "metadata") and hasattr(chunk.metadata, "orig_elements"):
-                    for el in chunk.metadata.orig_elements or []:
-                        if "Table" not in str(type(el)):
-                            continue
-                        el_html = None
-                        if hasattr(el, "metadata") and hasattr(el.metadata, "text_as_html"):
-                            el_html = getattr(el.metadata, "text_as_html", None)
-                        el_text = el.text if hasattr(el, "text") else str(el)
-                        tables.append({"html": str(el_html or ""), "text": str(el_text)})
-
-        return tables
-
-    @staticmethod
-    def _extract_texts(chunks: List) -> List:
-        """Extract text chunks."""
-        text_types = {"CompositeElement", "Text", "NarrativeText", "Title", "ListItem", "Header", "Footer"}
-        return [chunk for chunk in chunks if any(t in str(type(chunk)) for t in text_types)]
+    def _extract_adaptive(self, temp_path: str, filename: str) -> Dict:
+        try:
+            scan = self._call(filename, scan_pdf, temp_path)
+            ranges = scan["ranges"]
+        except PDFExtractionError:
+            raise
+        except Exception as e:
+            print(f"Pre-scan of {filename} failed, using hi_res: {e}")
+            scan, ranges = {"elapsed_ms": 0.0}, []
+
+        if len(ranges) <= 1:
+            strategy = ranges[0][2] if ranges else HI_RES
+            jobs = [(None, STRATEGY_CONFIGS[strategy])]
+        else:
+            jobs = [((first, last), STRATEGY_CONFIGS[strategy]) for first, last, strategy in ranges]
+
+        content = self._partition(temp_path, filename, jobs)
+        strategies = {strategy for _, _, strategy in ranges} or {HI_RES}
+        content["extraction"] = {
+            "extraction_strategy": strategies.pop() if len(strategies) == 1 else "mixed",
+            "extraction_ranges": ",".join(f"{first}-{last}:{strategy}" for first, last, strategy in ranges),
+            "extraction_ms": content.pop("elapsed_ms"),
+            "scan_ms": round(scan["elapsed_ms"], 1),
+        }
+        print(f"Extracted {filename} ({content['extraction']['extraction_ranges'] or 'hi_res'}) "
+              f"in {content['extraction']['extraction_ms']:.0f} ms")
+        return content
+
+    def _partition(self, temp_path: str, filename: str, jobs: List[tuple]) -> Dict:
+        """Partition page ranges concurrently and merge them in page order.
+
+        Any failed range fails the whole PDF: a partial result would otherwise
+        be recorded in the manifest as the file's current version and never retried.
+        """
+        tasks = [self.pool.submit(partition_to_content, temp_path, config, page_range) for page_range, config in jobs]
+        merged = {"texts": [], "tables": [], "images": [], "elapsed_ms": 0.0}
+        for (page_range, config), task in zip(jobs, tasks):
+            try:
+                part = self.pool.result(task, filename)
+            except PDFExtractionError:
+                raise
+            except Exception as e:
+                raise PDFExtractionError(f"Extraction of {filename} pages {page_range or 'all'} failed: {e}") from e
+            for key in ("texts", "tables", "images"):
+                merged[key].extend(part[key])
+            merged["elapsed_ms"] += part["elapsed_ms"]
+        merged["elapsed_ms"] = round(merged["elapsed_ms"], 1)
+        return merged
+
+    def _call(self, filename: str, fn, *args):
+        return self.pool.result(self.pool.submit(fn, *args), filename)
 
 
 class ChainBuilder:
@@ -172,7 +186,7 @@ class ChainBuilder:
             )
         ]
         image_prompt = ChatPromptTemplate.from_messages(messages)
-        return image_prompt | ChatOpenAI(model=IMAGE_MODEL) | StrOutputParser()
+        return image_prompt | self.image_llm | StrOutputParser()
 
 
 class PDFProcessor:
@@ -181,26 +195,28 @@ class PDFProcessor:
     def __init__(self, classroom_tool):
         self.classroom_tool = classroom_tool
 
-        self.embeddings = OpenAIEmbeddings(
-            model=EMBEDDING_MODEL,
-            openai_api_key=os.getenv("OPENAI_API_KEY"),
-        )
-        self.vectorstore = Chroma(
-            persist_directory=str(VECTORSTORE_PATH),
-            embedding_function=self.embeddings,
-            collection_name=COLLECTION_NAME,
-        )
+        self.vectorstore = get_vector_store().collection(COLLECTION_NAME, EMBEDDING_MODEL)
+        self.embeddings = self.vectorstore.embeddings
 
+        self.manifest = IndexManifest(INDEX_MANIFEST_PATH)
         self.image_store = ImageStore(IMAGE_STORE_PATH)
         self.content_extractor = ContentExtractor()
 
         llm = model.openai_model
-        self.summarize_chain = ChainBuilder(llm, ChatOpenAI(model=IMAGE_MODEL)).build_summarization_chain()
-        self.image_summarization_chain = ChainBuilder(llm, ChatOpenAI(model=IMAGE_MODEL)).build_image_summarization_chain()
+        # Client-side retries are off so the summarizer sees 429s and can back off.
+        chain_builder = ChainBuilder(llm, get_chat_model("image", model=IMAGE_MODEL, max_retries=0))
+        self.summarize_chain = chain_builder.build_summarization_chain()
+        self.image_summarization_chain = chain_builder.build_image_summarization_chain()
+        prompt_digest = hashlib.sha256(IMAGE_PROMPT_TEMPLATE.encode("utf-8")).hexdigest()[:12]
+        self.image_summarizer = ImageSummarizer(
+            self.image_summarization_chain,
+            SummaryCheckpoint(IMAGE_SUMMARY_CHECKPOINT_PATH, f"{IMAGE_MODEL}:{prompt_digest}"),
+        )
 
-    def process_course_materials(self, course_id: str) -> Dict[str, int]:
-        """Process all materials for a course."""
-        materials = self.classroom_tool.list_coursework_materials(course_id)
+    def process_course_materials(self, course_id: str, materials: Optional[List[Dict]] = None) -> Dict[str, int]:
+        """Process all materials for a course, listing them unless the caller already has them."""
+        if materials is None:
+            materials = self.classroom_tool.list_coursework_materials(course_id)
 
         stats = {
             "materials_processed": len(materials),
@@ -215,70 +231,137 @@ class PDFProcessor:
 
         return stats
 
-    def process_and_index_material(self, course_id: str, material: Dict) -> int:
-        """Process and index a single material with PDFs."""
-        material_id = material["id"]
-
-        if self._is_already_indexed(material_id):
+    def process_and_index_material(self, course_id: str, material: Dict, force: bool = False) -> int:
+        """Bring a material's chunks in line with its current PDFs; returns the chunks added.
+
+        A material whose Classroom ``updateTime`` matches the manifest is skipped
+        unless ``force`` is set. Otherwise each PDF is checked against its Drive
+        checksum: unchanged files keep their chunks, changed files are re-indexed
+        and their old chunks deleted, and files no longer attached are dropped.
+        If any PDF fails to extract, nothing is recorded and the previous chunks
+        keep serving, so the next run retries the material.
+        """
+        if not force and self.manifest.is_current(material):
             return 0
 
-        indexed = 0
-        for attachment in material.get("materials", []):
-            indexed += self._process_pdf_attachment(course_id, material, attachment)
-
-        return indexed
-
-    def _process_pdf_attachment(self, course_id: str, material: Dict, attachment: Dict) -> int:
-        """Process a single PDF attachment."""
-        if "driveFile" not in attachment:
-            return 0
+        material_id = material["id"]
+        # Chunks indexed before the manifest existed have unknown ids. They keep
+        # serving until the new version is recorded, then they are deleted.
+        untracked = self._untracked_chunks(material_id) if material_id not in self.manifest else None
+        previous = self.manifest.files(material_id)
 
-        file = attachment["driveFile"]["driveFile"]
-        if not file["title"].lower().endswith(".pdf"):
-            return 0
+        files: Dict[str, Dict] = {}
+        added: List[Dict] = []
+        try:
+            for attachment in material.get("materials", []):
+                file = self._pdf_file(attachment)
+                if file is None:
+                    continue
+                old = previous.get(file["id"])
+                drive = self.classroom_tool.get_drive_file(file["id"])
+                version = {"md5": drive.get("md5Checksum"), "modified_time": drive.get("modifiedTime")}
+                if old and self._same_version(old, version):
+                    files[file["id"]] = old
+                    continue
 
+                entry = self._process_pdf_attachment(course_id, material, file)
+                if entry is None:
+                    # Download failed; keep serving the previous version.
+                    if old:
+                        files[file["id"]] = old
+                    continue
+                files[file["id"]] = {**entry, "filename": file["title"], **version}
+                added.append(entry)
+        except Exception:
+            for entry in added:
+                self._delete_chunks(entry)
+            raise
+
+        for file_id, entry in previous.items():
+            if files.get(file_id) is not entry:
+                self._delete_chunks(entry)
+        self.manifest.record(course_id, material, files)
+        if untracked:
+            self._delete_chunks(untracked)
+        return sum(len(entry["chunk_ids"]) for entry in added)
+
+    def remove_material(self, material_id: str) -> None:
+        """Delete every chunk (and image reference) indexed for a material."""
+        for entry in self.manifest.files(material_id).values():
+            self._delete_chunks(entry)
+        if material_id not in self.manifest:
+            self._delete_chunks(self._untracked_chunks(material_id))
+        self.manifest.remove(material_id)
+
+    def _process_pdf_attachment(self, course_id: str, material: Dict, file: Dict) -> Optional[Dict]:
+        """Index one PDF; returns its chunk ids and image keys, or None if it could not be downloaded."""
         pdf_bytes = self.classroom_tool.download_drive_pdf(file["id"])
         if not pdf_bytes:
-            return 0
-
-        content = self.content_extractor.extract(pdf_bytes, file["title"], VECTORSTORE_PATH / "temp")
+            return None
 
+        content = self.content_extractor.extract(pdf_bytes, file["title"])
+        entry = {"chunk_ids": [], "image_keys": []}
         if not any([content["texts"], content["tables"], content["images"]]):
-            return 0
+            return entry
 
-        base_metadata = self._build_metadata(course_id, material, file)
-        indexed = 0
+        base_metadata = {**self._build_metadata(course_id, material, file), **content.get("extraction", {})}
+        try:
+            text_chunks = self._extract_chunk_texts(content["texts"])
+            entry["chunk_ids"] += self._add_to_vectorstore(text_chunks, {**base_metadata, "type": TYPE_TEXT})
 
-        text_chunks = self._extract_chunk_texts(content["texts"])
-        indexed += self._add_to_vectorstore(text_chunks, {**base_metadata, "type": TYPE_TEXT})
+            table_chunks = self._extract_table_texts(content["tables"])
+            entry["chunk_ids"] += self._add_to_vectorstore(table_chunks, {**base_metadata, "type": TYPE_TABLE})
 
-        table_chunks = self._extract_table_texts(content["tables"])
-        indexed += self._add_to_vectorstore(table_chunks, {**base_metadata, "type": TYPE_TABLE})
+            image_ids, image_keys = self._process_images(content["images"], base_metadata)
+            entry["chunk_ids"] += image_ids
+            entry["image_keys"] += image_keys
+        except Exception:
+            self._delete_chunks(entry)
+            raise
 
-        indexed += self._process_images(content["images"], base_metadata)
+        return entry
 
-        return indexed
+    def _process_images(self, images: List[str], base_metadata: Dict) -> tuple[List[str], List[str]]:
+        """Process and index image summaries; returns ``(chunk_ids, image_keys)``.
 
-    def _process_images(self, images: List[str], base_metadata: Dict) -> int:
-        """Process and index image summaries."""
+        Repeated images (the same logo or diagram on every slide) resolve to one
+        stored image and are summarized and embedded once per document. Near
+        duplicates are only merged within the document, and the summary is
+        always of the bytes stored under the key. Each indexed document holds
+        one reference in the image store.
+        """
         if not images:
-            return 0
-
-        try:
-            summaries = self.image_summarization_chain.batch(
-                [{"image": img} for img in images],
-                {"max_concurrency": 2},
-            )
-        except Exception as e:
-            print(f"Error summarizing images: {e}")
-            return 0
+            return [], []
+
+        unique: Dict[str, str] = {}
+        occurrences: Dict[str, int] = {}
+        for img_b64 in dict.fromkeys(images):
+            try:
+                image_key, is_new = self.image_store.put(img_b64, candidates=unique)
+            except Exception as e:
+                print(f"Could not store image: {e}")
+                continue
+            if image_key in unique:
+                # A near-duplicate of an image already seen in this document.
+                self.image_store.release(image_key)
+            else:
+                stored = img_b64 if is_new else self.image_store.load(image_key)
+                if stored is None:
+                    self.image_store.release(image_key)
+                    continue
+                unique[image_key] = stored
+            occurrences[image_key] = occurrences.get(image_key, 0) + images.count(img_b64)
 
-        if len(summaries) != len(images):
-            return 0
+        keys = list(unique)
+        summaries = self.image_summarizer.summarize([unique[key] for key in keys])
+        missing = sum(1 for summary in summaries if not summary)
+        print(f"Images: {len(images)} found, {len(keys)} unique, {len(keys) - missing} summarized")
 
         image_docs = []
-        for i, (img_b64, summary) in enumerate(zip(images, summaries)):
-            image_key = self.image_store.save(img_b64)
+        for i, (image_key, summary) in enumerate(zip(keys, summaries)):
+            if not summary:
+                self.image_store.release(image_key)
+                continue
             image_docs.append(
                 Document(
                     page_content=summary,
@@ -287,30 +370,51 @@ class PDFProcessor:
                         "type": TYPE_IMAGE,
                         "chunk_index": i,
                         "image_key": image_key,
+                        "occurrences": occurrences[image_key],
                     },
                 )
             )
 
-        self.vectorstore.add_documents(image_docs)
-        return len(image_docs)
+        if not image_docs:
+            return [], []
+        image_keys = [doc.metadata["image_key"] for doc in image_docs]
+        try:
+            return self._add_documents(image_docs), image_keys
+        except Exception:
+            for image_key in image_keys:
+                self.image_store.release(image_key)
+            raise
 
-    def _add_to_vectorstore(self, items: List[str], metadata: Dict) -> int:
-        """Add items to vectorstore."""
+    def _add_to_vectorstore(self, items: List[str], metadata: Dict) -> List[str]:
+        """Add items to vectorstore; returns the chunk ids."""
         docs = [
             Document(page_content=str(item), metadata={**metadata, "chunk_index": i})
             for i, item in enumerate(items)
             if item and str(item).strip()
         ]
-
-        if not docs:
-            return 0
-
-        try:
-            self.vectorstore.add_documents(docs)
-            return len(docs)
-        except Exception as e:
-            print(f"Error adding documents to vectorstore: {e}")
-            return 0
+        return self._add_documents(docs) if docs else []
+
+    def _add_documents(self, docs: List[Document]) -> List[str]:
+        ids = [uuid.uuid4().hex for _ in docs]
+        self.vectorstore.add_documents(docs, ids=ids)
+        return ids
+
+    def _delete_chunks(self, entry: Dict) -> None:
+        if entry["chunk_ids"]:
+            self.vectorstore.delete(ids=entry["chunk_ids"])
+        for image_key in entry["image_keys"]:
+            self.image_store.release(image_key)
+
+    def _untracked_chunks(self, material_id: str) -> Dict:
+        """Chunk ids and image keys stored for a material that the manifest has no record of."""
+        result = self.vectorstore._collection.get(where={"material_id": material_id}, include=["metadatas"])
+        return {
+            "chunk_ids": result.get("ids") or [],
+            "image_keys": [
+                metadata["image_key"] for metadata in result.get("metadatas") or []
+                if metadata and metadata.get("image_key")
+            ],
+        }
 
     def get_retriever(self, k: int = 5, filter_dict: Optional[Dict] = None, use_mmr: bool = True):
         """Get a retriever from the vector store."""
@@ -332,7 +436,7 @@ class PDFProcessor:
                 "question": RunnablePassthrough(),
             }
             | RunnableLambda(self._build_multimodal_prompt)
-            | ChatOpenAI(model=IMAGE_MODEL)
+            | get_chat_model("image", model=IMAGE_MODEL)
             | StrOutputParser()
         )
 
@@ -341,6 +445,7 @@ class PDFProcessor:
         b64_images = []
         text_docs = []
         image_summaries = []
+        seen_keys = set()
 
         for doc in docs:
             if not isinstance(doc, Document):
@@ -350,8 +455,9 @@ class PDFProcessor:
             if doc_type == TYPE_IMAGE:
                 image_summaries.append(doc.page_content)
                 image_key = doc.metadata.get("image_key")
-                if image_key:
-                    img_b64 = self.image_store.load(str(image_key))
+                if image_key and image_key not in seen_keys:
+                    seen_keys.add(image_key)
+                    img_b64 = self.image_store.load_thumbnail(str(image_key))
                     if img_b64:
                         b64_images.append(img_b64)
             else:
@@ -381,6 +487,20 @@ class PDFProcessor:
         return ChatPromptTemplate.from_messages([HumanMessage(content=prompt_content)])
 
 
+    @staticmethod
+    def _pdf_file(attachment: Dict) -> Optional[Dict]:
+        """The Drive file of a PDF attachment, or None for anything else."""
+        if "driveFile" not in attachment:
+            return None
+        file = attachment["driveFile"]["driveFile"]
+        return file if file["title"].lower().endswith(".pdf") else None
+
+    @staticmethod
+    def _same_version(indexed: Dict, current: Dict) -> bool:
+        """Compare Drive versions by checksum, or by modifiedTime when there is none."""
+        key = "md5" if current["md5"] else "modified_time"
+        return current[key] is not None and current[key] == indexed.get(key)
+
     @staticmethod
     def _count_pdfs(material: Dict) -> int:
         """Count PDF files in a material."""
@@ -433,11 +553,3 @@ class PDFProcessor:
             content = doc.page_content if isinstance(doc, Document) else str(doc)
             context_parts.append(content)
         return "\n\n".join(context_parts)
-
-    def _is_already_indexed(self, material_id: str) -> bool:
-        """Check if material is already in vectorstore."""
-        try:
-            result = self.vectorstore._collection.get(where={"material_id": material_id}, limit=1)
-            return bool(result.get("ids"))
-        except Exception:
-            return False
\ No newline at end of file
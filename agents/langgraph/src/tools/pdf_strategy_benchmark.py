@@ -0,0 +1,116 @@
+"""Compare PDF extraction strategies on throughput and retrieval quality.
+
+Each PDF is extracted with every strategy (plus the adaptive pre-scan), then
+the questions in a JSONL file are answered by BM25 over the extracted chunks.
+A question counts as a hit when its expected answer text appears in one of
+the top-k chunks. Run from the langgraph ``src`` directory:
+
+    python -m tools.pdf_strategy_benchmark --pdf notes/ --queries questions.jsonl
+    python -m tools.pdf_strategy_benchmark --pdf lecture1.pdf --strategies fast,adaptive -k 3
+
+Query lines look like ``{"question": "...", "answer": "..."}``.
+"""
+import argparse
+import json
+import math
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
+
+from tools.pdf_partition import FAST, HI_RES, OCR_ONLY
+from tools.pdf_processor import STRATEGY_CONFIGS, ContentExtractor
+
+ADAPTIVE = "adaptive"
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+class BM25:
+    def __init__(self, docs: List[str], k1: float = 1.5, b: float = 0.75):
+        self.docs = docs
+        self.k1, self.b = k1, b
+        self.tokens = [Counter(tokenize(d)) for d in docs]
+        self.lengths = [sum(t.values()) for t in self.tokens]
+        self.avg_length = sum(self.lengths) / len(docs) if docs else 0.0
+        df = Counter(term for t in self.tokens for term in t)
+        n = len(docs)
+        self.idf = {term: math.log(1 + (n - f + 0.5) / (f + 0.5)) for term, f in df.items()}
+
+    def top(self, query: str, k: int) -> List[str]:
+        terms = tokenize(query)
+        scores = []
+        for i, tf in enumerate(self.tokens):
+            norm = self.k1 * (1 - self.b + self.b * self.lengths[i] / (self.avg_length or 1))
+            score = sum(self.idf.get(t, 0.0) * tf[t] * (self.k1 + 1) / (tf[t] + norm) for t in terms if t in tf)
+            scores.append((score, i))
+        return [self.docs[i] for score, i in sorted(scores, reverse=True)[:k] if score > 0]
+
+
+def count_pages(pdf: Path) -> int:
+    from pypdf import PdfReader
+
+    return len(PdfReader(str(pdf)).pages)
+
+
+def run_strategy(extractor: ContentExtractor, pdfs: List[Path], strategy: str) -> Dict:
+    chunks: List[str] = []
+    decisions = []
+    start = time.perf_counter()
+    for pdf in pdfs:
+        config = None if strategy == ADAPTIVE else STRATEGY_CONFIGS[strategy]
+        try:
+            content = extractor.extract(pdf.read_bytes(), pdf.name, config)
+        except Exception as e:
+            print(f"{strategy}: {pdf.name} failed: {e}")
+            continue
+        chunks.extend(t for t in content["texts"] if t.strip())
+        chunks.extend(t.get("html") or t.get("text") or "" for t in content["tables"])
+        extraction = content.get("extraction", {})
+        decisions.append((pdf.name, extraction.get("extraction_ranges") or extraction.get("extraction_strategy")))
+    return {"elapsed": time.perf_counter() - start, "chunks": chunks, "decisions": decisions}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pdf", type=Path, nargs="+", required=True, help="PDF files or directories")
+    parser.add_argument("--queries", type=Path, help="JSONL of {question, answer} for retrieval quality")
+    parser.add_argument("--strategies", default=f"{FAST},{HI_RES},{OCR_ONLY},{ADAPTIVE}")
+    parser.add_argument("-k", type=int, default=5)
+    args = parser.parse_args()
+
+    pdfs = [p for path in args.pdf for p in (sorted(path.glob("*.pdf")) if path.is_dir() else [path])]
+    queries = []
+    if args.queries:
+        queries = [json.loads(line) for line in args.queries.read_text(encoding="utf-8").splitlines() if line.strip()]
+    total_pages = sum(count_pages(p) for p in pdfs)
+    print(f"{len(pdfs)} PDFs, {total_pages} pages, {len(queries)} queries\n")
+
+    extractor = ContentExtractor()
+    try:
+        print(f"{'strategy':<10} {'seconds':>8} {'pages/s':>8} {'chunks':>7} {'hit@' + str(args.k):>7}")
+        for strategy in args.strategies.split(","):
+            result = run_strategy(extractor, pdfs, strategy)
+            hits = "-"
+            if queries and result["chunks"]:
+                index = BM25(result["chunks"])
+                found = sum(
+                    any(q["answer"].lower() in chunk.lower() for chunk in index.top(q["question"], args.k))
+                    for q in queries
+                )
+                hits = f"{found / len(queries):.2f}"
+            pages_per_s = total_pages / result["elapsed"] if result["elapsed"] else 0.0
+            print(f"{strategy:<10} {result['elapsed']:>8.1f} {pages_per_s:>8.2f} {len(result['chunks']):>7} {hits:>7}")
+            if strategy == ADAPTIVE:
+                for name, decision in result["decisions"]:
+                    print(f"{'':<10} {name}: {decision}")
+    finally:
+        extractor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Process-wide vector store: one persistent Chroma client and one handle per collection.
+
+Every collection handle embeds through the same cached embeddings client for
+its model, so ingestion and the agents always query with the model the
+collection was written with.
+"""
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import chromadb
+from colorama import Fore, Style
+from langchain_chroma import Chroma
+from langchain_openai import OpenAIEmbeddings
+
+from tools.embedding_cache import CachedEmbeddings
+
+VECTORSTORE_PATH = Path(__file__).parent.parent / "vectorstore"
+EMBEDDING_CACHE_PATH = VECTORSTORE_PATH / "embedding_cache.sqlite3"
+EMBEDDING_MODEL = "text-embedding-3-small"
+COLLECTION_NAME = "classroom_multimodal_rag"
+VECTORSTORE_WARMUP_QUERY = os.getenv("VECTORSTORE_WARMUP_QUERY", "course overview")
+
+
+class VectorStoreService:
+    """Owns the Chroma client and hands out per-collection LangChain handles."""
+
+    def __init__(self, path: Path = VECTORSTORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._client = None
+        self._embeddings: Dict[str, CachedEmbeddings] = {}
+        self._collections: Dict[str, Chroma] = {}
+        self.warmed_at: Optional[float] = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = chromadb.PersistentClient(path=str(self.path))
+        return self._client
+
+    def embeddings(self, model: str = EMBEDDING_MODEL) -> CachedEmbeddings:
+        with self._lock:
+            if model not in self._embeddings:
+                self._embeddings[model] = CachedEmbeddings(
+                    OpenAIEmbeddings(model=model, openai_api_key=os.getenv("OPENAI_API_KEY")),
+                    model=model,
+                    path=EMBEDDING_CACHE_PATH,
+                )
+            return self._embeddings[model]
+
+    def collection(self, name: str = COLLECTION_NAME, model: str = EMBEDDING_MODEL) -> Chroma:
+        """Shared handle for a collection; raises if it was written with another embedding model."""
+        handle = self._collections.get(name)
+        if handle is not None:
+            if handle.embeddings.model != model:
+                raise ValueError(f"Collection {name} is open with {handle.embeddings.model}, not {model}")
+            return handle
+
+        client = self.client
+        embeddings = self.embeddings(model)
+        with self._lock:
+            if name not in self._collections:
+                try:
+                    existing = client.get_collection(name)
+                except Exception:
+                    existing = None
+                indexed_with = (existing.metadata or {}).get("embedding_model") if existing else None
+                if indexed_with and indexed_with != model:
+                    raise ValueError(f"Collection {name} was indexed with {indexed_with}, not {model}")
+                self._collections[name] = Chroma(
+                    client=client,
+                    collection_name=name,
+                    embedding_function=embeddings,
+                    collection_metadata={"embedding_model": model},
+                )
+            return self._collections[name]
+
+    def warm_up(self, name: str = COLLECTION_NAME) -> bool:
+        """Open the client, load the collection's index and embed a probe query."""
+        start = time.perf_counter()
+        try:
+            self.collection(name).similarity_search(VECTORSTORE_WARMUP_QUERY, k=1)
+        except Exception as e:
+            print(Fore.RED + f"Vector store warm-up failed: {e}" + Style.RESET_ALL)
+            return False
+        self.warmed_at = time.time()
+        elapsed = (time.perf_counter() - start) * 1000
+        print(Fore.CYAN + f"Vector store warmed in {elapsed:.0f} ms" + Style.RESET_ALL)
+        return True
+
+    def health(self) -> dict:
+        start = time.perf_counter()
+        try:
+            self.client.heartbeat()
+            collections = {name: handle._collection.count() for name, handle in self._collections.items()}
+        except Exception as e:
+            return {"status": "unavailable", "path": str(self.path), "error": str(e)}
+        return {
+            "status": "ok",
+            "path": str(self.path),
+            "latency_ms": (time.perf_counter() - start) * 1000,
+            "collections": collections,
+            "embeddings": {model: e.metrics() for model, e in self._embeddings.items()},
+            "warmed_at": self.warmed_at,
+        }
+
+
+_service: Optional[VectorStoreService] = None
+_service_lock = threading.Lock()
+
+
+def get_vector_store() -> VectorStoreService:
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = VectorStoreService()
+    return _service
@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# The agents, prompts and tools packages live under src/ and are imported by
+# their top-level names, as the API does.
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
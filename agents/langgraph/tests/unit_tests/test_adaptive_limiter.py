@@ -0,0 +1,90 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from tools.image_summarizer import AdaptiveLimiter, _retry_after
+
+
+def limiter(initial=4, minimum=1, maximum=8):
+    return AdaptiveLimiter(initial=initial, minimum=minimum, maximum=maximum, latency_target=1.0)
+
+
+def call(lim, **outcome):
+    lim.acquire()
+    lim.release(**outcome)
+
+
+def test_initial_limit_is_clamped():
+    assert limiter(initial=0).limit == 1
+    assert limiter(initial=50).limit == 8
+
+
+def test_throttle_halves_the_limit_down_to_the_minimum():
+    lim = limiter(initial=8, minimum=2)
+    for expected in (4, 2, 2):
+        call(lim, throttled=True, retry_after=0)
+        assert lim.limit == expected
+
+
+def test_slow_call_drops_the_limit_by_one():
+    lim = limiter(initial=3)
+    call(lim, latency=5.0)
+    assert lim.limit == 2
+
+
+def test_limit_grows_after_limit_fast_successes():
+    lim = limiter(initial=2, maximum=3)
+    call(lim, latency=0.1)
+    assert lim.limit == 2
+    call(lim, latency=0.1)
+    assert lim.limit == 3
+    for _ in range(6):
+        call(lim, latency=0.1)
+    assert lim.limit == 3
+
+
+def test_slow_call_resets_the_success_streak():
+    lim = limiter(initial=3)
+    call(lim, latency=0.1)
+    call(lim, latency=0.1)
+    call(lim, latency=5.0)
+    call(lim, latency=0.1)
+    assert lim.limit == 2
+
+
+def test_failed_call_without_latency_leaves_the_limit():
+    lim = limiter(initial=3)
+    call(lim)
+    assert lim.limit == 3
+    assert lim.active == 0
+
+
+def test_acquire_blocks_at_the_limit():
+    lim = limiter(initial=1)
+    lim.acquire()
+    acquired = threading.Event()
+
+    def worker():
+        lim.acquire()
+        acquired.set()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    assert not acquired.wait(0.1)
+    lim.release(latency=0.1)
+    assert acquired.wait(1)
+    thread.join()
+
+
+def test_throttle_pauses_new_calls_for_retry_after():
+    lim = limiter()
+    call(lim, throttled=True, retry_after=0.2)
+    start = time.monotonic()
+    lim.acquire()
+    assert time.monotonic() - start >= 0.15
+
+
+def test_retry_after_header():
+    error = SimpleNamespace(response=SimpleNamespace(headers={"retry-after": "3"}))
+    assert _retry_after(error) == 3.0
+    assert _retry_after(ValueError()) is None
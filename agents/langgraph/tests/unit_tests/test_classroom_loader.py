@@ -0,0 +1,48 @@
+import pytest
+
+from tools import classroom_loader
+from tools.classroom_loader import ClassroomLoader
+
+
+class FakeClassroom:
+    def __init__(self):
+        self.calls = []
+
+    def list_coursework(self, course_id):
+        self.calls.append(course_id)
+        return [{"id": f"{course_id}-work"}]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(classroom_loader.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_results_are_cached_until_the_ttl(clock):
+    classroom = FakeClassroom()
+    loader = ClassroomLoader(classroom, ttl=10)
+    loader.coursework("u", ["c1"])
+    loader.coursework("u", ["c1"])
+    assert classroom.calls == ["c1"]
+
+    clock[0] += 11
+    loader.coursework("u", ["c1"])
+    assert classroom.calls == ["c1", "c1"]
+
+
+def test_expired_entries_are_pruned_on_insert(clock):
+    loader = ClassroomLoader(FakeClassroom(), ttl=10)
+    loader.coursework("u", ["c1", "c2"])
+    clock[0] += 11
+    loader.coursework("u", ["c3"])
+    assert loader.metrics()["entries"] == 1
+
+
+def test_cache_is_bounded(clock):
+    loader = ClassroomLoader(FakeClassroom(), ttl=10, max_entries=3)
+    for course_id in ["c1", "c2", "c3", "c4", "c5"]:
+        loader.coursework("u", [course_id])
+    assert loader.metrics()["entries"] == 3
+    assert [key[2] for key in loader._cache] == [("c3",), ("c4",), ("c5",)]
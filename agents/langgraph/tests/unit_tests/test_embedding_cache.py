@@ -0,0 +1,45 @@
+from langchain_core.embeddings import Embeddings
+
+from tools import embedding_cache
+from tools.embedding_cache import CachedEmbeddings
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.documents = []
+        self.queries = []
+
+    def embed_documents(self, texts):
+        self.documents.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return [float(len(text)), 0.0]
+
+
+def test_documents_are_embedded_once(tmp_path):
+    inner = CountingEmbeddings()
+    cached = CachedEmbeddings(inner, model="m", path=tmp_path / "cache.sqlite3")
+    assert cached.embed_documents(["ab", "abc", "ab"]) == [[2.0, 1.0], [3.0, 1.0], [2.0, 1.0]]
+    assert cached.embed_documents(["abc"]) == [[3.0, 1.0]]
+    assert inner.documents == ["ab", "abc"]
+
+    reopened = CachedEmbeddings(inner, model="m", path=tmp_path / "cache.sqlite3")
+    reopened.embed_documents(["ab"])
+    assert inner.documents == ["ab", "abc"]
+
+
+def test_queries_are_not_persisted(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_cache, "EMBEDDING_QUERY_CACHE_SIZE", 2)
+    inner = CountingEmbeddings()
+    cached = CachedEmbeddings(inner, model="m", path=tmp_path / "cache.sqlite3")
+
+    assert cached.embed_query("what is a vector") == [16.0, 0.0]
+    cached.embed_query("what is a vector")
+    cached.embed_query("q2")
+    cached.embed_query("q3")
+    cached.embed_query("what is a vector")
+    assert inner.queries == ["what is a vector", "q2", "q3", "what is a vector"]
+    assert inner.documents == []
+    assert cached._lookup([cached._hash("what is a vector")]) == {}
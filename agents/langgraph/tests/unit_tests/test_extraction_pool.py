@@ -0,0 +1,51 @@
+import os
+import time
+
+import pytest
+
+from tools.extraction_pool import ExtractionPool, PDFExtractionError
+
+
+@pytest.fixture
+def pool():
+    pool = ExtractionPool(workers=2, timeout=2, poll_interval=0.1)
+    yield pool
+    pool.shutdown()
+
+
+def test_returns_results(pool):
+    assert pool.result(pool.submit(divmod, 7, 2), "a.pdf") == (3, 1)
+
+
+def test_worker_exceptions_propagate(pool):
+    with pytest.raises(ZeroDivisionError):
+        pool.result(pool.submit(divmod, 1, 0), "a.pdf")
+
+
+def test_timeout_counts_from_task_start(pool):
+    # Two slow tasks hold both workers; the queued third must not time out
+    # just because it waited for a free worker for longer than the timeout.
+    slow = [pool.submit(time.sleep, 1.5) for _ in range(2)]
+    queued = pool.submit(time.sleep, 1.5)
+    for task in slow:
+        pool.result(task, "slow.pdf")
+    assert pool.result(queued, "queued.pdf") is None
+
+
+def test_overrunning_task_fails_alone(pool):
+    hung = pool.submit(time.sleep, 30)
+    other = pool.submit(time.sleep, 2.5)
+    start = time.monotonic()
+    with pytest.raises(PDFExtractionError, match="timed out"):
+        pool.result(hung, "hung.pdf")
+    assert time.monotonic() - start < 10
+    # The other task's deadline is its own; the pool survives and replaces the worker.
+    with pytest.raises(PDFExtractionError, match="timed out"):
+        pool.result(other, "other.pdf")
+    assert pool.result(pool.submit(divmod, 9, 4), "next.pdf") == (2, 1)
+
+
+def test_crashed_worker_fails_its_task(pool):
+    with pytest.raises(PDFExtractionError, match="crashed"):
+        pool.result(pool.submit(os._exit, 1), "crash.pdf")
+    assert pool.result(pool.submit(divmod, 9, 4), "next.pdf") == (2, 1)
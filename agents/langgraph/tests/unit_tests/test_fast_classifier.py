@@ -0,0 +1,136 @@
+import pytest
+
+from agents.router.fast_classifier import CentroidModel, FastRouteClassifier
+
+
+class FakeModel:
+    def __init__(self, category, confidence):
+        self.category = category
+        self.confidence = confidence
+
+    def predict(self, text):
+        if isinstance(self.category, Exception):
+            raise self.category
+        return self.category, self.confidence
+
+
+@pytest.fixture
+def classifier():
+    return FastRouteClassifier(model=None)
+
+
+@pytest.mark.parametrize(
+    "query, category",
+    [
+        ("Send a reply to my manager", "work"),
+        ("Do I have any unread emails?", "work"),
+        ("Read me my email drafts", "work"),
+        ("What meetings are on my calendar today?", "work"),
+        ("When is my next exam?", "study"),
+        ("Make me a study plan for the weekend", "study"),
+        ("Tell me a joke", "personal"),
+        ("Change your language to Spanish", "setting"),
+        ("Ask Eureka about my courses", "study"),
+        ("Switch the language to Arabic", "setting"),
+        ("Can you update my preferences to a formal tone?", "setting"),
+        ("Delete my dentist appointment on Friday", "work"),
+    ],
+)
+def test_confident_rule_matches(classifier, query, category):
+    result = classifier.classify(query)
+    assert result.category == category
+    assert result.is_confident()
+
+
+@pytest.mark.parametrize("query", ["send the email to my teacher", "Send the draft", "send it"])
+def test_send_shortcut_is_absolute(classifier, query):
+    result = classifier.classify(query)
+    assert (result.category, result.confidence) == ("work", 1.0)
+
+
+def test_weak_rule_is_not_confident(classifier):
+    result = classifier.classify("explain photosynthesis")
+    assert result.category == "study"
+    assert not result.is_confident()
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "What events led to WW1?",
+        "Which course of action is best here?",
+        "I'm cramming for finals",
+        "Book a meeting room",
+        "Where should we go for lunch?",
+        "help me draft my essay introduction",
+        "Can you change the tone of my essay to be more formal?",
+        "How do I set the voice in my presentation?",
+        "change the language of this sentence to French",
+        "Explain how to send data over a socket in my networking course",
+        "send my homework to the teacher",
+        "What is a calendar in the Roman era?",
+        "Which descendants of Charlemagne ruled France?",
+    ],
+)
+def test_ambiguous_single_word_falls_through(classifier, query):
+    assert not classifier.classify(query).is_confident()
+
+
+def test_competing_rules_cancel_out(classifier):
+    result = classifier.classify("tell me a joke about my homework")
+    assert result.confidence == pytest.approx(0.0)
+    assert not result.is_confident()
+
+
+def test_no_match(classifier):
+    for query in ("hello there", "", None):
+        result = classifier.classify(query)
+        assert result.category is None
+        assert result.confidence == 0.0
+        assert not result.is_confident()
+
+
+def test_model_agreement_combines_confidence():
+    result = FastRouteClassifier(model=FakeModel("study", 0.5)).classify("explain photosynthesis")
+    assert result.category == "study"
+    assert result.source == "rules+model"
+    assert result.confidence == pytest.approx(1 - 0.25 * 0.5)
+
+
+def test_model_disagreement_discounts_stronger_signal():
+    result = FastRouteClassifier(model=FakeModel("personal", 0.9)).classify("explain photosynthesis")
+    assert (result.category, result.source) == ("personal", "model")
+    assert result.confidence == pytest.approx(0.15)
+
+    result = FastRouteClassifier(model=FakeModel("personal", 0.5)).classify("When is my next exam?")
+    assert (result.category, result.source) == ("study", "rules")
+    assert result.confidence == pytest.approx(0.4)
+
+
+def test_model_is_skipped_for_absolute_rules():
+    result = FastRouteClassifier(model=FakeModel("personal", 0.99)).classify("send it")
+    assert (result.category, result.confidence) == ("work", 1.0)
+
+
+@pytest.mark.parametrize("model", [FakeModel("unknown", 0.99), FakeModel(RuntimeError("boom"), 0.0)])
+def test_invalid_or_failing_model_falls_back_to_rules(model):
+    result = FastRouteClassifier(model=model).classify("When is my next exam?")
+    assert (result.category, result.source) == ("study", "rules")
+    assert result.confidence == pytest.approx(0.9)
+
+
+def test_centroid_model_round_trip(tmp_path):
+    model = CentroidModel.train([
+        ("check my inbox", "work"),
+        ("reply to this email", "work"),
+        ("solve this algebra problem", "study"),
+        ("help with my algebra homework", "study"),
+    ])
+    category, confidence = model.predict("any new email in my inbox")
+    assert category == "work"
+    assert 0.5 < confidence <= 1.0
+
+    path = tmp_path / "model.json"
+    model.save(path)
+    assert CentroidModel.load(path).predict("algebra homework") == model.predict("algebra homework")
+    assert model.predict("zzz") == (None, 0.0)
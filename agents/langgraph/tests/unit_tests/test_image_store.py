@@ -0,0 +1,47 @@
+import base64
+import io
+
+from PIL import Image, ImageDraw
+
+from tools.image_store import ImageStore
+
+
+def encode(image: Image.Image, fmt: str = "PNG") -> str:
+    out = io.BytesIO()
+    image.save(out, format=fmt)
+    return base64.b64encode(out.getvalue()).decode("ascii")
+
+
+def figure(size=(200, 120), text_box=(20, 20, 180, 100)) -> Image.Image:
+    image = Image.new("RGB", size, "white")
+    ImageDraw.Draw(image).rectangle(text_box, outline="black", width=2)
+    return image
+
+
+def test_exact_duplicates_share_a_key_across_documents(tmp_path):
+    store = ImageStore(tmp_path)
+    first, new = store.put(encode(figure()))
+    second, again = store.put(encode(figure()))
+    assert (second, new, again) == (first, True, False)
+    assert store.stats()["references"] == 2
+
+
+def test_near_duplicates_only_match_given_candidates(tmp_path):
+    store = ImageStore(tmp_path)
+    original = figure()
+    key, _ = store.put(encode(original))
+
+    same_document, new = store.put(encode(original.convert("L")), candidates=[key])
+    assert (same_document, new) == (key, False)
+    # The stored bytes are the first image's, which is what gets summarized.
+    assert base64.b64decode(store.load(key)) == base64.b64decode(encode(original))
+
+    other_document, new = store.put(encode(original, "JPEG"))
+    assert new and other_document != key
+
+
+def test_near_duplicates_need_the_same_dimensions(tmp_path):
+    store = ImageStore(tmp_path)
+    big, _ = store.put(encode(figure()))
+    small, new = store.put(encode(figure((100, 60), (10, 10, 90, 50))), candidates=[big])
+    assert new and small != big
@@ -0,0 +1,74 @@
+import pytest
+
+from agents import shared_memory
+from agents.shared_memory import MemoryCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(shared_memory.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_get_returns_copy_and_counts(clock):
+    cache = MemoryCache(max_users=4, ttl=60)
+    assert cache.get("u1") is None
+    cache.set("u1", ["a", "b"])
+    lines = cache.get("u1")
+    assert lines == ["a", "b"]
+    lines.append("c")
+    assert cache.get("u1") == ["a", "b"]
+    assert cache.metrics()["hits"] == 2
+    assert cache.metrics()["misses"] == 1
+    assert cache.metrics()["hit_ratio"] == pytest.approx(2 / 3)
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = MemoryCache(max_users=4, ttl=60)
+    cache.set("u1", ["a"])
+    clock[0] += 59
+    assert cache.get("u1") == ["a"]
+    clock[0] += 2
+    assert cache.get("u1") is None
+    assert cache.metrics()["expirations"] == 1
+    assert cache.metrics()["size"] == 0
+
+
+def test_least_recently_used_user_is_evicted(clock):
+    cache = MemoryCache(max_users=2, ttl=60)
+    cache.set("u1", ["a"])
+    cache.set("u2", ["b"])
+    cache.get("u1")
+    cache.set("u3", ["c"])
+    assert cache.get("u2") is None
+    assert cache.get("u1") == ["a"]
+    assert cache.get("u3") == ["c"]
+    assert cache.metrics()["evictions"] == 1
+
+
+def test_prepend_writes_through_only_to_cached_users(clock):
+    cache = MemoryCache(max_users=4, ttl=60)
+    cache.prepend("u1", "new")
+    assert cache.get("u1") is None
+
+    cache.set("u2", ["old1", "old2"])
+    cache.prepend("u2", "new", max_lines=2)
+    assert cache.get("u2") == ["new", "old1"]
+
+
+def test_prepend_keeps_the_original_expiry(clock):
+    cache = MemoryCache(max_users=4, ttl=60)
+    cache.set("u1", ["a"])
+    clock[0] += 50
+    cache.prepend("u1", "b")
+    clock[0] += 11
+    assert cache.get("u1") is None
+
+
+def test_invalidate(clock):
+    cache = MemoryCache(max_users=4, ttl=60)
+    cache.set("u1", ["a"])
+    cache.invalidate("u1")
+    cache.invalidate("missing")
+    assert cache.get("u1") is None
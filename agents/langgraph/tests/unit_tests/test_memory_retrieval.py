@@ -0,0 +1,63 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from agents.shared_memory import MemoryIndex, SharedMemoryManager
+
+TOPICS = ["calculus", "chemistry", "history", "poetry"]
+
+
+class TopicEmbeddings:
+    """One axis per topic, so similarity is 1 for the matching topic and 0 otherwise."""
+
+    def _embed(self, text):
+        return [float(topic in text) for topic in TOPICS]
+
+    async def aembed_query(self, text):
+        return self._embed(text)
+
+    async def aembed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = SharedMemoryManager()
+    index = MemoryIndex(max_users=2)
+    monkeypatch.setattr(index, "_get_embeddings", lambda: TopicEmbeddings())
+    monkeypatch.setattr(manager, "backend_url", "http://backend")
+    monkeypatch.setattr(manager, "index", index)
+    # Newest first, as _load_lines returns them.
+    manager.cache.set("7", [
+        "User: poetry homework tomorrow",
+        "User: history essay outline",
+        "User: chemistry lab report",
+        "User: calculus limits",
+    ])
+    yield manager
+    manager.cache.invalidate("7")
+
+
+def test_retrieve_ranks_by_relevance(manager):
+    memory = asyncio.run(manager.retrieve("7", "help with calculus", k=1))
+    assert memory == "User: calculus limits"
+
+
+def test_retrieve_returns_selected_memos_newest_first(manager):
+    memory = asyncio.run(manager.retrieve("7", "chemistry and calculus", k=2))
+    assert memory.splitlines() == ["User: chemistry lab report", "User: calculus limits"]
+
+
+def test_retrieve_respects_token_budget(manager):
+    # Each line costs about 6 tokens, so only the best match fits.
+    memory = asyncio.run(manager.retrieve("7", "calculus", k=4, token_budget=6))
+    assert memory == "User: calculus limits"
+
+
+def test_index_stores_float32_unit_vectors(manager):
+    asyncio.run(manager.retrieve("7", "calculus"))
+    vectors = manager.index._vectors["7"]
+    assert len(vectors) == 4
+    assert all(v.dtype == np.float32 for v in vectors.values())
+    assert all(np.linalg.norm(v) == pytest.approx(1.0) for v in vectors.values())
@@ -0,0 +1,25 @@
+import asyncio
+
+from agents.shared_memory import SharedMemoryManager
+
+
+def test_full_write_queue_drops_instead_of_blocking(monkeypatch):
+    manager = SharedMemoryManager()
+    monkeypatch.setattr(manager, "backend_url", "http://backend")
+    monkeypatch.setattr(manager, "_ensure_writer", lambda: None)
+    monkeypatch.setattr(manager, "write_stats", dict.fromkeys(manager.write_stats, 0))
+    manager.cache.set("7", [])
+
+    async def run():
+        monkeypatch.setattr(manager, "_write_queue", asyncio.Queue(maxsize=1))
+        await asyncio.wait_for(manager.extract_and_save("q1", "7", ai_response="a1"), 1)
+        await asyncio.wait_for(manager.extract_and_save("q2", "7", ai_response="a2"), 1)
+        return manager._write_queue.qsize()
+
+    assert asyncio.run(run()) == 1
+    assert manager.write_stats["enqueued"] == 1
+    assert manager.write_stats["dropped"] == 1
+    # Only the memo that will actually be written is written through to the cache.
+    lines = manager.cache.get("7")
+    assert len(lines) == 1 and "q1" in lines[0]
+    manager.cache.invalidate("7")
@@ -0,0 +1,44 @@
+import pytest
+
+from tools import pdf_partition
+from tools.pdf_partition import FAST, HI_RES, OCR_ONLY, plan_ranges
+
+
+@pytest.fixture(autouse=True)
+def thresholds(monkeypatch):
+    monkeypatch.setattr(pdf_partition, "SCAN_SPLIT_MIN_PAGES", 6)
+    monkeypatch.setattr(pdf_partition, "SCAN_MIN_RANGE_PAGES", 3)
+
+
+def test_empty_document():
+    assert plan_ranges([]) == []
+
+
+def test_short_document_is_one_range_at_the_strongest_strategy():
+    assert plan_ranges([FAST, HI_RES, FAST]) == [(1, 3, HI_RES)]
+
+
+def test_long_runs_keep_their_strategies():
+    assert plan_ranges([FAST] * 5 + [HI_RES] * 4 + [OCR_ONLY] * 3) == [
+        (1, 5, FAST), (6, 9, HI_RES), (10, 12, OCR_ONLY),
+    ]
+
+
+def test_short_stronger_run_does_not_upgrade_a_long_neighbour():
+    assert plan_ranges([OCR_ONLY] + [FAST] * 99) == [(1, 1, OCR_ONLY), (2, 100, FAST)]
+    assert plan_ranges([FAST] * 99 + [HI_RES]) == [(1, 99, FAST), (100, 100, HI_RES)]
+
+
+def test_short_weaker_run_is_absorbed_into_a_stronger_neighbour():
+    assert plan_ranges([HI_RES] * 10 + [FAST] + [HI_RES] * 10) == [(1, 21, HI_RES)]
+
+
+def test_absorbing_prefers_the_weakest_sufficient_neighbour():
+    assert plan_ranges([OCR_ONLY] * 10 + [FAST] + [HI_RES] * 10) == [(1, 10, OCR_ONLY), (11, 21, HI_RES)]
+
+
+def test_adjacent_short_runs_combine():
+    assert plan_ranges([FAST] * 10 + [HI_RES, FAST, HI_RES] + [FAST] * 10) == [
+        (1, 10, FAST), (11, 13, HI_RES), (14, 23, FAST),
+    ]
+    assert plan_ranges([HI_RES] * 10 + [FAST, HI_RES] + [OCR_ONLY] * 10) == [(1, 12, HI_RES), (13, 22, OCR_ONLY)]
@@ -8,6 +8,8 @@ class Settings:
     LANGSMITH_API_KEY = os.getenv("LANGSMITH_API_KEY")
     LANGCHAIN_PROJECT = os.getenv("LANGCHAIN_PROJECT", "voicera-langgraph")
     LANGCHAIN_TRACING_V2 = os.getenv("LANGCHAIN_TRACING_V2", "true")
+    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    GRAPH_WARMUP = os.getenv("GRAPH_WARMUP", "true").lower() == "true"
 
 DEFAULT_MAX_TRIALS = 3
 DEFAULT_STUDENT_ID = "default_student"
@@ -23,6 +25,16 @@ VOICE_MAPPING = {
     "gmail": "onyx",
     "calendar": "onyx",
 }
+TTS_CHUNK_SIZE = int(os.getenv("TTS_CHUNK_SIZE", "4096"))
+TTS_HTTP_MAX_CONNECTIONS = int(os.getenv("TTS_HTTP_MAX_CONNECTIONS", "20"))
+TTS_HTTP_MAX_KEEPALIVE = int(os.getenv("TTS_HTTP_MAX_KEEPALIVE", "10"))
+TTS_CACHE_ENABLED = os.getenv("TTS_CACHE_ENABLED", "true").lower() == "true"
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", str(Path(__file__).parent / ".tts_cache"))
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+TTS_CACHE_LEASE_SECONDS = float(os.getenv("TTS_CACHE_LEASE_SECONDS", "300"))
+TTS_PIPELINE_MIN_CHARS = int(os.getenv("TTS_PIPELINE_MIN_CHARS", "600"))
+TTS_PIPELINE_CHUNK_CHARS = int(os.getenv("TTS_PIPELINE_CHUNK_CHARS", "400"))
+TTS_PIPELINE_CONCURRENCY = int(os.getenv("TTS_PIPELINE_CONCURRENCY", "3"))
 HEADERS= {
     "Authorization": f"Bearer {Settings.OPENAI_API_KEY}",
     "Content-Type": "application/json",
@@ -31,6 +43,25 @@ HEADERS= {
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 OPENAI_API_URL = "https://api.openai.com/v1/chat/completions"
 MODEL= "gpt-4o"
+IMAGE_DESCRIBE_CONCURRENCY = int(os.getenv("IMAGE_DESCRIBE_CONCURRENCY", "4"))
+IMAGE_DESCRIBE_QUEUE_TIMEOUT = float(os.getenv("IMAGE_DESCRIBE_QUEUE_TIMEOUT", "10"))
+IMAGE_DESCRIBE_TIMEOUT = float(os.getenv("IMAGE_DESCRIBE_TIMEOUT", "60"))
+IMAGE_CACHE_ENABLED = os.getenv("IMAGE_CACHE_ENABLED", "true").lower() == "true"
+IMAGE_CACHE_DB = os.getenv("IMAGE_CACHE_DB", str(Path(__file__).parent / ".image_cache" / "descriptions.sqlite3"))
+IMAGE_CACHE_MAX_ENTRIES = int(os.getenv("IMAGE_CACHE_MAX_ENTRIES", "5000"))
+IMAGE_MAX_UPLOAD_BYTES = int(os.getenv("IMAGE_MAX_UPLOAD_BYTES", str(20 * 1024 * 1024)))
+# The vision model scales high-detail images to fit 2048x2048, then to 768 on the short side.
+IMAGE_MAX_LONG_SIDE = int(os.getenv("IMAGE_MAX_LONG_SIDE", "2048"))
+IMAGE_MAX_SHORT_SIDE = int(os.getenv("IMAGE_MAX_SHORT_SIDE", "768"))
+IMAGE_OUTPUT_FORMAT = os.getenv("IMAGE_OUTPUT_FORMAT", "JPEG").upper()
+IMAGE_OUTPUT_QUALITY = int(os.getenv("IMAGE_OUTPUT_QUALITY", "85"))
+
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+SEMANTIC_CACHE_TTL = float(os.getenv("SEMANTIC_CACHE_TTL", "3600"))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "500"))
+SEMANTIC_CACHE_EMBEDDING_MODEL = os.getenv("SEMANTIC_CACHE_EMBEDDING_MODEL", "text-embedding-3-small")
+SEMANTIC_CACHE_CATEGORIES = set(os.getenv("SEMANTIC_CACHE_CATEGORIES", "study").split(","))
 
 
 settings = Settings()
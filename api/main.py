@@ -1,3 +1,5 @@
+import asyncio
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,10 +10,18 @@ load_dotenv()
 from routes.ai_routes import router as ai_router
 from routes.tts_routes import router as tts_router
 from routes.health_routes import router as health_router
+from routes.ingestion_routes import router as ingestion_router
 from routes import image
+from config import settings
+from services.ai_service import warm_up
+from services import tts_service, img_txt_service
+from services.image_preprocess import UploadSizeLimit
+from agents.shared_memory import shared_memory
 
 app = FastAPI(title="Voicera API")
 
+# Added before CORS so the early 413 still carries CORS headers.
+app.add_middleware(UploadSizeLimit, path="/image/describe")
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -23,8 +33,33 @@ app.add_middleware(
 app.include_router(ai_router, prefix="/api")
 app.include_router(tts_router, prefix="/api")
 app.include_router(health_router)
+app.include_router(ingestion_router, prefix="/api")
 app.include_router(image.router)
 
 
+@app.on_event("startup")
+async def startup():
+    await shared_memory.startup()
+    if settings.GRAPH_WARMUP:
+        app.state.warmup_task = asyncio.create_task(warm_up())
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    # Stop a warm-up that is still running before tearing down what it uses.
+    warmup_task = getattr(app.state, "warmup_task", None)
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+        try:
+            await warmup_task
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"Warm-up failed during shutdown: {e}")
+    await shared_memory.shutdown()
+    await tts_service.shutdown()
+    await img_txt_service.shutdown()
+
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,9 +1,19 @@
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from models import StudentQuestion, AIResponse
-from services.ai_service import process_question
+from services.ai_service import process_question, stream_question
 
 router = APIRouter()
 
 @router.post("/ask-anything", response_model=AIResponse)
 async def ask_anything(query: StudentQuestion):
     return await process_question(query)
+
+
+@router.post("/ask-anything/stream")
+async def ask_anything_stream(query: StudentQuestion):
+    return StreamingResponse(
+        stream_question(query),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,8 +1,48 @@
+import asyncio
+
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from models import HealthResponse
+from agents.shared_memory import shared_memory
+from services.response_cache import response_cache
+from services.tts_cache import tts_cache
+from services.image_cache import image_cache
 
 router = APIRouter()
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
     return {"status": "healthy", "message": "Voicera API is running"}
+
+
+@router.get("/health/memory")
+async def memory_metrics():
+    return {
+        "http": shared_memory.http_metrics(),
+        "cache": shared_memory.cache.metrics(),
+        "index": shared_memory.index.stats,
+        "writes": shared_memory.write_metrics(),
+    }
+
+
+@router.get("/health/response-cache")
+async def response_cache_metrics():
+    return response_cache.metrics()
+
+
+@router.get("/health/tts-cache")
+async def tts_cache_metrics():
+    return tts_cache.metrics()
+
+
+@router.get("/health/image-cache")
+async def image_cache_metrics():
+    return image_cache.metrics()
+
+
+@router.get("/health/vector-store")
+async def vector_store_health():
+    from tools.vector_store import get_vector_store
+
+    report = await asyncio.to_thread(get_vector_store().health)
+    return JSONResponse(report, status_code=200 if report["status"] == "ok" else 503)
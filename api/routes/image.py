@@ -1,34 +1,75 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+import asyncio
+
+import httpx
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request
 from dotenv import load_dotenv
-import os
 
 load_dotenv()
 
-from services.img_txt_service import describe_image_bytes
+from services.img_txt_service import ImageServiceBusy, describe_image_bytes
+from services.image_preprocess import InvalidImage, UploadTooLarge, measure_upload, prepare_image
 
 router = APIRouter(prefix="/image", tags=["Image"])
 
+DISCONNECT_POLL_INTERVAL = 0.5
+
+
+async def run_until_disconnected(request: Request, coro):
+    """Await ``coro``, cancelling it if the client goes away first."""
+    task = asyncio.create_task(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                raise HTTPException(status_code=499, detail="Client closed request")
+    finally:
+        if not task.done():
+            task.cancel()
+
+
 @router.post("/describe")
-async def describe_image(file: UploadFile = File(...)):
+async def describe_image(request: Request, file: UploadFile = File(...)):
     if not file.content_type.startswith("image/"):
         raise HTTPException(
             status_code=400,
             detail=f"Only images are supported, received {file.content_type}"
         )
 
-    image_bytes = await file.read()
+    try:
+        bytes_before = await measure_upload(file)
+        prepared = await asyncio.to_thread(prepare_image, file.file, bytes_before)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except InvalidImage as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    print(
+        f"Image preprocessed: {prepared.bytes_before} -> {prepared.bytes_after} bytes, "
+        f"{prepared.original_size} -> {prepared.size} in {prepared.elapsed_ms:.0f} ms"
+    )
 
     try:
-        description = describe_image_bytes(
-            image_bytes=image_bytes,
-            content_type=file.content_type
+        description = await run_until_disconnected(
+            request,
+            describe_image_bytes(
+                image_bytes=prepared.data,
+                content_type=prepared.content_type
+            ),
         )
+    except HTTPException:
+        raise
+    except ImageServiceBusy as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except httpx.TimeoutException:
+        raise HTTPException(status_code=504, detail="Image description timed out")
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=str(e)
         )
     return {
-        "description": description
-    }
\ No newline at end of file
+        "description": description,
+        "image": prepared.report(),
+    }
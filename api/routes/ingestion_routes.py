@@ -0,0 +1,59 @@
+import asyncio
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+
+from tools.ingestion import get_ingestion_service
+
+router = APIRouter(prefix="/ingestion", tags=["Ingestion"])
+
+
+class IngestionRequest(BaseModel):
+    course_ids: Optional[List[str]] = None
+    student_id: Optional[str] = None
+    retry_failed: bool = False
+    reindex: bool = False
+    # Removes indexed materials missing from the listing; only valid for the
+    # service account's (teacher/admin) listing, not a single student's view.
+    remove_missing: bool = False
+
+
+@router.post("/jobs")
+async def trigger_ingestion(request: IngestionRequest):
+    if request.remove_missing and request.student_id:
+        raise HTTPException(status_code=400, detail="remove_missing cannot be used with a student's course listing")
+    service = await asyncio.to_thread(get_ingestion_service)
+    job = await asyncio.to_thread(
+        service.submit,
+        request.student_id,
+        request.course_ids,
+        None,
+        request.retry_failed,
+        request.reindex,
+        request.remove_missing,
+    )
+    if job is None:
+        return {"queued": 0, "job": None}
+    return {"queued": len(job.material_ids), "job": service.job(job.job_id)}
+
+
+@router.get("/jobs")
+async def list_jobs():
+    service = await asyncio.to_thread(get_ingestion_service)
+    return {"jobs": service.jobs(), "metrics": service.metrics()}
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    service = await asyncio.to_thread(get_ingestion_service)
+    job = service.job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown ingestion job {job_id}")
+    return job
+
+
+@router.get("/materials")
+async def list_materials(course_id: Optional[str] = None):
+    service = await asyncio.to_thread(get_ingestion_service)
+    return {"materials": service.materials(course_id)}
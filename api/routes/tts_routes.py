@@ -1,8 +1,14 @@
-from fastapi import APIRouter, HTTPException, Response
+from fastapi import APIRouter, Header
 from services.tts_service import generate_tts
 
 router = APIRouter()
 
 @router.get("/tts")
-async def text_to_speech(text: str, voice: str = "alloy", category: str | None = None):
-    return await generate_tts(text, voice, category)
+async def text_to_speech(
+    text: str,
+    voice: str = "alloy",
+    category: str | None = None,
+    pipeline: bool | None = None,
+    range_header: str | None = Header(default=None, alias="Range"),
+):
+    return await generate_tts(text, voice, category, range_header, pipeline)
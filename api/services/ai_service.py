@@ -1,7 +1,8 @@
+import asyncio
 import os
 import sys
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator
 
 from models import StudentQuestion, AIResponse
 from utils.response_extractor import (
@@ -9,15 +10,21 @@ from utils.response_extractor import (
     extract_recommendations,
     extract_emotion,
 )
+from utils.sse import StreamedAnswer, format_sse
 
 langgraph_src = Path(__file__).parent.parent.parent / "agents" / "langgraph" / "src"
 sys.path.insert(0, str(langgraph_src))
-from agents.router.router_graph import graph
+from agents.model import ANSWER_TAG
+from agents.router.router_graph import graph, warm_subgraphs
+from agents.shared_memory import shared_memory
+from config import SEMANTIC_CACHE_ENABLED
+from services.response_cache import CacheLookup, response_cache
 
 
 DEFAULT_MAX_TRIALS = 3
 
-def build_initial_state(query: StudentQuestion) -> dict:
+def build_initial_state(query: StudentQuestion, shared_answer: bool = False) -> dict:
+    """Graph input for ``query``; a ``shared_answer`` is built without the student's memories."""
     return {
         "courses": [],
         "courseworks": [],
@@ -42,17 +49,108 @@ def build_initial_state(query: StudentQuestion) -> dict:
         "category": None,
         "messages": [],
         "study_plan": None,
+        "shared_answer": shared_answer,
     }
 
 
+async def warm_up() -> None:
+    """Open the vector store and build the agent subgraphs ahead of the first request."""
+    # Imported here: chromadb is slow to import and the app should start without it.
+    from tools.vector_store import get_vector_store
+
+    await asyncio.to_thread(get_vector_store().warm_up)
+    await warm_subgraphs()
+
+
+async def save_cached_turn(query: StudentQuestion, lookup: CacheLookup) -> None:
+    """Record a turn answered from the response cache in memory, as the graph would have."""
+    if query.student_id:
+        await shared_memory.extract_and_save(
+            query=query.question,
+            ai_response=lookup.hit.response,
+            user_id=query.student_id,
+            category=lookup.category,
+        )
+
+
 async def process_question(query: StudentQuestion) -> AIResponse:
-    initial_state = build_initial_state(query)
+    lookup = await response_cache.lookup(query) if SEMANTIC_CACHE_ENABLED else None
+    if lookup is not None and lookup.hit is not None:
+        await save_cached_turn(query, lookup)
+        return lookup.hit
+
+    initial_state = build_initial_state(query, shared_answer=lookup is not None)
     
     result = await graph.ainvoke(
         initial_state,
         {"configurable": {"thread_id": str(initial_state["student_id"])}},
     )
     
+    response = build_response(query, result)
+    if lookup is not None:
+        response_cache.store(lookup, response, result)
+    return response
+
+
+async def stream_question(query: StudentQuestion) -> AsyncIterator[str]:
+    """Run the graph and yield SSE events: node progress, answer tokens, then the final AIResponse.
+
+    When another answer run starts streaming after one already has (the
+    verify/rewrite loop regenerating a rejected draft), a ``reset`` event tells
+    the client to discard the tokens of the earlier run.
+    """
+    lookup = await response_cache.lookup(query) if SEMANTIC_CACHE_ENABLED else None
+    if lookup is not None and lookup.hit is not None:
+        await save_cached_turn(query, lookup)
+        yield format_sse("final", lookup.hit.model_dump())
+        return
+
+    initial_state = build_initial_state(query, shared_answer=lookup is not None)
+    config = {"configurable": {"thread_id": str(initial_state["student_id"])}}
+
+    root_run_id = None
+    final_state = None
+    answers: Dict[str, StreamedAnswer] = {}
+    streaming_run_id = None
+    try:
+        async for event in graph.astream_events(initial_state, config, version="v2"):
+            kind = event["event"]
+            if root_run_id is None and kind == "on_chain_start":
+                root_run_id = event["run_id"]
+
+            node = event.get("metadata", {}).get("langgraph_node")
+            if kind in ("on_chain_start", "on_chain_end") and node and event["name"] == node:
+                status = "started" if kind == "on_chain_start" else "finished"
+                yield format_sse("progress", {"node": node, "status": status})
+            elif kind == "on_chat_model_stream" and ANSWER_TAG in event.get("tags", []):
+                chunk = event["data"]["chunk"]
+                answer = answers.setdefault(event["run_id"], StreamedAnswer("response"))
+                text = answer.feed(
+                    content=chunk.content if isinstance(chunk.content, str) else "",
+                    tool_args="".join(tc.get("args") or "" for tc in chunk.tool_call_chunks),
+                )
+                if text:
+                    if streaming_run_id not in (None, event["run_id"]):
+                        yield format_sse("reset", {"node": node, "run_id": streaming_run_id})
+                    streaming_run_id = event["run_id"]
+                    yield format_sse("token", {"node": node, "run_id": event["run_id"], "text": text})
+            elif kind == "on_chain_end" and event["run_id"] == root_run_id:
+                final_state = event["data"].get("output")
+    except Exception as e:
+        yield format_sse("error", {"detail": str(e)})
+        return
+
+    if not isinstance(final_state, dict):
+        yield format_sse("error", {"detail": "Graph finished without a final state"})
+        return
+
+    response = build_response(query, final_state)
+    if lookup is not None:
+        response_cache.store(lookup, response, final_state)
+    yield format_sse("final", response.model_dump())
+
+
+def build_response(query: StudentQuestion, result: Dict[str, Any]) -> AIResponse:
     return AIResponse(
         question=query.question,
         response=extract_ai_response(result),
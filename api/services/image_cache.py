@@ -0,0 +1,114 @@
+import hashlib
+import io
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from PIL import Image
+
+from config import IMAGE_CACHE_DB, IMAGE_CACHE_MAX_ENTRIES, MODEL
+
+
+def pixel_digest(image: Image.Image) -> str:
+    """SHA-256 of the decoded RGB pixels, so the same picture matches however its file was encoded."""
+    rgb = image.convert("RGB")
+    digest = hashlib.sha256(f"{rgb.width}x{rgb.height}:".encode())
+    digest.update(rgb.tobytes())
+    return digest.hexdigest()
+
+
+def digest_bytes(image_bytes: bytes) -> str:
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        return pixel_digest(image)
+
+
+class ImageDescriptionCache:
+    """Descriptions keyed by decoded-pixel digest, persisted in SQLite with LRU eviction.
+
+    Matches are exact: slides and text pages that differ only in their wording
+    are perceptually almost identical, so a near-duplicate match would hand one
+    image's description to another. Uploads are normalized by ``prepare_image``
+    first, so repeat uploads of the same picture still hit.
+    """
+
+    def __init__(
+        self,
+        db_path: str = IMAGE_CACHE_DB,
+        max_entries: int = IMAGE_CACHE_MAX_ENTRIES,
+        model: str = MODEL,
+    ):
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.model = model
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self.stats = {"lookups": 0, "hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS descriptions ("
+                "digest TEXT NOT NULL, model TEXT NOT NULL, description TEXT NOT NULL, "
+                "last_used REAL NOT NULL, PRIMARY KEY (digest, model))"
+            )
+            rows = self._conn.execute(
+                "SELECT digest, description FROM descriptions WHERE model = ? ORDER BY last_used",
+                (self.model,),
+            ).fetchall()
+            self._entries = OrderedDict(rows)
+        return self._conn
+
+    def get(self, digest: str) -> Optional[str]:
+        with self._lock:
+            conn = self._connect()
+            self.stats["lookups"] += 1
+            description = self._entries.get(digest)
+            if description is None:
+                self.stats["misses"] += 1
+                return None
+
+            self.stats["hits"] += 1
+            self._entries.move_to_end(digest)
+            conn.execute(
+                "UPDATE descriptions SET last_used = ? WHERE digest = ? AND model = ?",
+                (time.time(), digest, self.model),
+            )
+            conn.commit()
+            return description
+
+    def put(self, digest: str, description: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO descriptions (digest, model, description, last_used) VALUES (?, ?, ?, ?)",
+                (digest, self.model, description, time.time()),
+            )
+            self._entries[digest] = description
+            self._entries.move_to_end(digest)
+            self.stats["stores"] += 1
+
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                conn.execute(
+                    "DELETE FROM descriptions WHERE digest = ? AND model = ?",
+                    (evicted, self.model),
+                )
+                self.stats["evictions"] += 1
+            conn.commit()
+
+    def metrics(self) -> dict:
+        lookups = self.stats["lookups"]
+        return {
+            **self.stats,
+            "hit_ratio": self.stats["hits"] / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+        }
+
+
+image_cache = ImageDescriptionCache()
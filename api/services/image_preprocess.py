@@ -0,0 +1,138 @@
+import io
+import time
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from fastapi import UploadFile
+from fastapi.responses import JSONResponse
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from config import (
+    IMAGE_MAX_UPLOAD_BYTES,
+    IMAGE_MAX_LONG_SIDE,
+    IMAGE_MAX_SHORT_SIDE,
+    IMAGE_OUTPUT_FORMAT,
+    IMAGE_OUTPUT_QUALITY,
+)
+
+READ_CHUNK_SIZE = 64 * 1024
+# Room for the multipart boundaries and part headers around the image itself.
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+CONTENT_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp", "PNG": "image/png"}
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class InvalidImage(Exception):
+    pass
+
+
+@dataclass
+class PreparedImage:
+    data: bytes
+    content_type: str
+    bytes_before: int
+    bytes_after: int
+    original_size: tuple[int, int]
+    size: tuple[int, int]
+    elapsed_ms: float
+
+    def report(self) -> dict:
+        return {
+            "bytes_before": self.bytes_before,
+            "bytes_after": self.bytes_after,
+            "original_size": list(self.original_size),
+            "size": list(self.size),
+            "content_type": self.content_type,
+            "preprocess_ms": round(self.elapsed_ms, 1),
+        }
+
+
+class UploadSizeLimit:
+    """ASGI middleware that answers 413 from ``Content-Length`` before the body is read.
+
+    Starlette parses the whole multipart form into its spool file before the
+    route runs, so only this check saves the bandwidth and disk of an
+    oversized upload.
+    """
+
+    def __init__(self, app, path: str, max_bytes: int = IMAGE_MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES):
+        self.app = app
+        self.path = path
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == self.path:
+            length = dict(scope["headers"]).get(b"content-length", b"")
+            if length.isdigit() and int(length) > self.max_bytes:
+                limit_mb = IMAGE_MAX_UPLOAD_BYTES // (1024 * 1024)
+                response = JSONResponse(
+                    {"detail": f"Image exceeds the {limit_mb} MB upload limit"},
+                    status_code=413,
+                    headers={"Connection": "close"},
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+async def measure_upload(file: UploadFile, max_bytes: int = IMAGE_MAX_UPLOAD_BYTES) -> int:
+    """Walk the spooled upload in chunks to enforce the size cap without loading it into memory.
+
+    This runs after the body has been received, so it only backs up
+    ``UploadSizeLimit`` for uploads sent without a ``Content-Length``.
+    """
+    total = 0
+    while chunk := await file.read(READ_CHUNK_SIZE):
+        total += len(chunk)
+        if total > max_bytes:
+            raise UploadTooLarge(f"Image exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+    await file.seek(0)
+    return total
+
+
+def target_size(width: int, height: int) -> tuple[int, int]:
+    """Largest size the vision model actually uses: long side and short side both capped."""
+    scale = min(1.0, IMAGE_MAX_LONG_SIDE / max(width, height), IMAGE_MAX_SHORT_SIDE / min(width, height))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def prepare_image(source: BinaryIO, bytes_before: int) -> PreparedImage:
+    """Downscale, apply orientation, drop metadata and re-encode an image file object.
+
+    CPU-bound; run it in a worker thread.
+    """
+    start = time.perf_counter()
+    try:
+        img = Image.open(source)
+        original_size = img.size
+        # JPEG can decode straight at a reduced scale, avoiding full-size bitmaps for phone photos.
+        img.draft("RGB", target_size(*img.size))
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail(target_size(*img.size), Image.Resampling.LANCZOS)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise InvalidImage(f"Could not read image: {e}")
+
+    if img.mode in ("RGBA", "LA", "P"):
+        img = img.convert("RGBA")
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.split()[-1])
+        img = background
+    elif img.mode != "RGB":
+        img = img.convert("RGB")
+
+    # Saving a fresh image without exif= drops EXIF (GPS, device, etc.).
+    out = io.BytesIO()
+    img.save(out, format=IMAGE_OUTPUT_FORMAT, quality=IMAGE_OUTPUT_QUALITY, optimize=True)
+    data = out.getvalue()
+    return PreparedImage(
+        data=data,
+        content_type=CONTENT_TYPES.get(IMAGE_OUTPUT_FORMAT, "image/jpeg"),
+        bytes_before=bytes_before,
+        bytes_after=len(data),
+        original_size=original_size,
+        size=img.size,
+        elapsed_ms=(time.perf_counter() - start) * 1000,
+    )
@@ -1,15 +1,60 @@
+import asyncio
 import base64
-import os
+from typing import Optional
 
-import requests
+import httpx
 
-from config import HEADERS, TIMEOUT, MAX_TOKENS, OPENAI_API_URL, MODEL
+from config import (
+    HEADERS,
+    MAX_TOKENS,
+    OPENAI_API_URL,
+    MODEL,
+    IMAGE_DESCRIBE_CONCURRENCY,
+    IMAGE_DESCRIBE_QUEUE_TIMEOUT,
+    IMAGE_DESCRIBE_TIMEOUT,
+    IMAGE_CACHE_ENABLED,
+)
+from services.image_cache import digest_bytes, image_cache
 from utils.img_promot import IMAGE_DESCRIPTION_PROMPT
 
-def describe_image_bytes(image_bytes: bytes, content_type: str) -> str:
+_client: Optional[httpx.AsyncClient] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+
+
+class ImageServiceBusy(Exception):
+    """Raised when no description slot frees up within IMAGE_DESCRIBE_QUEUE_TIMEOUT."""
+
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=IMAGE_DESCRIBE_CONCURRENCY,
+                max_keepalive_connections=IMAGE_DESCRIBE_CONCURRENCY,
+            ),
+            timeout=httpx.Timeout(IMAGE_DESCRIBE_TIMEOUT, connect=10.0),
+        )
+    return _client
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(IMAGE_DESCRIBE_CONCURRENCY)
+    return _semaphore
+
+
+async def shutdown() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def build_payload(image_bytes: bytes, content_type: str) -> dict:
     base64_image = base64.b64encode(image_bytes).decode("utf-8")
-    
-    payload = {
+    return {
         "model": MODEL,
         "messages": [
             {
@@ -26,13 +71,45 @@ def describe_image_bytes(image_bytes: bytes, content_type: str) -> str:
         "max_tokens": MAX_TOKENS,
     }
 
-    response = requests.post(
-        OPENAI_API_URL,
-        headers=HEADERS,
-        json=payload,
-        timeout=TIMEOUT,
-    )
 
-    response.raise_for_status()
-    
-    return response.json()["choices"][0]["message"]["content"]
\ No newline at end of file
+async def describe_image_bytes(image_bytes: bytes, content_type: str) -> str:
+    """Describe an image with the vision model without blocking the event loop.
+
+    At most IMAGE_DESCRIBE_CONCURRENCY calls run at once; callers wait up to
+    IMAGE_DESCRIBE_QUEUE_TIMEOUT for a slot before ImageServiceBusy is raised.
+    Cancelling the caller cancels the in-flight upstream request. Images whose
+    decoded pixels were described before are answered from the description cache.
+    """
+    digest = None
+    if IMAGE_CACHE_ENABLED:
+        try:
+            digest = await asyncio.to_thread(digest_bytes, image_bytes)
+            cached = await asyncio.to_thread(image_cache.get, digest)
+            if cached is not None:
+                return cached
+        except Exception as e:
+            print(f"Image cache lookup failed: {e}")
+
+    semaphore = _get_semaphore()
+    try:
+        await asyncio.wait_for(semaphore.acquire(), timeout=IMAGE_DESCRIBE_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise ImageServiceBusy("Image description is at capacity, try again shortly")
+
+    try:
+        response = await get_client().post(
+            OPENAI_API_URL,
+            headers=HEADERS,
+            json=build_payload(image_bytes, content_type),
+        )
+        response.raise_for_status()
+        description = response.json()["choices"][0]["message"]["content"]
+    finally:
+        semaphore.release()
+
+    if digest is not None and description:
+        try:
+            await asyncio.to_thread(image_cache.put, digest, description)
+        except Exception as e:
+            print(f"Image cache store failed: {e}")
+    return description
@@ -0,0 +1,200 @@
+import hashlib
+import json
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+from langchain_openai import OpenAIEmbeddings
+
+from config import (
+    OPENAI_API_KEY,
+    SEMANTIC_CACHE_CATEGORIES,
+    SEMANTIC_CACHE_EMBEDDING_MODEL,
+    SEMANTIC_CACHE_MAX_ENTRIES,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_TTL,
+)
+from models import AIResponse, StudentQuestion
+from agents.router.fast_classifier import FastRouteClassifier
+from agents.similarity import cosine_scores, unit_vector
+
+# Questions that lean on earlier turns or stored memories must not be answered from cache.
+# Personal answers are always built from the student's stored memories.
+MEMORY_DEPENDENT_CATEGORIES = {"personal"}
+MEMORY_DEPENDENT_RE = re.compile(
+    r"\b(remember|last time|earlier|before|again|you said|previous(ly)?|my name|about me)\b",
+    re.IGNORECASE,
+)
+
+
+def normalize_question(question: str) -> str:
+    text = re.sub(r"[^\w\s]", " ", question.lower())
+    return " ".join(text.split())
+
+
+@dataclass
+class CacheEntry:
+    vector: np.ndarray
+    response: dict
+    pipeline_ms: float
+    expires_at: float
+
+
+@dataclass
+class CacheLookup:
+    category: str
+    scope: tuple
+    vector: np.ndarray
+    hit: Optional[AIResponse] = None
+    started: float = field(default_factory=time.perf_counter)
+
+
+class SemanticResponseCache:
+    """Embedding-keyed cache of ask-anything responses, scoped by course, preferences and category.
+
+    Entries are shared between students of the same course, so a turn that
+    goes through the cache is answered without the student's memories (see
+    ``build_initial_state``). Turns whose answer depends on one student
+    (conversation history, references to memories, memory-built categories,
+    or no course, where the agent searches that student's own enrollments)
+    bypass the cache instead and keep their memory context.
+    """
+
+    def __init__(self):
+        self._entries: "OrderedDict[str, tuple[tuple, CacheEntry]]" = OrderedDict()
+        self._embeddings: OpenAIEmbeddings | None = None
+        self._classifier = FastRouteClassifier()
+        self.stats: dict[str, dict] = {}
+
+    def _category_stats(self, category: str) -> dict:
+        return self.stats.setdefault(
+            category,
+            {
+                "lookups": 0, "hits": 0, "misses": 0, "bypassed": 0, "stored": 0,
+                "latency_saved_ms": 0.0, "bypass_reasons": {},
+            },
+        )
+
+    def _get_embeddings(self) -> OpenAIEmbeddings:
+        if self._embeddings is None:
+            self._embeddings = OpenAIEmbeddings(
+                model=SEMANTIC_CACHE_EMBEDDING_MODEL,
+                openai_api_key=OPENAI_API_KEY,
+            )
+        return self._embeddings
+
+    @staticmethod
+    def _scope(query: StudentQuestion, category: str) -> tuple:
+        prefs = json.dumps(query.preferences or {}, sort_keys=True, default=str)
+        return (
+            query.course_id or "",
+            hashlib.sha1(prefs.encode("utf-8")).hexdigest(),
+            category,
+        )
+
+    def _bypass_reason(self, query: StudentQuestion, category: str) -> Optional[str]:
+        if category in MEMORY_DEPENDENT_CATEGORIES:
+            return "memory_category"
+        if not query.course_id:
+            return "no_course"
+        if query.conversation_history:
+            return "conversation_history"
+        if MEMORY_DEPENDENT_RE.search(query.question or ""):
+            return "memory_reference"
+        return None
+
+    async def lookup(self, query: StudentQuestion) -> Optional[CacheLookup]:
+        """Return a lookup handle (with ``hit`` set on a match), or None when the query is not cacheable."""
+        fast = self._classifier.classify(query.question or "")
+        category = fast.category if fast.is_confident() else "unclassified"
+        stats = self._category_stats(category)
+
+        if category not in SEMANTIC_CACHE_CATEGORIES:
+            return self._bypass(stats, "category")
+        reason = self._bypass_reason(query, category)
+        if reason:
+            return self._bypass(stats, reason)
+
+        try:
+            vector = await self._get_embeddings().aembed_query(normalize_question(query.question))
+        except Exception as e:
+            print(f"Semantic cache embedding failed: {e}")
+            return self._bypass(stats, "embedding_failed")
+
+        stats["lookups"] += 1
+        lookup = CacheLookup(category=category, scope=self._scope(query, category), vector=unit_vector(vector))
+        now = time.monotonic()
+        keys, vectors = [], []
+        for key, (scope, entry) in list(self._entries.items()):
+            if entry.expires_at < now:
+                del self._entries[key]
+            elif scope == lookup.scope:
+                keys.append(key)
+                vectors.append(entry.vector)
+        best_key, best_sim = None, 0.0
+        if keys:
+            scores = cosine_scores(lookup.vector, np.stack(vectors))
+            best = int(scores.argmax())
+            best_key, best_sim = keys[best], float(scores[best])
+
+        if best_key is not None and best_sim >= SEMANTIC_CACHE_THRESHOLD:
+            _, entry = self._entries[best_key]
+            self._entries.move_to_end(best_key)
+            # Emotion was detected for whoever asked first, so it is not replayed.
+            lookup.hit = AIResponse(**{**entry.response, "question": query.question, "emotion": "unknown"})
+            elapsed_ms = (time.perf_counter() - lookup.started) * 1000
+            stats["hits"] += 1
+            stats["latency_saved_ms"] += max(0.0, entry.pipeline_ms - elapsed_ms)
+        else:
+            stats["misses"] += 1
+        return lookup
+
+    @staticmethod
+    def _bypass(stats: dict, reason: str) -> None:
+        stats["bypassed"] += 1
+        stats["bypass_reasons"][reason] = stats["bypass_reasons"].get(reason, 0) + 1
+        return None
+
+    def store(self, lookup: CacheLookup, response: AIResponse, result: dict) -> None:
+        """Cache a freshly generated response if the pipeline stayed within the looked-up category."""
+        if result.get("category") != lookup.category or not response.sendable:
+            return
+        # A study plan triggers calendar follow-ups; replaying it would skip those side effects.
+        if result.get("study_plan") or result.get("calendar_result"):
+            return
+
+        pipeline_ms = (time.perf_counter() - lookup.started) * 1000
+        key = hashlib.sha1(repr((lookup.scope, normalize_question(response.question))).encode("utf-8")).hexdigest()
+        self._entries[key] = (
+            lookup.scope,
+            CacheEntry(
+                vector=lookup.vector,
+                response=response.model_dump(),
+                pipeline_ms=pipeline_ms,
+                expires_at=time.monotonic() + SEMANTIC_CACHE_TTL,
+            ),
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > SEMANTIC_CACHE_MAX_ENTRIES:
+            self._entries.popitem(last=False)
+        self._category_stats(lookup.category)["stored"] += 1
+
+    def metrics(self) -> dict:
+        categories = {}
+        for category, stats in self.stats.items():
+            lookups = stats["lookups"]
+            # hit_ratio is over every question in the category, bypassed ones included.
+            requests = lookups + stats["bypassed"]
+            categories[category] = {
+                **stats,
+                "bypass_reasons": dict(stats["bypass_reasons"]),
+                "hit_ratio": stats["hits"] / requests if requests else 0.0,
+                "lookup_hit_ratio": stats["hits"] / lookups if lookups else 0.0,
+            }
+        return {"entries": len(self._entries), "categories": categories}
+
+
+response_cache = SemanticResponseCache()
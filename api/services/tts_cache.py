@@ -0,0 +1,151 @@
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+from config import TTS_CACHE_DIR, TTS_CACHE_LEASE_SECONDS, TTS_CACHE_MAX_BYTES
+
+
+class TTSDiskCache:
+    """Content-addressed MP3 files on local disk with size-capped LRU eviction.
+
+    Files live at ``<dir>/<key[:2]>/<key>.mp3``. The LRU order is rebuilt from
+    file mtimes on first use and hits bump the mtime, so recency survives restarts.
+
+    The index is shared by the event loop and the threads that store finished
+    streams, so it is only touched under a lock. Files handed out by
+    ``acquire`` are leased until ``release`` and are skipped by eviction; a
+    lease older than ``TTS_CACHE_LEASE_SECONDS`` is treated as abandoned.
+    """
+
+    def __init__(self, directory: str = TTS_CACHE_DIR, max_bytes: int = TTS_CACHE_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._index: Optional["OrderedDict[str, int]"] = None
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._leases: Dict[str, list] = {}
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "bytes_served": 0}
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.mp3"
+
+    def _load_index(self) -> "OrderedDict[str, int]":
+        if self._index is None:
+            files = []
+            if self.directory.exists():
+                for path in self.directory.glob("*/*.mp3"):
+                    try:
+                        stat = path.stat()
+                    except FileNotFoundError:
+                        continue
+                    files.append((stat.st_mtime, path.stem, stat.st_size))
+            self._index = OrderedDict((key, size) for _, key, size in sorted(files))
+            self._total_bytes = sum(self._index.values())
+        return self._index
+
+    def get(self, key: str) -> Optional[Path]:
+        with self._lock:
+            return self._get(key)
+
+    def _get(self, key: str) -> Optional[Path]:
+        index = self._load_index()
+        path = self.path_for(key)
+        if key not in index or not path.exists():
+            if key in index:
+                self._total_bytes -= index.pop(key)
+            self.stats["misses"] += 1
+            return None
+        index.move_to_end(key)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.stats["hits"] += 1
+        return path
+
+    def acquire(self, key: str) -> Optional[Path]:
+        """Like ``get``, but keeps the file from being evicted until ``release``."""
+        with self._lock:
+            path = self._get(key)
+            if path is not None:
+                lease = self._leases.setdefault(key, [0, 0.0])
+                lease[0] += 1
+                lease[1] = time.monotonic()
+            return path
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            lease = self._leases.get(key)
+            if lease is None:
+                return
+            lease[0] -= 1
+            if lease[0] <= 0:
+                del self._leases[key]
+
+    def _is_leased(self, key: str, now: float) -> bool:
+        lease = self._leases.get(key)
+        if lease is None:
+            return False
+        if now - lease[1] > TTS_CACHE_LEASE_SECONDS:
+            del self._leases[key]
+            return False
+        return True
+
+    def record_served(self, num_bytes: int) -> None:
+        with self._lock:
+            self.stats["bytes_served"] += num_bytes
+
+    def put(self, key: str, audio: bytes) -> Path:
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename so readers never see a partial MP3.
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+        with self._lock:
+            index = self._load_index()
+            self._total_bytes += len(audio) - index.pop(key, 0)
+            index[key] = len(audio)
+            self.stats["stores"] += 1
+            self._evict(keep=key)
+        return path
+
+    def _evict(self, keep: str) -> None:
+        """Drop least recently used files (never ``keep`` or a leased file) until under the cap."""
+        index = self._load_index()
+        now = time.monotonic()
+        for key in list(index):
+            if self._total_bytes <= self.max_bytes:
+                break
+            if key == keep or self._is_leased(key, now):
+                continue
+            self._total_bytes -= index.pop(key)
+            self.path_for(key).unlink(missing_ok=True)
+            self.stats["evictions"] += 1
+
+    def metrics(self) -> dict:
+        with self._lock:
+            index = self._load_index()
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_ratio": self.stats["hits"] / lookups if lookups else 0.0,
+                "entries": len(index),
+                "leased": len(self._leases),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+tts_cache = TTSDiskCache()
@@ -1,34 +1,327 @@
-import os
+import asyncio
+import hashlib
+import re
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
 import httpx
 from fastapi import HTTPException, Response
-from config import TTS_MODEL, SPEED, TIMEOUT, VOICE_MAPPING, HEADERS
-
-async def generate_tts(text: str, voice: str, category: str | None):
-    selected_voice = VOICE_MAPPING.get(category, voice)
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            "https://api.openai.com/v1/audio/speech",
-            headers=HEADERS,
-            json={
-                "model": TTS_MODEL,
-                "input": text,
-                "voice": selected_voice,
-                "speed": SPEED,
-            },
-            timeout=TIMEOUT,
-        )
-        if response.status_code != 200:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-        return Response(
-            content=response.content,
-            media_type="audio/mpeg",
-            headers={
-                "Content-Disposition": "inline; filename=speech.mp3",
-                "Content-Length": str(len(response.content)),
-                "Accept-Ranges": "bytes",
-            },
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from config import (
+    TTS_MODEL,
+    SPEED,
+    TIMEOUT,
+    VOICE_MAPPING,
+    HEADERS,
+    TTS_CHUNK_SIZE,
+    TTS_HTTP_MAX_CONNECTIONS,
+    TTS_HTTP_MAX_KEEPALIVE,
+    TTS_CACHE_ENABLED,
+    TTS_PIPELINE_MIN_CHARS,
+    TTS_PIPELINE_CHUNK_CHARS,
+    TTS_PIPELINE_CONCURRENCY,
+)
+from services.tts_cache import tts_cache
+
+SPEECH_URL = "https://api.openai.com/v1/audio/speech"
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+# The speech endpoint rejects inputs longer than this.
+MAX_INPUT_CHARS = 4096
+
+AUDIO_HEADERS = {
+    "Content-Disposition": "inline; filename=speech.mp3",
+    "Accept-Ranges": "bytes",
+}
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=TTS_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=TTS_HTTP_MAX_KEEPALIVE,
+            ),
+            timeout=httpx.Timeout(TIMEOUT, connect=10.0),
         )
+    return _client
+
+
+async def shutdown() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def resolve_voice(voice: str, category: str | None) -> str:
+    return VOICE_MAPPING.get(category, voice)
+
+
+def audio_key(text: str, voice: str) -> str:
+    """Cache key for synthesized audio; ``voice`` is already resolved from the category mapping."""
+    return hashlib.sha256(f"{TTS_MODEL}|{SPEED}|{voice}|{text}".encode("utf-8")).hexdigest()
+
+
+async def _remember(key: str, audio: bytes) -> None:
+    if TTS_CACHE_ENABLED and audio:
+        await asyncio.to_thread(tts_cache.put, key, audio)
+
+
+async def _acquire_cached(key: str) -> Optional[Path]:
+    """Cached MP3 for ``key``, leased against eviction; the caller must ``tts_cache.release`` it.
+
+    The lookup stats, touches or indexes files on disk, so it runs in a worker thread.
+    """
+    return await asyncio.to_thread(tts_cache.acquire, key) if TTS_CACHE_ENABLED else None
+
+
+def parse_range(header: str, size: int) -> tuple[int, int]:
+    """Return the inclusive (start, end) byte range, raising 416 when unsatisfiable."""
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # Suffix range: the final N bytes.
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start >= size or start > end:
+        raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+def _is_full_range(header: str | None) -> bool:
+    """A missing header or ``bytes=0-`` asks for the whole file and can be streamed as it is synthesized."""
+    return not header or header.replace(" ", "") == "bytes=0-"
+
+
+def audio_response(audio: bytes, range_header: str | None) -> Response:
+    if not range_header:
+        return Response(content=audio, media_type="audio/mpeg", headers=AUDIO_HEADERS)
+    start, end = parse_range(range_header, len(audio))
+    return Response(
+        content=audio[start:end + 1],
+        status_code=206,
+        media_type="audio/mpeg",
+        headers={**AUDIO_HEADERS, "Content-Range": f"bytes {start}-{end}/{len(audio)}"},
+    )
+
+
+def file_response(key: str, path: Path, range_header: str | None) -> Response:
+    """Serve a leased cached MP3, using FileResponse for whole-file requests.
+
+    The lease is released once the file has been sent (or read, for ranges).
+    """
+    try:
+        size = path.stat().st_size
+        if not range_header:
+            tts_cache.record_served(size)
+            return FileResponse(
+                path,
+                media_type="audio/mpeg",
+                headers=AUDIO_HEADERS,
+                background=BackgroundTask(tts_cache.release, key),
+            )
+        start, end = parse_range(range_header, size)
+        with open(path, "rb") as f:
+            f.seek(start)
+            data = f.read(end - start + 1)
+    except BaseException:
+        tts_cache.release(key)
+        raise
+    tts_cache.release(key)
+    tts_cache.record_served(len(data))
+    return Response(
+        content=data,
+        status_code=206,
+        media_type="audio/mpeg",
+        headers={**AUDIO_HEADERS, "Content-Range": f"bytes {start}-{end}/{size}"},
+    )
+
+
+def _speech_request(text: str, voice: str) -> httpx.Request:
+    return get_client().build_request(
+        "POST",
+        SPEECH_URL,
+        headers=HEADERS,
+        json={
+            "model": TTS_MODEL,
+            "input": text,
+            "voice": voice,
+            "speed": SPEED,
+        },
+    )
+
+
+async def _open_speech_stream(text: str, voice: str) -> httpx.Response:
+    response = await get_client().send(_speech_request(text, voice), stream=True)
+    if response.status_code != 200:
+        detail = (await response.aread()).decode("utf-8", errors="replace")
+        await response.aclose()
+        raise HTTPException(status_code=response.status_code, detail=detail)
+    return response
+
+
+async def _synthesize_uncached(text: str, voice: str) -> bytes:
+    response = await _open_speech_stream(text, voice)
+    try:
+        return await response.aread()
+    finally:
+        await response.aclose()
+
+
+async def synthesize(text: str, voice: str) -> bytes:
+    """Synthesize the full MP3 for ``text`` (used when a client asks for a byte range)."""
+    key = audio_key(text, voice)
+    path = await _acquire_cached(key)
+    if path is not None:
+        try:
+            return await asyncio.to_thread(path.read_bytes)
+        finally:
+            tts_cache.release(key)
+    audio = await _synthesize_uncached(text, voice)
+    await _remember(key, audio)
+    return audio
+
+
+async def _relay(response: httpx.Response, key: str) -> AsyncIterator[bytes]:
+    chunks = []
+    complete = False
+    try:
+        async for chunk in response.aiter_bytes(TTS_CHUNK_SIZE):
+            chunks.append(chunk)
+            yield chunk
+        complete = True
+    finally:
+        await response.aclose()
+        if complete:
+            await _remember(key, b"".join(chunks))
+
+
+def _split_long(sentence: str, limit: int) -> list[str]:
+    parts, current = [], ""
+    for word in sentence.split():
+        if current and len(current) + len(word) + 1 > limit:
+            parts.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        parts.append(current)
+    return parts
+
+
+def split_sentences(text: str, max_chars: int = TTS_PIPELINE_CHUNK_CHARS) -> list[str]:
+    """Split text into sentence-aligned chunks for pipelined synthesis.
+
+    The first sentence is its own chunk so it renders (and starts playing) as
+    soon as possible; later sentences are packed into chunks of up to ``max_chars``.
+    """
+    sentences = []
+    for sentence in SENTENCE_END_RE.split(text):
+        sentence = sentence.strip()
+        if sentence:
+            sentences.extend(_split_long(sentence, MAX_INPUT_CHARS) if len(sentence) > MAX_INPUT_CHARS else [sentence])
+
+    if not sentences:
+        return []
+    chunks = [sentences[0]]
+    current = ""
+    for sentence in sentences[1:]:
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def _pipelined(tasks: list[asyncio.Task], key: str) -> AsyncIterator[bytes]:
+    parts = []
+    complete = False
+    try:
+        for task in tasks:
+            audio = await task
+            parts.append(audio)
+            yield audio
+        complete = True
+    finally:
+        for task in tasks:
+            task.cancel()
+        if complete:
+            await _remember(key, b"".join(parts))
+
+
+async def generate_pipelined_tts(text: str, voice: str, key: str) -> Optional[StreamingResponse]:
+    """Synthesize sentence chunks concurrently and stream them back in order.
+
+    Returns None when the text is a single chunk, so the caller can use the
+    regular streaming path instead.
+    """
+    chunks = split_sentences(text)
+    if len(chunks) < 2:
+        return None
+
+    semaphore = asyncio.Semaphore(TTS_PIPELINE_CONCURRENCY)
+
+    # Only the joined answer is cached; sentence fragments would just evict useful entries.
+    async def render(chunk: str) -> bytes:
+        async with semaphore:
+            return await _synthesize_uncached(chunk, voice)
+
+    tasks = [asyncio.create_task(render(chunk)) for chunk in chunks]
+    try:
+        # Surface upstream errors as a proper status before the body starts.
+        await tasks[0]
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    # MP3 is a sequence of independent frames, so the chunks concatenate into one stream.
+    return StreamingResponse(_pipelined(tasks, key), media_type="audio/mpeg", headers=AUDIO_HEADERS)
+
+
+async def generate_tts(
+    text: str,
+    voice: str,
+    category: str | None,
+    range_header: str | None = None,
+    pipeline: bool | None = None,
+):
+    selected_voice = resolve_voice(voice, category)
+    key = audio_key(text, selected_voice)
 
+    path = await _acquire_cached(key)
+    if path is not None:
+        return await asyncio.to_thread(file_response, key, path, range_header)
 
+    if not _is_full_range(range_header):
+        return audio_response(await synthesize(text, selected_voice), range_header)
 
+    if pipeline is None:
+        pipeline = len(text) >= TTS_PIPELINE_MIN_CHARS
+    if pipeline:
+        response = await generate_pipelined_tts(text, selected_voice, key)
+        if response is not None:
+            return response
 
+    # Whole-file requests are relayed chunk by chunk as OpenAI produces them,
+    # so playback starts before synthesis finishes. The length is not known
+    # yet, so the body is chunked and a bytes=0- request gets a plain 200.
+    response = await _open_speech_stream(text, selected_voice)
+    return StreamingResponse(
+        _relay(response, key),
+        media_type="audio/mpeg",
+        headers=AUDIO_HEADERS,
+    )
@@ -0,0 +1,12 @@
+import os
+import sys
+from pathlib import Path
+
+API_DIR = Path(__file__).parent.parent
+# The API imports its own modules by top-level name and the agents from the
+# langgraph src tree, the same way main.py and services/ai_service.py do.
+sys.path.insert(0, str(API_DIR.parent / "agents" / "langgraph" / "src"))
+sys.path.insert(0, str(API_DIR))
+
+# Chat models are constructed at import time; no request is ever sent.
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
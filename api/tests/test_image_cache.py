@@ -0,0 +1,65 @@
+import io
+
+from PIL import Image, ImageDraw
+
+from services.image_cache import ImageDescriptionCache, digest_bytes
+from services.image_preprocess import prepare_image
+
+
+def slide(title, bullets):
+    image = Image.new("RGB", (1280, 720), "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([0, 0, 1280, 90], fill=(30, 60, 120))
+    draw.text((40, 30), title, fill="white")
+    for i, bullet in enumerate(bullets):
+        draw.text((60, 130 + i * 40), f"- {bullet}", fill="black")
+    return image
+
+
+def page(words):
+    image = Image.new("RGB", (850, 1100), "white")
+    draw = ImageDraw.Draw(image)
+    for line in range(40):
+        draw.text((60, 60 + line * 24), " ".join(words[(line + i) % len(words)] for i in range(12)), fill="black")
+    return image
+
+
+def encode(image, fmt, **options):
+    out = io.BytesIO()
+    image.save(out, format=fmt, **options)
+    return out.getvalue()
+
+
+def prepared(image_bytes):
+    return prepare_image(io.BytesIO(image_bytes), len(image_bytes)).data
+
+
+def test_distinct_slides_and_pages_miss(tmp_path):
+    cache = ImageDescriptionCache(str(tmp_path / "cache.sqlite3"))
+    first = slide("Lecture 3: Cell membranes", ["Phospholipid bilayer", "Transport proteins"])
+    second = slide("Lecture 4: Cell membranes", ["Phospholipid bilayer", "Channel proteins"])
+    cache.put(digest_bytes(prepared(encode(first, "PNG"))), "slide three")
+    assert cache.get(digest_bytes(prepared(encode(second, "PNG")))) is None
+
+    left = page(["mitochondria", "produce", "energy", "for", "the", "cell"])
+    right = page(["ribosomes", "assemble", "protein", "for", "the", "cell"])
+    cache.put(digest_bytes(prepared(encode(left, "PNG"))), "page one")
+    assert cache.get(digest_bytes(prepared(encode(right, "PNG")))) is None
+    assert cache.metrics()["hits"] == 0
+
+
+def test_reencoded_copy_hits(tmp_path):
+    cache = ImageDescriptionCache(str(tmp_path / "cache.sqlite3"))
+    image = slide("Lecture 3: Cell membranes", ["Phospholipid bilayer", "Transport proteins"])
+    cache.put(digest_bytes(prepared(encode(image, "PNG"))), "slide three")
+
+    for copy in (encode(image, "PNG", compress_level=9), encode(image, "BMP"), encode(image, "WEBP", lossless=True)):
+        assert cache.get(digest_bytes(prepared(copy))) == "slide three"
+
+
+def test_entries_survive_a_restart(tmp_path):
+    db = str(tmp_path / "cache.sqlite3")
+    digest = digest_bytes(encode(slide("Title", ["One"]), "PNG"))
+    ImageDescriptionCache(db).put(digest, "described")
+    assert ImageDescriptionCache(db).get(digest) == "described"
+
@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+
+from models import AIResponse, StudentQuestion
+from services.response_cache import SemanticResponseCache
+
+
+class FakeEmbeddings:
+    async def aembed_query(self, text):
+        return [1.0, 0.0]
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = SemanticResponseCache()
+    monkeypatch.setattr(cache, "_get_embeddings", lambda: FakeEmbeddings())
+    return cache
+
+
+def answer(question):
+    return AIResponse(
+        question=question,
+        response="Your exam is on Friday.",
+        recommendations=[],
+        feedback="ok",
+        sendable=True,
+        trials=1,
+    )
+
+
+def test_entries_are_shared_within_a_course(cache):
+    question = "When is the midterm exam?"
+
+    async def run():
+        first = await cache.lookup(StudentQuestion(question=question, student_id="a", course_id="c1"))
+        assert first is not None and first.hit is None
+        cache.store(first, answer(question), {"category": "study"})
+
+        other_student = await cache.lookup(StudentQuestion(question=question, student_id="b", course_id="c1"))
+        other_course = await cache.lookup(StudentQuestion(question=question, student_id="a", course_id="c2"))
+        return other_student, other_course
+
+    other_student, other_course = asyncio.run(run())
+    assert other_student.hit is not None
+    assert other_course.hit is None
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        StudentQuestion(question="When is the midterm exam?", student_id="a"),
+        StudentQuestion(
+            question="When is the midterm exam?",
+            student_id="a",
+            course_id="c1",
+            conversation_history=[{"role": "user", "content": "hi"}],
+        ),
+        StudentQuestion(question="What did you say about my exam before?", student_id="a", course_id="c1"),
+    ],
+)
+def test_student_dependent_turns_bypass_the_cache(cache, query):
+    assert asyncio.run(cache.lookup(query)) is None
+
+
+def test_hit_ratio_counts_bypassed_questions(cache):
+    question = "When is the midterm exam?"
+
+    async def run():
+        first = await cache.lookup(StudentQuestion(question=question, student_id="a", course_id="c1"))
+        cache.store(first, answer(question), {"category": "study"})
+        await cache.lookup(StudentQuestion(question=question, student_id="b", course_id="c1"))
+        await cache.lookup(StudentQuestion(question=question, student_id="c"))
+
+    asyncio.run(run())
+    study = cache.metrics()["categories"]["study"]
+    assert (study["lookups"], study["hits"], study["bypassed"]) == (2, 1, 1)
+    assert study["bypass_reasons"] == {"no_course": 1}
+    assert study["hit_ratio"] == pytest.approx(1 / 3)
+    assert study["lookup_hit_ratio"] == pytest.approx(1 / 2)
+
+
+def test_lookup_picks_the_most_similar_entry(cache, monkeypatch):
+    vectors = {"midterm": [1.0, 0.0], "final": [0.0, 1.0]}
+
+    class KeywordEmbeddings:
+        async def aembed_query(self, text):
+            return next(v for word, v in vectors.items() if word in text)
+
+    monkeypatch.setattr(cache, "_get_embeddings", lambda: KeywordEmbeddings())
+
+    async def run():
+        for question in ("When is the midterm exam?", "When is the final exam?"):
+            lookup = await cache.lookup(StudentQuestion(question=question, student_id="a", course_id="c1"))
+            cache.store(lookup, answer(question).model_copy(update={"response": question}), {"category": "study"})
+        return await cache.lookup(StudentQuestion(question="What day is the final exam?", student_id="b", course_id="c1"))
+
+    hit = asyncio.run(run()).hit
+    assert hit is not None
+    assert hit.response == "When is the final exam?"
+    assert cache.metrics()["categories"]["study"]["hits"] == 1
+
+
+def test_cacheable_turns_are_answered_without_memory(monkeypatch):
+    from services import ai_service
+
+    states = []
+
+    class RecordingGraph:
+        async def ainvoke(self, state, config):
+            states.append(state)
+            return {"ai_response": "Friday", "sendable": True, "trials": 1, "category": "study"}
+
+    cache = SemanticResponseCache()
+    monkeypatch.setattr(cache, "_get_embeddings", lambda: FakeEmbeddings())
+    monkeypatch.setattr(ai_service, "response_cache", cache)
+    monkeypatch.setattr(ai_service, "graph", RecordingGraph())
+    monkeypatch.setattr(ai_service, "SEMANTIC_CACHE_ENABLED", True)
+
+    asyncio.run(ai_service.process_question(StudentQuestion(question="When is the midterm exam?", student_id="a", course_id="c1")))
+    asyncio.run(ai_service.process_question(StudentQuestion(question="When is the midterm exam?", student_id="a")))
+    assert [state["shared_answer"] for state in states] == [True, False]
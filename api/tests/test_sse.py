@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from utils.sse import PartialJSONField, StreamedAnswer, format_sse
+
+
+def feed_all(decoder, fragments):
+    return [decoder.feed(fragment) for fragment in fragments]
+
+
+def test_format_sse():
+    assert format_sse("token", {"text": "hé"}) == 'event: token\ndata: {"text": "h\\u00e9"}\n\n'
+
+
+def test_partial_field_emits_only_new_text():
+    fragments = ['{"resp', 'onse": "Hel', 'lo', ' wor', 'ld", "sendable": true}']
+    assert feed_all(PartialJSONField("response"), fragments) == ["", "Hel", "lo", " wor", "ld"]
+
+
+def test_partial_field_ignores_other_fields():
+    field = PartialJSONField("response")
+    assert field.feed('{"emotion": "happy", "response"') == ""
+    assert field.feed(': "ok"}') == "ok"
+
+
+def test_partial_field_waits_for_whole_escape_sequences():
+    field = PartialJSONField("response")
+    source = json.dumps({"response": 'Say "hi"\nthen café \\ done'}, ensure_ascii=True)
+    decoded = "".join(field.feed(ch) for ch in source)
+    assert decoded == 'Say "hi"\nthen café \\ done'
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 1000])
+def test_partial_field_is_independent_of_chunking(chunk_size):
+    source = json.dumps({"response": "Line one.\n\tLine ✓ two."})
+    field = PartialJSONField("response")
+    chunks = [source[i:i + chunk_size] for i in range(0, len(source), chunk_size)]
+    assert "".join(field.feed(chunk) for chunk in chunks) == "Line one.\n\tLine ✓ two."
+
+
+def test_streamed_answer_plain_content_passes_through():
+    answer = StreamedAnswer()
+    assert [answer.feed(content=c) for c in ["", "  ", "Hi", " there"]] == ["", "", "  Hi", " there"]
+    assert answer.is_json is False
+
+
+def test_streamed_answer_decodes_json_content():
+    answer = StreamedAnswer()
+    fragments = [" ", '{"response": "Hel', 'lo"', ', "sendable": true}']
+    assert [answer.feed(content=c) for c in fragments] == ["", "Hel", "lo", ""]
+    assert answer.is_json is True
+
+
+def test_streamed_answer_decodes_tool_call_arguments():
+    answer = StreamedAnswer()
+    assert answer.feed(tool_args='{"response": "A') == "A"
+    assert answer.feed(content="", tool_args='B"}') == "B"
@@ -0,0 +1,70 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from models import StudentQuestion
+from services import ai_service
+from agents.model import ANSWER_TAG
+
+
+def chat_chunk(run_id, content="", args=None):
+    chunk = SimpleNamespace(content=content, tool_call_chunks=[{"args": args}] if args else [])
+    return {
+        "event": "on_chat_model_stream",
+        "run_id": run_id,
+        "name": "ChatOpenAI",
+        "tags": [ANSWER_TAG],
+        "metadata": {"langgraph_node": "generate_ai_response"},
+        "data": {"chunk": chunk},
+    }
+
+
+class FakeGraph:
+    def __init__(self, events):
+        self.events = events
+
+    async def astream_events(self, state, config, version):
+        yield {"event": "on_chain_start", "run_id": "root", "name": "LangGraph", "metadata": {}, "data": {}}
+        for event in self.events:
+            yield event
+        final = {"ai_response": "Second draft", "sendable": True, "trials": 1, "category": "study"}
+        yield {"event": "on_chain_end", "run_id": "root", "name": "LangGraph", "metadata": {}, "data": {"output": final}}
+
+
+def collect(monkeypatch, events):
+    monkeypatch.setattr(ai_service, "graph", FakeGraph(events))
+    monkeypatch.setattr(ai_service, "SEMANTIC_CACHE_ENABLED", False)
+
+    async def run():
+        out = []
+        async for message in ai_service.stream_question(StudentQuestion(question="q")):
+            event, data = message.strip().split("\n")
+            out.append((event[len("event: "):], json.loads(data[len("data: "):])))
+        return out
+
+    return asyncio.run(run())
+
+
+def test_json_content_is_decoded_to_the_answer_field(monkeypatch):
+    events = collect(monkeypatch, [
+        chat_chunk("r1", content='{"response": "Hel'),
+        chat_chunk("r1", content='lo", "sendable": true}'),
+    ])
+    assert [data["text"] for event, data in events if event == "token"] == ["Hel", "lo"]
+    assert events[-1][0] == "final"
+
+
+def test_rewrite_resets_the_rejected_draft(monkeypatch):
+    events = collect(monkeypatch, [
+        chat_chunk("r1", args='{"response": "First draft"}'),
+        chat_chunk("r2", args='{"response": "Second'),
+        chat_chunk("r2", args=' draft"}'),
+    ])
+    kinds = [(event, data.get("run_id"), data.get("text")) for event, data in events if event in ("token", "reset")]
+    assert kinds == [
+        ("token", "r1", "First draft"),
+        ("reset", "r1", None),
+        ("token", "r2", "Second"),
+        ("token", "r2", " draft"),
+    ]
+    assert events[-1][1]["response"] == "Second draft"
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+
+from services import tts_cache as tts_cache_module
+from services.tts_cache import TTSDiskCache
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = TTSDiskCache(str(tmp_path), max_bytes=10)
+    cache.put("aa1", b"12345")
+    cache.put("bb2", b"12345")
+    assert cache.get("aa1") is not None
+    cache.put("cc3", b"12345")
+    assert cache.get("bb2") is None
+    assert cache.get("aa1") is not None
+    assert cache.metrics()["bytes"] == 10
+
+
+def test_leased_file_is_not_evicted(tmp_path):
+    cache = TTSDiskCache(str(tmp_path), max_bytes=10)
+    cache.put("aa1", b"12345")
+    path = cache.acquire("aa1")
+    cache.put("bb2", b"12345")
+    cache.put("cc3", b"12345")
+    assert path.exists()
+    assert cache.get("bb2") is None
+
+    cache.release("aa1")
+    cache.put("dd4", b"12345")
+    assert not path.exists()
+    assert cache.metrics()["leased"] == 0
+
+
+def test_abandoned_lease_expires(tmp_path, monkeypatch):
+    monkeypatch.setattr(tts_cache_module, "TTS_CACHE_LEASE_SECONDS", 0)
+    cache = TTSDiskCache(str(tmp_path), max_bytes=5)
+    cache.put("aa1", b"12345")
+    path = cache.acquire("aa1")
+    cache.put("bb2", b"12345")
+    assert not path.exists()
+
+
+def test_concurrent_puts_keep_the_index_consistent(tmp_path):
+    cache = TTSDiskCache(str(tmp_path), max_bytes=50)
+
+    def store(worker):
+        for i in range(50):
+            cache.put(f"{worker:02d}{i:03d}", b"x" * 5)
+
+    threads = [threading.Thread(target=store, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    on_disk = sum(path.stat().st_size for path in tmp_path.glob("*/*.mp3"))
+    metrics = cache.metrics()
+    assert metrics["bytes"] == on_disk <= 50
+    assert metrics["stores"] == 400
+
+
+def test_file_response_releases_after_sending(tmp_path, monkeypatch):
+    from services import tts_service
+
+    cache = TTSDiskCache(str(tmp_path), max_bytes=100)
+    cache.put("aa1", b"0123456789")
+    monkeypatch.setattr(tts_service, "tts_cache", cache)
+
+    response = tts_service.file_response("aa1", cache.acquire("aa1"), None)
+    assert cache.metrics()["leased"] == 1
+
+    async def send(message):
+        pass
+
+    async def receive():
+        return {"type": "http.request"}
+
+    asyncio.run(response({"type": "http", "method": "GET", "headers": []}, receive, send))
+    assert cache.metrics()["leased"] == 0
+
+    ranged = tts_service.file_response("aa1", cache.acquire("aa1"), "bytes=2-4")
+    assert ranged.body == b"234"
+    assert cache.metrics()["leased"] == 0
+
+
+def test_warmup_renders_calendar_email_phrases_in_the_work_voice():
+    from services import tts_service
+    from utils.tts_warmup import DEFAULT_PHRASES
+
+    phrases = [(category, text) for category, text in DEFAULT_PHRASES if "email draft" in text]
+    assert len(phrases) == 3
+    for category, text in phrases:
+        assert tts_service.resolve_voice("alloy", category) == tts_service.resolve_voice("alloy", "work")
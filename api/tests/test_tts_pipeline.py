@@ -0,0 +1,65 @@
+import asyncio
+
+from services import tts_service
+from services.tts_cache import TTSDiskCache
+from services.tts_service import MAX_INPUT_CHARS, split_sentences
+
+
+def test_first_sentence_is_its_own_chunk():
+    text = "First one. Second one! Third one? Fourth."
+    assert split_sentences(text, max_chars=400) == ["First one.", "Second one! Third one? Fourth."]
+
+
+def test_later_sentences_are_packed_up_to_max_chars():
+    sentences = [f"Sentence number {i}." for i in range(10)]
+    chunks = split_sentences(" ".join(sentences), max_chars=45)
+    assert chunks[0] == sentences[0]
+    assert all(len(chunk) <= 45 for chunk in chunks[1:])
+    assert " ".join(chunks) == " ".join(sentences)
+
+
+def test_newlines_split_sentences():
+    assert split_sentences("Title\n\nBody text here. More.", max_chars=400) == ["Title", "Body text here. More."]
+
+
+def test_overlong_sentences_are_split_on_words():
+    sentence = " ".join(["word"] * 2000) + "."
+    chunks = split_sentences(sentence)
+    assert all(len(chunk) <= MAX_INPUT_CHARS for chunk in chunks)
+    assert " ".join(chunks).split() == sentence.split()
+
+
+def test_empty_text():
+    assert split_sentences("") == []
+    assert split_sentences("  \n ") == []
+
+
+def test_pipelined_answer_caches_only_the_joined_audio(tmp_path, monkeypatch):
+    class FakeSpeech:
+        def __init__(self, text):
+            self.text = text
+
+        async def aread(self):
+            return self.text.encode()
+
+        async def aclose(self):
+            pass
+
+    async def open_speech_stream(text, voice):
+        return FakeSpeech(text)
+
+    cache = TTSDiskCache(str(tmp_path), max_bytes=10_000)
+    monkeypatch.setattr(tts_service, "tts_cache", cache)
+    monkeypatch.setattr(tts_service, "TTS_CACHE_ENABLED", True)
+    monkeypatch.setattr(tts_service, "_open_speech_stream", open_speech_stream)
+
+    text = "First one. " + " ".join(f"Sentence number {i}." for i in range(40))
+    key = tts_service.audio_key(text, "alloy")
+
+    async def run():
+        response = await tts_service.generate_pipelined_tts(text, "alloy", key)
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    audio = asyncio.run(run())
+    assert cache.metrics()["entries"] == 1
+    assert cache.get(key).read_bytes() == audio
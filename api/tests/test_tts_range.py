@@ -0,0 +1,44 @@
+import pytest
+from fastapi import HTTPException
+
+from services.tts_service import _is_full_range, audio_response, parse_range
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-99", (0, 99)),
+        ("bytes=10-", (10, 999)),
+        ("bytes=990-5000", (990, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=-5000", (0, 999)),
+        ("bytes=999-999", (999, 999)),
+        ("  bytes=5-9 ", (5, 9)),
+    ],
+)
+def test_parse_range(header, expected):
+    assert parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=50-10", "bytes=-", "bytes=-0", "items=0-1", "bytes=0-1,5-9"])
+def test_unsatisfiable_range_is_416(header):
+    with pytest.raises(HTTPException) as info:
+        parse_range(header, 1000)
+    assert info.value.status_code == 416
+    assert info.value.headers["Content-Range"] == "bytes */1000"
+
+
+@pytest.mark.parametrize("header, full", [(None, True), ("", True), ("bytes=0-", True), ("bytes = 0-", True), ("bytes=0-10", False)])
+def test_is_full_range(header, full):
+    assert _is_full_range(header) is full
+
+
+def test_audio_response_slices_ranges():
+    audio = bytes(range(10))
+    whole = audio_response(audio, None)
+    assert whole.status_code == 200 and whole.body == audio
+
+    partial = audio_response(audio, "bytes=2-4")
+    assert partial.status_code == 206
+    assert partial.body == b"\x02\x03\x04"
+    assert partial.headers["Content-Range"] == "bytes 2-4/10"
@@ -0,0 +1,44 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI, Request
+
+from services.image_preprocess import UploadSizeLimit
+
+
+def make_app(received):
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimit, path="/image/describe", max_bytes=100)
+
+    @app.post("/image/describe")
+    @app.post("/other")
+    async def upload(request: Request):
+        received.append(len(await request.body()))
+        return {"ok": True}
+
+    return app
+
+
+def post(app, path, size):
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(path, content=b"x" * size)
+
+    return asyncio.run(run())
+
+
+def test_oversized_content_length_is_rejected_before_the_body_is_read():
+    received = []
+    response = post(make_app(received), "/image/describe", 101)
+    assert response.status_code == 413
+    assert "upload limit" in response.json()["detail"]
+    assert received == []
+
+
+def test_uploads_within_the_limit_and_other_paths_pass_through():
+    received = []
+    app = make_app(received)
+    assert post(app, "/image/describe", 100).status_code == 200
+    assert post(app, "/other", 500).status_code == 200
+    assert received == [100, 500]
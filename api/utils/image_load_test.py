@@ -0,0 +1,122 @@
+"""Check that in-flight image descriptions do not stall other endpoints.
+
+Keeps ``--images`` concurrent /image/describe uploads running while probing
+/health and /api/ask-anything, then prints latency percentiles for each probe
+with and without the image load. Every upload is a differently perturbed copy
+of ``--image`` (a random block pattern over it), so no two requests share
+pixels and each one goes upstream rather than hitting the description cache; the run reports the cache hits it saw. Run against a live API:
+
+    python -m utils.image_load_test --image photo.jpg
+    python -m utils.image_load_test --image photo.jpg --images 8 --probes 40 --skip-ask
+"""
+import argparse
+import asyncio
+import io
+import random
+import statistics
+import time
+from pathlib import Path
+
+import httpx
+from PIL import Image, ImageDraw
+
+ASK_BODY = {"question": "What is photosynthesis?", "conversation_history": []}
+
+
+async def timed(coro) -> float:
+    start = time.perf_counter()
+    response = await coro
+    response.raise_for_status()
+    return (time.perf_counter() - start) * 1000
+
+
+async def probe(client: httpx.AsyncClient, name: str, count: int, interval: float) -> list[float]:
+    latencies = []
+    for _ in range(count):
+        if name == "health":
+            latencies.append(await timed(client.get("/health")))
+        else:
+            latencies.append(await timed(client.post("/api/ask-anything", json=ASK_BODY)))
+        await asyncio.sleep(interval)
+    return latencies
+
+
+def varied_image(source: Image.Image, rng: random.Random) -> bytes:
+    """JPEG of ``source`` under a random 9x8 block pattern, so its decoded pixels (and the
+    description cache's pixel digest) differ from every other upload."""
+    image = source.copy()
+    draw = ImageDraw.Draw(image, "RGBA")
+    width, height = image.size
+    for row in range(8):
+        for col in range(9):
+            box = (col * width // 9, row * height // 8, (col + 1) * width // 9, (row + 1) * height // 8)
+            draw.rectangle(box, fill=(rng.randrange(256),) * 3 + (160,))
+    out = io.BytesIO()
+    image.save(out, format="JPEG", quality=85)
+    return out.getvalue()
+
+
+async def image_load(client: httpx.AsyncClient, image: Path, workers: int, stop: asyncio.Event) -> list[float]:
+    with Image.open(image) as opened:
+        source = opened.convert("RGB")
+    rng = random.Random()
+    latencies = []
+
+    async def worker() -> None:
+        while not stop.is_set():
+            files = {"file": (f"{image.stem}.jpg", varied_image(source, rng), "image/jpeg")}
+            try:
+                latencies.append(await timed(client.post("/image/describe", files=files)))
+            except httpx.HTTPError as e:
+                print(f"image request failed: {e}")
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    return latencies
+
+
+def summarize(label: str, latencies: list[float]) -> None:
+    if not latencies:
+        print(f"{label:<28} no samples")
+        return
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"{label:<28} n={len(ordered):<4} p50={statistics.median(ordered):8.1f} ms  p95={p95:8.1f} ms  max={ordered[-1]:8.1f} ms")
+
+
+async def run(args) -> None:
+    probes = ["health"] if args.skip_ask else ["health", "ask"]
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=120) as client:
+        for name in probes:
+            summarize(f"{name} (idle)", await probe(client, name, args.probes, args.interval))
+
+        cache_before = (await client.get("/health/image-cache")).json()
+        stop = asyncio.Event()
+        load = asyncio.create_task(image_load(client, args.image, args.images, stop))
+        # Let the image requests reach the upstream call before probing.
+        await asyncio.sleep(1.0)
+        results = await asyncio.gather(*(probe(client, name, args.probes, args.interval) for name in probes))
+        stop.set()
+        image_latencies = await load
+
+        for name, latencies in zip(probes, results):
+            summarize(f"{name} (images in flight)", latencies)
+        summarize("image/describe", image_latencies)
+
+        cache_after = (await client.get("/health/image-cache")).json()
+        hits = cache_after.get("hits", 0) - cache_before.get("hits", 0)
+        print(f"image cache hits during load: {hits}" + (" (results include cached answers)" if hits else ""))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--image", type=Path, required=True, help="Image file to upload")
+    parser.add_argument("--images", type=int, default=4, help="Concurrent image requests")
+    parser.add_argument("--probes", type=int, default=20, help="Requests per probe endpoint")
+    parser.add_argument("--interval", type=float, default=0.1, help="Seconds between probe requests")
+    parser.add_argument("--skip-ask", action="store_true", help="Only probe /health")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Report per-module import time for the API process.
+
+Runs ``python -X importtime`` on a module in a fresh interpreter and prints the
+slowest imports by cumulative time. Run from the ``api`` directory:
+
+    python -m utils.import_time_report
+    python -m utils.import_time_report --module services.ai_service --top 40
+    python -m utils.import_time_report --json import_times.json --budget-ms 3000
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+API_DIR = Path(__file__).parent.parent
+
+
+def measure(module: str) -> list[dict]:
+    """Import ``module`` in a subprocess and return one entry per imported module."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=API_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        entries.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    return entries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main", help="Module to import (default: main)")
+    parser.add_argument("--top", type=int, default=25, help="Number of modules to print")
+    parser.add_argument("--json", type=Path, help="Write the full per-module report here")
+    parser.add_argument("--budget-ms", type=float, help="Exit non-zero if total import time exceeds this")
+    args = parser.parse_args()
+
+    entries = measure(args.module)
+    total_ms = sum(e["self_ms"] for e in entries)
+
+    print(f"{'cumulative ms':>14} {'self ms':>10}  module")
+    for entry in sorted(entries, key=lambda e: e["cumulative_ms"], reverse=True)[: args.top]:
+        print(f"{entry['cumulative_ms']:>14.1f} {entry['self_ms']:>10.1f}  {entry['module']}")
+    print(f"\nTotal import time for {args.module}: {total_ms:.1f} ms across {len(entries)} modules")
+
+    if args.json:
+        args.json.write_text(json.dumps({"module": args.module, "total_ms": total_ms, "modules": entries}, indent=2))
+
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"Import time {total_ms:.1f} ms exceeds budget of {args.budget_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import json
+from typing import Any
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+def format_sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class PartialJSONField:
+    """Incrementally decode one string field from streamed JSON tool-call arguments.
+
+    Structured-output calls stream ``{"response": "..."}`` a few characters at a
+    time; ``feed`` returns only the newly decoded part of the field's value.
+    """
+
+    def __init__(self, field: str = "response"):
+        self.marker = f'"{field}"'
+        self.buffer = ""
+        self.emitted = 0
+
+    def feed(self, fragment: str) -> str:
+        self.buffer += fragment
+        decoded = self._decode()
+        delta = decoded[self.emitted:]
+        self.emitted = len(decoded)
+        return delta
+
+    def _decode(self) -> str:
+        start = self.buffer.find(self.marker)
+        if start < 0:
+            return ""
+        i = start + len(self.marker)
+        while i < len(self.buffer) and self.buffer[i] in " \t\n\r:":
+            i += 1
+        if i >= len(self.buffer) or self.buffer[i] != '"':
+            return ""
+        i += 1
+
+        out = []
+        while i < len(self.buffer):
+            ch = self.buffer[i]
+            if ch == '"':
+                break
+            if ch != "\\":
+                out.append(ch)
+                i += 1
+                continue
+            # Stop before an escape sequence that has not fully arrived yet.
+            if i + 1 >= len(self.buffer):
+                break
+            code = self.buffer[i + 1]
+            if code == "u":
+                if i + 6 > len(self.buffer):
+                    break
+                out.append(chr(int(self.buffer[i + 2:i + 6], 16)))
+                i += 6
+            else:
+                out.append(_ESCAPES.get(code, code))
+                i += 2
+        return "".join(out)
+
+
+class StreamedAnswer:
+    """Answer text from one tagged model run, plain or structured.
+
+    Structured-output writers stream JSON either as tool-call arguments
+    (``function_calling``) or as message content (``json_schema``). Both go
+    through ``PartialJSONField`` so clients only see the answer field; content
+    that does not start with ``{`` is passed through as plain text.
+    """
+
+    def __init__(self, field: str = "response"):
+        self.field = PartialJSONField(field)
+        self.is_json = None
+        self._pending = ""
+
+    def feed(self, content: str = "", tool_args: str = "") -> str:
+        if tool_args:
+            return self.field.feed(tool_args)
+        if not content:
+            return ""
+        if self.is_json is None:
+            self._pending += content
+            stripped = self._pending.lstrip()
+            if not stripped:
+                return ""
+            self.is_json = stripped.startswith("{")
+            content, self._pending = self._pending, ""
+        return self.field.feed(content) if self.is_json else content
@@ -0,0 +1,84 @@
+"""Pre-render canned phrases into the TTS disk cache.
+
+Run from the ``api`` directory:
+
+    python -m utils.tts_warmup
+    python -m utils.tts_warmup --phrases phrases.txt --category study
+
+A phrase file has one phrase per line, optionally prefixed with a category
+(``gmail|Retrieving your drafts...``) so the category's voice is used.
+"""
+import argparse
+import asyncio
+from pathlib import Path
+
+from services import tts_service
+from services.tts_cache import tts_cache
+
+# Fixed responses returned by the agents, paired with the category whose voice reads them.
+DEFAULT_PHRASES = [
+    ("gmail", "Retrieving your drafts..."),
+    ("gmail", "Sending your drafted email replies..."),
+    ("gmail", "Extracting details for your new email..."),
+    ("gmail", "I've checked all your recent emails. There's nothing else that needs attention right now."),
+    ("gmail", "Could not create draft - missing email details."),
+    ("gmail", "No email details found to send."),
+    ("calendar", "No matching events found to update."),
+    ("calendar", "No matching events found to delete."),
+    ("calendar", "No study plan found. Please ask for a study plan first."),
+    ("calendar", "The study plan doesn't have any scheduled slots."),
+    ("work", "Sent the email draft."),
+    ("work", "Failed to send the email draft."),
+    ("work", "No email draft found to send. Please create a study-plan email summary first."),
+    ("personal", "I'm here to help with personal matters. Could you tell me a bit more?"),
+]
+
+
+def load_phrases(path: Path, category: str | None) -> list[tuple[str | None, str]]:
+    phrases = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        prefix, sep, text = line.partition("|")
+        phrases.append((prefix.strip(), text.strip()) if sep else (category, line))
+    return phrases
+
+
+async def warm(phrases: list[tuple[str | None, str]], voice: str, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def render(category: str | None, text: str) -> None:
+        selected_voice = tts_service.resolve_voice(voice, category)
+        key = tts_service.audio_key(text, selected_voice)
+        if await asyncio.to_thread(tts_cache.get, key) is not None:
+            print(f"cached   [{selected_voice}] {text}")
+            return
+        async with semaphore:
+            try:
+                await tts_service.synthesize(text, selected_voice)
+                print(f"rendered [{selected_voice}] {text}")
+            except Exception as e:
+                print(f"failed   [{selected_voice}] {text}: {e}")
+
+    try:
+        await asyncio.gather(*(render(category, text) for category, text in phrases))
+    finally:
+        await tts_service.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--phrases", type=Path, help="File of phrases to render (default: built-in agent phrases)")
+    parser.add_argument("--category", help="Category for phrases without a prefix")
+    parser.add_argument("--voice", default="alloy", help="Voice when the category has no mapping")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    phrases = load_phrases(args.phrases, args.category) if args.phrases else DEFAULT_PHRASES
+    asyncio.run(warm(phrases, args.voice, args.concurrency))
+    print(tts_cache.metrics())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 package common
 
 import (
+	"bufio"
 	"bytes"
 	"encoding/json"
 	"errors"
@@ -130,15 +131,15 @@ func TTSHandler(w http.ResponseWriter, r *http.Request) {
 		return
 	}
 
-	requestURL := buildTTSURL(fastAPIURL, text, r.URL.Query().Get("category"), r.URL.Query().Get("voice"))
+	requestURL := buildTTSURL(fastAPIURL, text, r.URL.Query().Get("category"), r.URL.Query().Get("voice"), r.URL.Query().Get("pipeline"))
 	fmt.Printf("TTS Request: %s\n", requestURL)
 
-	if err := streamAudioFromURL(w, requestURL); err != nil {
+	if err := streamAudioFromURL(w, r, requestURL); err != nil {
 		fmt.Printf("TTS Error: %v\n", err)
 	}
 }
 
-func buildTTSURL(fastAPIURL, text, category, voice string) string {
+func buildTTSURL(fastAPIURL, text, category, voice, pipeline string) string {
 	params := url.Values{}
 	params.Add("text", text)
 	if category != "" {
@@ -147,18 +148,38 @@ func buildTTSURL(fastAPIURL, text, category, voice string) string {
 	if voice != "" {
 		params.Add("voice", voice)
 	}
+	if pipeline != "" {
+		params.Add("pipeline", pipeline)
+	}
 	return fmt.Sprintf("%s/api/tts?%s", fastAPIURL, params.Encode())
 }
 
-func streamAudioFromURL(w http.ResponseWriter, requestURL string) error {
-	resp, err := http.Get(requestURL)
+func streamAudioFromURL(w http.ResponseWriter, r *http.Request, requestURL string) error {
+	req, err := http.NewRequestWithContext(r.Context(), http.MethodGet, requestURL, nil)
+	if err != nil {
+		writeJSON(w, http.StatusInternalServerError, apiResponse{Ok: false, Message: "Failed to build TTS request"})
+		return err
+	}
+	if rangeHeader := r.Header.Get("Range"); rangeHeader != "" {
+		req.Header.Set("Range", rangeHeader)
+	}
+
+	resp, err := http.DefaultClient.Do(req)
 	if err != nil {
 		writeJSON(w, http.StatusBadGateway, apiResponse{Ok: false, Message: "Failed to contact TTS service"})
 		return err
 	}
 	defer resp.Body.Close()
 
-	if resp.StatusCode != http.StatusOK {
+	if resp.StatusCode == http.StatusRequestedRangeNotSatisfiable {
+		if contentRange := resp.Header.Get("Content-Range"); contentRange != "" {
+			w.Header().Set("Content-Range", contentRange)
+		}
+		w.WriteHeader(resp.StatusCode)
+		return nil
+	}
+
+	if resp.StatusCode != http.StatusOK && resp.StatusCode != http.StatusPartialContent {
 		body, _ := io.ReadAll(resp.Body)
 		fmt.Printf("TTS service error (%d): %s\n", resp.StatusCode, string(body))
 		writeJSON(w, resp.StatusCode, apiResponse{Ok: false, Message: "TTS service error"})
@@ -166,7 +187,8 @@ func streamAudioFromURL(w http.ResponseWriter, requestURL string) error {
 	}
 
 	copyAudioHeaders(w, resp)
-	if _, err := io.Copy(w, resp.Body); err != nil {
+	w.WriteHeader(resp.StatusCode)
+	if err := copyAndFlush(w, resp.Body); err != nil {
 		fmt.Printf("Failed to stream audio: %v\n", err)
 		return err
 	}
@@ -174,6 +196,30 @@ func streamAudioFromURL(w http.ResponseWriter, requestURL string) error {
 	return nil
 }
 
+// copyAndFlush forwards the body as it arrives so playback can start before
+// the upstream response is complete.
+func copyAndFlush(w http.ResponseWriter, body io.Reader) error {
+	flusher, _ := w.(http.Flusher)
+	buf := make([]byte, 4096)
+	for {
+		n, err := body.Read(buf)
+		if n > 0 {
+			if _, writeErr := w.Write(buf[:n]); writeErr != nil {
+				return writeErr
+			}
+			if flusher != nil {
+				flusher.Flush()
+			}
+		}
+		if err == io.EOF {
+			return nil
+		}
+		if err != nil {
+			return err
+		}
+	}
+}
+
 func copyAudioHeaders(w http.ResponseWriter, resp *http.Response) {
 	if contentType := resp.Header.Get("Content-Type"); contentType != "" {
 		w.Header().Set("Content-Type", contentType)
@@ -181,7 +227,7 @@ func copyAudioHeaders(w http.ResponseWriter, resp *http.Response) {
 		w.Header().Set("Content-Type", "audio/mpeg")
 	}
 
-	for _, header := range []string{"Content-Length", "Accept-Ranges"} {
+	for _, header := range []string{"Content-Length", "Content-Range", "Accept-Ranges"} {
 		if val := resp.Header.Get(header); val != "" {
 			w.Header().Set(header, val)
 		}
@@ -227,6 +273,115 @@ func AskAnythingHandler(w http.ResponseWriter, r *http.Request) {
 	writeJSON(w, http.StatusOK, apiResponse{Ok: true, Data: response})
 }
 
+func AskAnythingStreamHandler(w http.ResponseWriter, r *http.Request) {
+	helpers.SetHeaders(w)
+
+	if r.Method == http.MethodOptions {
+		w.WriteHeader(http.StatusNoContent)
+		return
+	}
+
+	if r.Method != http.MethodPost {
+		writeJSON(w, http.StatusMethodNotAllowed, apiResponse{Ok: false, Message: "Method not allowed"})
+		return
+	}
+
+	var query UniversalQueryRequest
+	if err := json.NewDecoder(r.Body).Decode(&query); err != nil {
+		writeJSON(w, http.StatusBadRequest, apiResponse{Ok: false, Message: "Invalid request body"})
+		return
+	}
+
+	enrichQueryWithUserInfo(&query, r)
+
+	fastAPIURL, err := getFastAPIURL()
+	if err != nil {
+		writeJSON(w, http.StatusInternalServerError, apiResponse{Ok: false, Message: err.Error()})
+		return
+	}
+
+	body, err := encodeJSON(query)
+	if err != nil {
+		writeJSON(w, http.StatusInternalServerError, apiResponse{Ok: false, Message: err.Error()})
+		return
+	}
+
+	req, err := http.NewRequestWithContext(r.Context(), http.MethodPost, fastAPIURL+"/api/ask-anything/stream", bytes.NewBuffer(body))
+	if err != nil {
+		writeJSON(w, http.StatusInternalServerError, apiResponse{Ok: false, Message: fmt.Sprintf("Error: %v", err)})
+		return
+	}
+	req.Header.Set("Content-Type", "application/json")
+
+	resp, err := newHTTPClient(AskAnythingTimeout).Do(req)
+	if err != nil {
+		writeJSON(w, http.StatusInternalServerError, apiResponse{Ok: false, Message: fmt.Sprintf("Error: %v", err)})
+		return
+	}
+	defer resp.Body.Close()
+
+	// Errors raised before the stream starts come back as JSON with a non-200
+	// status; pass them through rather than as an empty "successful" stream.
+	if resp.StatusCode != http.StatusOK {
+		errBody, _ := io.ReadAll(resp.Body)
+		writeJSON(w, resp.StatusCode, apiResponse{Ok: false, Message: fmt.Sprintf("API error (%d): %s", resp.StatusCode, string(errBody))})
+		return
+	}
+
+	w.Header().Set("Content-Type", "text/event-stream")
+	w.Header().Set("Cache-Control", "no-cache")
+	w.Header().Set("X-Accel-Buffering", "no")
+	w.WriteHeader(http.StatusOK)
+
+	final, err := relaySSE(w, resp.Body)
+	if err != nil {
+		fmt.Printf("Failed to relay ask-anything stream: %v\n", err)
+	}
+	if final != nil {
+		processQueryResponse(query, final)
+	}
+}
+
+// relaySSE copies server-sent events to the client, flushing after each event,
+// and returns the AIResponse carried by the "final" event if one was seen.
+func relaySSE(w http.ResponseWriter, body io.Reader) (*AIResponse, error) {
+	flusher, _ := w.(http.Flusher)
+	reader := bufio.NewReader(body)
+	currentEvent := ""
+	var final *AIResponse
+
+	for {
+		line, err := reader.ReadString('\n')
+		if len(line) > 0 {
+			if _, writeErr := io.WriteString(w, line); writeErr != nil {
+				return final, writeErr
+			}
+
+			trimmed := strings.TrimRight(line, "\r\n")
+			switch {
+			case strings.HasPrefix(trimmed, "event: "):
+				currentEvent = strings.TrimPrefix(trimmed, "event: ")
+			case strings.HasPrefix(trimmed, "data: ") && currentEvent == "final":
+				var aiResp AIResponse
+				if decodeErr := json.Unmarshal([]byte(strings.TrimPrefix(trimmed, "data: ")), &aiResp); decodeErr == nil {
+					final = &aiResp
+				}
+			case trimmed == "":
+				currentEvent = ""
+				if flusher != nil {
+					flusher.Flush()
+				}
+			}
+		}
+		if err == io.EOF {
+			return final, nil
+		}
+		if err != nil {
+			return final, err
+		}
+	}
+}
+
 func enrichQueryWithUserInfo(query *UniversalQueryRequest, r *http.Request) {
 	userID, _, _, err := GetUserInfo(r)
 	if err != nil {
@@ -56,6 +56,58 @@ func SaveMemoHandler(w http.ResponseWriter, r *http.Request) {
 	})
 }
 
+func SaveMemosHandler(w http.ResponseWriter, r *http.Request) {
+
+	helpers.SetHeaders(w)
+	if r.Method == http.MethodOptions {
+		w.WriteHeader(http.StatusNoContent)
+		return
+	}
+
+	if r.Method != http.MethodPost {
+		writeJSON(w, http.StatusMethodNotAllowed, apiResponse{Ok: false, Message: "Method not allowed"})
+		return
+	}
+
+	var req data.SaveMemosRequest
+	if err := json.NewDecoder(r.Body).Decode(&req); err != nil {
+		writeJSON(w, http.StatusBadRequest, apiResponse{Ok: false, Message: "Invalid request body"})
+		return
+	}
+
+	if len(req.Memos) == 0 {
+		writeJSON(w, http.StatusBadRequest, apiResponse{Ok: false, Message: "memos are required"})
+		return
+	}
+
+	userID, _, _, err := GetUserInfo(r)
+	for i := range req.Memos {
+		if err == nil {
+			req.Memos[i].UserID = int64(userID)
+		}
+		if req.Memos[i].UserQuery == "" || req.Memos[i].AIQuery == "" {
+			writeJSON(w, http.StatusBadRequest, apiResponse{Ok: false, Message: "user_query and ai_query are required"})
+			return
+		}
+		if req.Memos[i].UserID == 0 {
+			writeJSON(w, http.StatusBadRequest, apiResponse{Ok: false, Message: "user_id is required"})
+			return
+		}
+	}
+
+	memos, err := data.SaveUserMemos(req.Memos)
+	if err != nil {
+		writeJSON(w, http.StatusInternalServerError, apiResponse{Ok: false, Message: "Failed to save memos: " + err.Error()})
+		return
+	}
+
+	writeJSON(w, http.StatusCreated, apiResponse{
+		Ok:      true,
+		Message: "Memos saved successfully",
+		Data:    memos,
+	})
+}
+
 func GetMemosHandler(w http.ResponseWriter, r *http.Request) {
 	helpers.SetHeaders(w)
 	if r.Method == http.MethodOptions {
@@ -45,3 +45,30 @@ func GetUserMemos(userID int64, limit int) ([]UserMemo, error) {
 
 	return memos, err
 }
+
+func SaveUserMemos(reqs []SaveMemoRequest) ([]UserMemo, error) {
+	if supabaseClient == nil {
+		return nil, errors.New("supabase client not initialized")
+	}
+
+	records := make([]map[string]interface{}, 0, len(reqs))
+	for _, req := range reqs {
+		records = append(records, map[string]interface{}{
+			"user_id":    req.UserID,
+			"user_query": req.UserQuery,
+			"ai_query":   req.AIQuery,
+			"category":   req.Category,
+			"emotion":    req.Emotion,
+		})
+	}
+
+	var result []UserMemo
+	_, err := supabaseClient.From("user_memo").
+		Insert(records, false, "", "", "").
+		ExecuteTo(&result)
+
+	if err != nil {
+		return nil, errors.New("failed to save memos")
+	}
+	return result, nil
+}
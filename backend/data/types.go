@@ -32,4 +32,7 @@ type SaveMemoRequest struct {
 	AIQuery   string `json:"ai_query"`
 	Category  string `json:"category"`
 	Emotion   string `json:"emotion"`
-}
\ No newline at end of file
+}
+type SaveMemosRequest struct {
+	Memos []SaveMemoRequest `json:"memos"`
+}
@@ -35,9 +35,11 @@ func SetupRouter() *mux.Router {
 	r.HandleFunc("/api/logout", common.LogoutHandler).Methods("POST")
 	r.HandleFunc("/health", common.FastAPIHealthHandler).Methods("GET")
 	r.HandleFunc("/api/ask-anything", common.AskAnythingHandler).Methods("POST", "OPTIONS")
+	r.HandleFunc("/api/ask-anything/stream", common.AskAnythingStreamHandler).Methods("POST", "OPTIONS")
 	r.HandleFunc("/api/tts", common.TTSHandler).Methods("GET")
 	r.HandleFunc("/api/image/describe", common.DescribeImageHandler).Methods("POST", "OPTIONS")
 	r.HandleFunc("/api/save-memo", common.SaveMemoHandler).Methods("POST", "OPTIONS")
+	r.HandleFunc("/api/save-memos", common.SaveMemosHandler).Methods("POST", "OPTIONS")
 	r.HandleFunc("/api/memos", common.GetMemosHandler).Methods("GET", "OPTIONS")
 	r.HandleFunc("/api/save-preference", common.SavePreferences).Methods("POST", "OPTIONS")
 	r.HandleFunc("/api/user", common.UserInfoHandler).Methods("GET", "OPTIONS")